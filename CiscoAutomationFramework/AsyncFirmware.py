@@ -0,0 +1,236 @@
+from CiscoAutomationFramework.AsyncTransportEngines import AsyncBaseEngine
+from CiscoAutomationFramework.TransportEngines import default_buffer, default_timeout, default_command_end
+from CiscoAutomationFramework.FirmwareDetect import firmware_name_from_show_version
+from CiscoAutomationFramework.Exceptions import EnablePasswordError
+from CiscoAutomationFramework.IOS import IOS
+from CiscoAutomationFramework.IOSXE import IOSXE
+from CiscoAutomationFramework.NXOS import NXOS
+from abc import ABC, abstractmethod
+from inspect import getmodule
+
+
+class AsyncCiscoFirmware(ABC):
+    """
+    asyncio counterpart to CiscoFirmware. Every property of CiscoFirmware that talks to the device is a coroutine
+    method here, ex. "await ssh.running_config()" instead of "ssh.running_config". Parsing of the output is shared
+    with the synchronous firmware class set in the firmware attribute.
+    """
+
+    firmware = None
+    interfaces_command = 'show interfaces'
+
+    def __init__(self, transport):
+        if not isinstance(transport, AsyncBaseEngine):
+            raise TypeError(f'transport object MUST be an instance of {getmodule(AsyncBaseEngine).__name__}.{AsyncBaseEngine.__name__}')
+        self._terminal_length_value = None
+        self.transport = transport
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.transport.close_connection()
+
+    @property
+    def is_nexus(self) -> bool:
+        return False
+
+    @property
+    def commands_sent(self) -> list:
+        return self.transport.all_commands_sent
+
+    @property
+    def prompt(self) -> str:
+        return self.transport.prompt
+
+    @property
+    def hostname(self) -> str:
+        return self.transport.hostname
+
+    async def cli_to_config_mode(self) -> bool:
+        """
+        Navigates the CLI into config mode regardless of where it is
+
+        :return: True/False
+        :rtype: bool
+        """
+        if self.transport.in_user_exec_mode:
+            await self.cli_to_privileged_exec_mode()
+
+        if self.transport.in_privileged_exec_mode:
+            await self.transport.send_command_get_output('config t')
+
+        return self.transport.in_configuration_mode
+
+    async def cli_to_privileged_exec_mode(self) -> bool:
+        """
+        Navigates the CLI into privileged exec mode regardless of where it is. Will raise an EnablePasswordError
+        if the transport engine does not have an enable password set and the network device asks for one.
+
+        :return: True/False
+        :rtype: bool
+
+        :raises: CiscoAutomationFramework.Exceptions.EnablePasswordError
+        """
+        if self.transport.in_privileged_exec_mode:
+            return True
+        if self.transport.in_configuration_mode:
+            await self.transport.send_command_get_output('end')
+            return self.transport.in_privileged_exec_mode
+
+        if self.transport.in_user_exec_mode:
+            enabling_output = await self.transport.send_command_get_output('enable')
+            if self.transport.prompt not in enabling_output:
+                if not self.transport.enable_password:
+                    raise EnablePasswordError('No enable password provided, network device is asking for one!')
+                await self.transport.send_command_get_output(self.transport.enable_password)
+        # enable may not ask for a password, ex. when AAA authorizes it, the prompt changes straight away
+        return self.transport.in_privileged_exec_mode
+
+    async def send_command_get_output(self, command, end=default_command_end, buffer_size=default_buffer,
+                                      timeout=default_timeout, delay=0) -> list:
+        return await self.transport.send_command_get_output(command, end, buffer_size, timeout, delay)
+
+    async def send_commands_get_outputs(self, commands, end=default_command_end, buffer_size=default_buffer,
+                                        timeout=default_timeout, delay=0) -> list:
+        return await self.transport.send_commands_get_outputs(commands, end, buffer_size, timeout, delay)
+
+    async def send_command(self, command, end=default_command_end) -> None:
+        return await self.transport.send_command(command, end)
+
+    async def get_output(self, buffer_size=default_buffer, timeout=default_timeout) -> list:
+        return await self.transport.get_output(buffer_size, timeout)
+
+    async def close_connection(self) -> None:
+        return await self.transport.close_connection()
+
+    async def terminal_length(self, n='0'):
+        """
+        Sets terminal length of shell
+
+        :param n: length
+        :type n: str
+        :return: Nothing
+        """
+        if self._terminal_length_value != int(n):
+            self._terminal_length_value = int(n)
+            await self.cli_to_privileged_exec_mode()
+            return await self.transport.send_command_get_output(f'terminal length {n}')
+
+    async def _privileged_command_output(self, command, buffer_size=default_buffer):
+        await self.cli_to_privileged_exec_mode()
+        await self.terminal_length('0')
+        return await self.transport.send_command_get_output(command, buffer_size=buffer_size)
+
+    async def uptime(self) -> str:
+        """
+        Returns uptime of device
+
+        :return: Uptime
+        :rtype: str
+        """
+        return self.firmware._parse_uptime(await self._privileged_command_output('show version'), self.hostname)
+
+    async def interfaces(self) -> list:
+        """
+        List of interfaces on device
+
+        :return: Interfaces
+        :rtype: list
+        """
+        return self.firmware._parse_interfaces(await self._privileged_command_output(self.interfaces_command, 500))
+
+    async def mac_address_table(self) -> list:
+        """
+        Returns the MAC address table in its raw form
+
+        :return: MAC Address Table
+        :rtype: list
+        """
+        return await self._privileged_command_output('show mac address-table')
+
+    async def arp_table(self) -> list:
+        """
+        Returns the arp table in its raw form
+
+        :return: Arp Table
+        :rtype: list
+        """
+        return await self._privileged_command_output('show ip arp')
+
+    async def running_config(self) -> str:
+        """
+        Returns running config in its raw form, without the header lines show running-config prints before the
+        config (ex. "Building configuration...")
+
+        :return: Running Configuration
+        :rtype: str
+        """
+        running_config = await self._privileged_command_output('show running-config')
+        return self.firmware._strip_running_config_header('\n'.join(running_config[2:-2]))
+
+    async def startup_config(self) -> str:
+        """
+        Returns startup config in its raw form
+
+        :return: Startup Config
+        :rtype: str
+        """
+        return '\n'.join((await self._privileged_command_output('show startup-config'))[2:-2])
+
+    @abstractmethod
+    async def save_config(self) -> bool:
+        """
+        Saves running config to startup config
+
+        :return: True/False
+        :rtype: bool
+        """
+        pass
+
+
+class AsyncIOS(AsyncCiscoFirmware):
+
+    firmware = IOS
+
+    async def save_config(self):
+        await self.cli_to_privileged_exec_mode()
+        await self.transport.send_command('copy running-config startup-config')
+        data = await self.transport.send_command_get_output('', timeout=15)
+        if self.transport.prompt in ''.join(data[-1:]) and not any('%' in line for line in data):
+            return True
+        return False
+
+
+class AsyncIOSXE(AsyncIOS):
+
+    firmware = IOSXE
+
+
+class AsyncNXOS(AsyncCiscoFirmware):
+
+    firmware = NXOS
+    interfaces_command = 'show interface'
+
+    @property
+    def is_nexus(self):
+        return True
+
+    async def save_config(self):
+        await self.cli_to_privileged_exec_mode()
+        data = await self.transport.send_command_get_output('copy running-config startup-config', timeout=15)
+        if self.transport.prompt in ''.join(data[-1:]) and any('complete' in line for line in data):
+            return True
+        return False
+
+
+async def async_detect_firmware(transport):
+    """
+    asyncio counterpart to detect_firmware, returns the AsyncCiscoFirmware class for the device
+    """
+    if not isinstance(transport, AsyncBaseEngine):
+        raise TypeError(f'transport argument MUST be an instance of {getmodule(AsyncBaseEngine).__name__}.{AsyncBaseEngine.__name__}')
+
+    show_version = await transport.send_command_get_truncated_output('show version')
+    firmware_version = firmware_name_from_show_version(show_version)
+    return {'IOS': AsyncIOS, 'IOSXE': AsyncIOSXE, 'NXOS': AsyncNXOS}.get(firmware_version)
@@ -0,0 +1,223 @@
+from CiscoAutomationFramework.TransportEngines import BaseEngine, PromptMatcher, LoginHandshake, default_buffer, \
+    default_timeout, default_command_end, default_login_timeout, default_max_nudges, pager_prompt, \
+    strip_pager_artifacts
+from CiscoAutomationFramework.Exceptions import LoginError
+from paramiko import SSHClient, AutoAddPolicy
+from abc import ABC, abstractmethod
+from functools import partial
+import asyncio
+import codecs
+
+
+class AsyncBaseEngine(ABC):
+    """
+    asyncio counterpart to BaseEngine. It sends commands, gathers output until the prompt is returned and keeps
+    track of the prompt the same way, but every method that waits on the device is a coroutine so a single event
+    loop can drive many sessions at once instead of needing an OS thread per device.
+    """
+
+    def __init__(self):
+        self.hostname = ''
+        self.prompt = None
+        self.enable_password = None
+        self.commands_sent_since_last_output_get = 0
+        self.all_commands_sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close_connection()
+
+    # tracking the prompt and the mode the CLI is in is identical to the synchronous engine
+    _extract_prompt = BaseEngine._extract_prompt
+    in_user_exec_mode = BaseEngine.in_user_exec_mode
+    in_privileged_exec_mode = BaseEngine.in_privileged_exec_mode
+    in_configuration_mode = BaseEngine.in_configuration_mode
+
+    async def send_command(self, command, end=default_command_end):
+        self.commands_sent_since_last_output_get += 1
+        self.all_commands_sent.append(command)
+        return await self._send_command(command, end)
+
+    async def get_raw_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False,
+                             answer_pager=False):
+        """
+        Gets output from the device until a prompt has been returned for every command sent since output was last
+        gathered, or no output is received for timeout seconds. See BaseEngine.get_raw_output, answer_pager works
+        the same as in BaseEngine._iter_chunks
+        """
+        if no_command_sent_previous:
+            self.commands_sent_since_last_output_get += 1
+
+        loop = asyncio.get_running_loop()
+        prompts_expected = self.commands_sent_since_last_output_get
+        self.commands_sent_since_last_output_get = 0
+        prompt_matcher = PromptMatcher(self.hostname)
+        output = []
+        end = loop.time() + timeout
+
+        while prompt_matcher.prompt_count < prompts_expected:
+            from_device = self._get_output(buffer_size)
+            if from_device:
+                output.append(from_device)
+                prompt_matcher.feed(from_device)
+                end = loop.time() + timeout  # reset timeout clock
+                if answer_pager and pager_prompt.search(prompt_matcher.last_line):
+                    await self._send_command(' ', '')
+                    prompt_matcher.feed('\n')
+            else:
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    break
+                await self._wait_for_output(remaining)
+
+        return ''.join(output)
+
+    async def get_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
+        output = (await self.get_raw_output(buffer_size, timeout, no_command_sent_previous)).splitlines()
+        self._extract_prompt(output)
+        return output
+
+    async def get_outputs(self, buffer_size=default_buffer, timeout=default_timeout):
+        commands_sent = self.commands_sent_since_last_output_get
+        output = await self.get_raw_output(buffer_size, timeout)
+        outputs = PromptMatcher(self.hostname).split(output, commands_sent)
+        self._extract_prompt(outputs[-1])
+        return outputs
+
+    async def send_command_get_output(self, command, end=default_command_end, buffer_size=default_buffer,
+                                      timeout=default_timeout, delay=0):
+        """
+        Sends a command and gets its output. Because the engine waits on the channel for output to arrive there is
+        no need to delay before reading, a delay can still be given for devices that need it.
+        """
+        await self.send_command(command, end)
+        if delay:
+            await asyncio.sleep(delay)
+        return await self.get_output(buffer_size, timeout)
+
+    async def send_commands_get_outputs(self, commands, end=default_command_end, buffer_size=default_buffer,
+                                        timeout=default_timeout, delay=0):
+        for command in commands:
+            await self.send_command(command, end)
+        if delay:
+            await asyncio.sleep(delay)
+        return await self.get_outputs(buffer_size, timeout)
+
+    async def send_command_get_truncated_output(self, command, timeout=default_timeout):
+        """
+        Gets the output of a command when the terminal length cannot be set to 0, pressing space to page through
+        the output until the prompt is returned. See BaseEngine.send_command_get_truncated_output
+        """
+        await self.send_command(command)
+        output = await self.get_raw_output(default_buffer, timeout, answer_pager=True)
+        output = strip_pager_artifacts(output).splitlines()
+        self._extract_prompt(output)
+        return output
+
+    async def _get_prompt_and_hostname(self, timeout=default_login_timeout, username=None, password=None,
+                                       max_nudges=default_max_nudges):
+        """
+        Reads the login output until the device returns a prompt and returns the prompt and hostname, see
+        BaseEngine._get_prompt_and_hostname
+        """
+        loop = asyncio.get_running_loop()
+        handshake = LoginHandshake(username, password, max_nudges)
+        deadline = loop.time() + timeout
+        quiet_since = loop.time()
+        while not handshake.prompt:
+            data = self._get_output(default_buffer)
+            if data:
+                reply = handshake.feed(data)
+                if reply is not None:
+                    await self._send_command(reply, '')
+                quiet_since = loop.time()
+                continue
+            now = loop.time()
+            if now >= deadline:
+                raise LoginError(f'Device did not return a prompt within {timeout} seconds')
+            if now - quiet_since >= default_timeout:
+                nudge = handshake.quiet()
+                if nudge:
+                    await self._send_command(nudge, '')
+                quiet_since = now
+            await self._wait_for_output(min(deadline, quiet_since + default_timeout) - now)
+        return handshake.prompt, handshake.hostname
+
+    @abstractmethod
+    async def connect_to_server(self, ip, username, password, port) -> None:
+        pass
+
+    @abstractmethod
+    async def _send_command(self, command, end) -> None:
+        pass
+
+    @abstractmethod
+    def _get_output(self, buffer_size) -> str:
+        """
+        Returns any output that is ready to be read without waiting, an empty string if there is none
+        """
+        pass
+
+    @abstractmethod
+    async def _wait_for_output(self, timeout) -> None:
+        """
+        Waits until there is output ready to be read or timeout seconds elapse
+        """
+        pass
+
+    @abstractmethod
+    async def close_connection(self) -> None:
+        pass
+
+
+class AsyncSSHEngine(AsyncBaseEngine):
+    """
+    SSH engine for asyncio built on paramiko. Instead of sleeping or blocking a thread while waiting for output,
+    the channel is registered with the event loop and the coroutine is resumed as soon as the device sends data.
+
+    The blocking parts of paramiko (TCP connect, key exchange and authentication) are run in the default executor.
+    paramiko still runs a transport thread per connection.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.client = SSHClient()
+        self.client.set_missing_host_key_policy(AutoAddPolicy())
+        self.shell = None
+        self.timeout = 10
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    async def connect_to_server(self, ip, username, password, port):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.client.connect, hostname=ip, port=port, username=username,
+                                                 password=password, timeout=self.timeout))
+        self.shell = await loop.run_in_executor(None, self.client.invoke_shell)
+        self._decoder.reset()
+        self.prompt, self.hostname = await self._get_prompt_and_hostname(self.timeout, username, password)
+
+    def _get_output(self, buffer_size):
+        if self.shell.recv_ready():
+            return self._decoder.decode(self.shell.recv(buffer_size))
+        return ''
+
+    async def _wait_for_output(self, timeout):
+        if self.shell.recv_ready():
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fileno = self.shell.fileno()
+        loop.add_reader(fileno, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fileno)
+
+    async def _send_command(self, command, end='\n'):
+        self.shell.send(f'{command}{end}')
+
+    async def close_connection(self):
+        self.client.close()
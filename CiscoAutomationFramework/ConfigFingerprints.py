@@ -0,0 +1,89 @@
+from CiscoAutomationFramework.JsonFileStore import JsonFileStore
+from time import time
+import hashlib
+
+
+class ConfigFingerprintStore(JsonFileStore):
+    """
+    Remembers, per device, the configuration change signal of the running config last fetched and a hash of that
+    running config, in a JSON file. CiscoFirmware.running_config_if_changed uses it to only fetch the running config
+    of devices whose configuration changed since the last run.
+
+    The store is thread safe so a single store can be shared by all the threads of a script::
+
+        with ConfigFingerprintStore('fingerprints.json') as fingerprints:
+            with connect_ssh('ip', 'username', 'password') as ssh:
+                running_config = ssh.running_config_if_changed(fingerprints)
+                if running_config is not None:
+                    # the config changed since the last run
+    """
+
+    @staticmethod
+    def digest(running_config):
+        """
+        Hash of a running config
+
+        :param running_config: Running config
+        :type running_config: str
+        :return: SHA-256 hex digest
+        :rtype: str
+        """
+        return hashlib.sha256(running_config.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the fingerprint stored for a device, None if there is none
+
+        :param key: Key of the device, ex. its address 10.0.0.1:22
+        :type key: str
+        :return: Fingerprint with the keys signal, sha256 and fetched_at
+        :rtype: dict
+        """
+        with self._lock:
+            fingerprint = self._entries.get(key)
+            return dict(fingerprint) if fingerprint else None
+
+    def unchanged(self, key, signal):
+        """
+        True if a device has a fingerprint with the same change signal, so its running config does not need to
+        be fetched
+
+        :param key: Key of the device
+        :type key: str
+        :param signal: Configuration change signal read from the device
+        :type signal: str
+        :return: True/False
+        :rtype: bool
+        """
+        fingerprint = self.get(key)
+        return bool(signal and fingerprint and fingerprint['signal'] == signal)
+
+    def set(self, key, signal, running_config):
+        """
+        Stores the fingerprint of a running config just fetched from a device
+
+        :param key: Key of the device
+        :type key: str
+        :param signal: Configuration change signal read from the device before fetching the running config
+        :type signal: str
+        :param running_config: Running config fetched
+        :type running_config: str
+        :return: True if the running config differs from the one last fetched
+        :rtype: bool
+        """
+        sha256 = self.digest(running_config)
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = {'signal': signal, 'sha256': sha256, 'fetched_at': time()}
+        return not previous or previous['sha256'] != sha256
+
+    def invalidate(self, key):
+        """
+        Removes the fingerprint of a device so its running config is fetched on the next run
+
+        :param key: Key of the device
+        :type key: str
+        :return: Nothing
+        """
+        with self._lock:
+            self._entries.pop(key, None)
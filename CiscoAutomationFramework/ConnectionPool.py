@@ -0,0 +1,216 @@
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.TransportEngines import SSHEngine
+from CiscoAutomationFramework.FirmwareBase import CiscoFirmware
+from CiscoAutomationFramework.Exceptions import PoolExhaustedError
+from contextlib import contextmanager
+from threading import Condition
+from time import monotonic
+
+
+class ConnectionPool:
+    """
+    Keeps logged in sessions to devices open so they can be handed out again instead of doing a full TCP connect,
+    SSH handshake, authentication and firmware detection every time a script needs to talk to a device.
+
+    Sessions are pooled by host, port, username, engine type and jumphost. Each time a session is checked out it is checked to
+    still be alive and responding, and the CLI is put back in privileged exec mode. commands_sent and command_records
+    of a checked out session only hold what was sent since it was checked out. Sessions that sit unused longer
+    than idle_timeout are closed, and no more than max_per_host sessions are opened to the same device at once.
+
+    The pool is thread safe so a single pool can be shared by all the threads of a script::
+
+        pool = ConnectionPool(max_per_host=2, idle_timeout=600)
+        with pool.connection('ip', 'username', 'password') as ssh:
+            ssh.send_command_get_output('show clock')
+    """
+
+    def __init__(self, max_per_host=1, idle_timeout=300, checkout_timeout=None):
+        """
+        :param max_per_host: Max number of sessions to have open to the same device at one time
+        :type max_per_host: int
+        :param idle_timeout: Seconds a session can sit unused in the pool before it is closed
+        :type idle_timeout: float
+        :param checkout_timeout: Seconds to wait for a session when max_per_host are in use, None waits forever
+        :type checkout_timeout: float
+        """
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle = {}
+        self._open = {}
+        self._keys = {}
+        self._lock = Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+    @staticmethod
+    def _is_healthy(firmware):
+        """
+        Checks the session is still connected and answers with a prompt, putting the CLI back in privileged exec mode
+        """
+        try:
+            if not firmware.transport.is_alive:
+                return False
+            firmware.cli_to_privileged_exec_mode()
+            output = firmware.transport.send_command_get_output('', delay=0)
+            return firmware.transport.in_privileged_exec_mode and firmware.prompt in ''.join(output[-1:])
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(firmware):
+        try:
+            firmware.close_connection()
+        except Exception:
+            pass
+
+    def _take_slot(self, key):
+        """
+        Waits until there is an idle session or room to open a new one for key. Returns the idle session or None
+        if a new one needs to be opened, in which case a slot has been reserved for it.
+        """
+        deadline = None if self.checkout_timeout is None else monotonic() + self.checkout_timeout
+        with self._lock:
+            while True:
+                self._evict_idle()
+                if self._idle.get(key):
+                    firmware, _ = self._idle[key].pop()
+                    return firmware
+                if self._open.get(key, 0) < self.max_per_host:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    return None
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhaustedError(f'All {self.max_per_host} sessions to {key[0]} are in use!')
+                self._lock.wait(remaining)
+
+    def _release_slot(self, key):
+        with self._lock:
+            self._open[key] -= 1
+            self._lock.notify_all()
+
+    def _evict_idle(self):
+        now = monotonic()
+        for key, sessions in self._idle.items():
+            expired = [firmware for firmware, last_used in sessions if now - last_used > self.idle_timeout]
+            if expired:
+                sessions[:] = [(firmware, last_used) for firmware, last_used in sessions if firmware not in expired]
+                for firmware in expired:
+                    self._keys.pop(id(firmware), None)
+                    self._open[key] -= 1
+                    self._close(firmware)
+                self._lock.notify_all()
+
+    def evict_idle(self):
+        """
+        Closes every session that has been idle longer than idle_timeout
+
+        :return: Nothing
+        """
+        with self._lock:
+            self._evict_idle()
+
+    def checkout(self, ip, username, password, port=22, enable_password=None, timeout=10,
+                 engine=SSHEngine, jumphost=None, firmware_cache=None) -> CiscoFirmware:
+        """
+        Gets a session to the device out of the pool, connecting to it if there is not an idle session to reuse.
+        The session must be given back with checkin when you are done with it, or use the connection context manager
+        which does that for you.
+
+        :return: CiscoFirmware Object
+        :rtype: CiscoFirmware
+
+        :raises: CiscoAutomationFramework.Exceptions.PoolExhaustedError
+        """
+        # the same address behind two jumphosts is two different devices
+        key = (ip, port, username, engine, jumphost.identity if jumphost else None)
+        while True:
+            firmware = self._take_slot(key)
+            if firmware is None:
+                break
+            if self._is_healthy(firmware):
+                # the commands of the health check are not the borrower's either
+                firmware.transport.clear_history()
+                return firmware
+            # session went stale, throw it away and try for another
+            with self._lock:
+                self._keys.pop(id(firmware), None)
+            self._close(firmware)
+            self._release_slot(key)
+
+        try:
+            firmware = connect_ssh(ip, username, password, port=port, enable_password=enable_password,
+                                   timeout=timeout, engine=engine, jumphost=jumphost, firmware_cache=firmware_cache)
+        except Exception:
+            self._release_slot(key)
+            raise
+        with self._lock:
+            self._keys[id(firmware)] = key
+        firmware.transport.clear_history()
+        return firmware
+
+    def checkin(self, firmware):
+        """
+        Returns a session to the pool so it can be reused
+
+        :param firmware: Session that was checked out of the pool
+        :type firmware: CiscoFirmware
+        :return: Nothing
+        """
+        # whoever checked it out keeps their history, the next borrower starts with an empty one and does not get
+        # output or interface names gathered by someone else that may be out of date by now
+        firmware.transport.clear_history()
+        firmware.clear_output_cache()
+        firmware._interface_names = None
+        with self._lock:
+            key = self._keys[id(firmware)]
+            self._idle.setdefault(key, []).append((firmware, monotonic()))
+            self._lock.notify_all()
+
+    def discard(self, firmware):
+        """
+        Closes a session that was checked out of the pool instead of returning it
+
+        :param firmware: Session that was checked out of the pool
+        :type firmware: CiscoFirmware
+        :return: Nothing
+        """
+        with self._lock:
+            key = self._keys.pop(id(firmware))
+        self._close(firmware)
+        self._release_slot(key)
+
+    @contextmanager
+    def connection(self, ip, username, password, port=22, enable_password=None, timeout=10, engine=SSHEngine,
+                   jumphost=None, firmware_cache=None):
+        """
+        Context manager that checks a session out of the pool and gives it back when done. If an exception is raised
+        the session is closed instead because the state of the CLI is unknown.
+        """
+        firmware = self.checkout(ip, username, password, port, enable_password, timeout, engine, jumphost,
+                                 firmware_cache)
+        try:
+            yield firmware
+        except BaseException:
+            self.discard(firmware)
+            raise
+        self.checkin(firmware)
+
+    def close_all(self):
+        """
+        Closes every idle session in the pool
+
+        :return: Nothing
+        """
+        with self._lock:
+            for key, sessions in self._idle.items():
+                for firmware, _ in sessions:
+                    self._keys.pop(id(firmware), None)
+                    self._open[key] -= 1
+                    self._close(firmware)
+            self._idle = {}
+            self._lock.notify_all()
@@ -11,4 +11,28 @@ class AuthenticationException(Exception):
     pass
 
 class ForbiddenError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class PoolExhaustedError(Exception):
+    pass
+
+
+class ExecChannelError(Exception):
+    pass
+
+
+class ShellChannelError(Exception):
+    pass
+
+
+class ReplayError(Exception):
+    pass
+
+
+class LoginError(Exception):
+    pass
+
+
+class FileTransferError(Exception):
+    pass
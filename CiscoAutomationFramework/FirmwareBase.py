@@ -1,19 +1,76 @@
 from CiscoAutomationFramework.TransportEngines import BaseEngine, default_buffer, default_timeout, \
     default_command_end, default_delay
-from CiscoAutomationFramework.Exceptions import EnablePasswordError
+from CiscoAutomationFramework.Exceptions import EnablePasswordError, ExecChannelError, FileTransferError, \
+    ShellChannelError
 from CiscoAutomationFramework.Parsers.ConfigParser import ConfigParser
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
+from CiscoAutomationFramework.Parsers.MacAddressTableParser import MacAddressTableParser
+from CiscoAutomationFramework.Parsers.InterfaceBriefParser import InterfaceBriefParser
+from CiscoAutomationFramework.OutputCache import OutputCache
 from abc import ABC, abstractmethod
 from inspect import getmodule
+import re
+
+
+class ConfigLineFailure:
+    """
+    A config line pushed with push_config that the device answered with an error (a line starting with %), or
+    that no prompt was returned for.
+    """
+
+    def __init__(self, line_number, line, messages):
+        """
+        :param line_number: Line number of the line in the lines pushed, starting at 1
+        :type line_number: int
+        :param line: The config line
+        :type line: str
+        :param messages: Error messages the device answered with
+        :type messages: list[str]
+        """
+        self.line_number = line_number
+        self.line = line
+        self.messages = messages
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.line_number}, {self.line!r}, {self.messages!r})'
+
+    def __str__(self):
+        return f'line {self.line_number} "{self.line.strip()}": {" ".join(self.messages)}'
 
 
 class CiscoFirmware(ABC):
 
-    def __init__(self, transport):
+    # path of the running config for copying it off the device when the transport has file transfer turned on
+    running_config_path = None
+    # show command printing only the line of the running config that changes every time the config is changed
+    config_change_signal_command = None
+    # show command listing one interface per row, used to get the names of the interfaces
+    interface_inventory_command = None
+    # show command giving the details and counters of an interface, the interface name is added to it
+    interface_detail_command = None
+    # set to True to have interfaces return interface_names instead of parsing the full show interfaces
+    brief_interfaces = False
+
+    def __init__(self, transport, show_version=None):
+        """
+        :param transport: Transport connected to the device
+        :type transport: BaseEngine
+        :param show_version: Output of show version already gathered from the device, ex. when detecting the
+            firmware, to build the device facts from without sending it again
+        :type show_version: list[str]
+        """
         if not isinstance(transport, BaseEngine):
             raise TypeError(f'transport object MUST be an instance of {getmodule(BaseEngine).__name__}.{BaseEngine.__name__}')
         self._terminal_length_value = None
         self._terminal_width_value = None
         self.transport = transport
+        self._device_facts = DeviceFacts(show_version, transport.hostname) if show_version else None
+        self.output_cache = None
+        self._config_commands_cached = 0
+        self._interface_names = None
+        # set by connect_ssh when the firmware came from a FirmwareCache, checked the next time show version is run
+        self.firmware_cache = None
+        self.firmware_cache_key = None
         #self.terminal_length()
 
     @property
@@ -37,6 +94,16 @@ class CiscoFirmware(ABC):
         """
         return self.transport.all_commands_sent
 
+    @property
+    def command_records(self) -> list:
+        """
+        Timings and counters of every command sent to the device in the current session, in the order their output
+        was gathered. Useful to see whether time is spent waiting on the device or sleeping.
+
+        :return: List of command records
+        :rtype: list[CommandRecord]
+        """
+        return self.transport.command_records
 
     def cli_to_config_mode(self) -> bool:
         """
@@ -45,6 +112,9 @@ class CiscoFirmware(ABC):
         :return: True/False
         :rtype: bool
         """
+        self.clear_output_cache()
+        # interfaces can be added or removed while in config mode
+        self._interface_names = None
         if self.transport.in_user_exec_mode:
             self.cli_to_privileged_exec_mode()
 
@@ -75,7 +145,8 @@ class CiscoFirmware(ABC):
                 if not self.transport.enable_password:
                     raise EnablePasswordError('No enable password provided, network device is asking for one!')
                 self.transport.send_command_get_output(self.transport.enable_password)
-                return self.transport.in_privileged_exec_mode
+        # enable may not ask for a password, ex. when AAA authorizes it, the prompt changes straight away
+        return self.transport.in_privileged_exec_mode
 
     @property
     def prompt(self) -> str:
@@ -97,6 +168,81 @@ class CiscoFirmware(ABC):
         """
         return self.transport.hostname
 
+    @property
+    def device_facts(self) -> DeviceFacts:
+        """
+        Facts parsed from show version. Show version is only sent to the device the first time the facts are needed
+        and not at all if it was already gathered to detect the firmware, use refresh_device_facts to gather it again.
+
+        :return: Device facts
+        :rtype: DeviceFacts
+        """
+        if self._device_facts is None:
+            self.refresh_device_facts()
+        return self._device_facts
+
+    def refresh_device_facts(self) -> DeviceFacts:
+        """
+        Sends show version to the device again and rebuilds the device facts from it
+
+        :return: Device facts
+        :rtype: DeviceFacts
+        """
+        if self.output_cache is not None:
+            self.output_cache.invalidate('show version')
+        self._device_facts = DeviceFacts(self.show_command_get_output('show version'), self.hostname)
+        return self._device_facts
+
+    @property
+    def version(self) -> str:
+        """
+        Software version running on the device, from the device facts
+
+        :return: Version
+        :rtype: str
+        """
+        return self.device_facts.version
+
+    @property
+    def model(self) -> str:
+        """
+        Hardware model of the device, from the device facts
+
+        :return: Model
+        :rtype: str
+        """
+        return self.device_facts.model
+
+    @property
+    def serial(self) -> str:
+        """
+        Serial number of the device, from the device facts
+
+        :return: Serial number
+        :rtype: str
+        """
+        return self.device_facts.serial
+
+    @property
+    def image(self) -> str:
+        """
+        Image file the device booted, from the device facts
+
+        :return: Image file
+        :rtype: str
+        """
+        return self.device_facts.image
+
+    @property
+    def current_uptime(self) -> str:
+        """
+        Uptime of the device right now, show version is sent every time and the device facts are refreshed with it
+
+        :return: Uptime
+        :rtype: str
+        """
+        return self.refresh_device_facts().uptime
+
     @property
     def config_parser(self):
         """
@@ -106,8 +252,197 @@ class CiscoFirmware(ABC):
         :return: Config Parser object with full running configuration
         :rtype: ConfigParser
         """
+        output_cache = self._current_output_cache()
         self.cli_to_privileged_exec_mode()
-        return ConfigParser(self.running_config)
+        if output_cache is None:
+            return ConfigParser(self.running_config)
+        parser = output_cache.get('config_parser')
+        if parser is None:
+            running_config = self.running_config
+            parser = ConfigParser(running_config)
+            output_cache.set('config_parser', parser, len(running_config))
+        return parser
+
+    def enable_output_cache(self, ttl=300, max_bytes=16 * 1024 * 1024) -> OutputCache:
+        """
+        Caches the output of show commands for this session so reading running_config, interfaces,
+        mac_address_table, config_parser etc. again does not send the command to the device again. Outputs are kept
+        for ttl seconds and the least recently used are dropped once more than max_bytes characters are held.
+
+        Everything cached is dropped when the CLI enters config mode and when the config is saved or local users
+        are added or deleted. Changes made to the device any other way are not seen until the output expires or
+        clear_output_cache is called.
+
+        :param ttl: Seconds an output is reused for, None to keep it until it is invalidated
+        :type ttl: float
+        :param max_bytes: Max number of characters of output to hold
+        :type max_bytes: int
+        :return: The output cache
+        :rtype: OutputCache
+        """
+        self.output_cache = OutputCache(ttl, max_bytes)
+        return self.output_cache
+
+    def clear_output_cache(self) -> None:
+        """
+        Drops every output in the output cache, if it is enabled
+
+        :return: Nothing
+        """
+        if self.output_cache is not None:
+            self.output_cache.invalidate()
+
+    @property
+    def config_change_signal(self) -> str:
+        """
+        The line of the running config that changes every time the configuration is changed, ex. "! Last
+        configuration change at ..." on IOS. Much cheaper to get than the full running config.
+
+        :return: Configuration change signal, None if the device does not have one
+        :rtype: str
+        """
+        if not self.config_change_signal_command:
+            return None
+        output = self.show_command_get_output(self.config_change_signal_command)
+        lines = [line.strip() for line in output[1:-1] if line.strip()]
+        return lines[0] if lines else None
+
+    def running_config_if_changed(self, fingerprints, key=None):
+        """
+        Returns the running config only if the configuration changed since it was last fetched with this method,
+        otherwise None. The configuration change signal is compared with the one stored in fingerprints, so a
+        device that did not change costs one short command instead of transferring its full running config.
+        Devices without a change signal are always fetched.
+
+        :param fingerprints: Fingerprints of the running configs fetched before
+        :type fingerprints: ConfigFingerprintStore
+        :param key: Key of the device in fingerprints, defaults to the address of the device the same way
+            FirmwareCache keys it (ex. 10.0.0.1:22), or the hostname if the session was not opened by connect_ssh
+        :type key: str
+        :return: Running config, None if it did not change
+        :rtype: str
+        """
+        # hostnames are not unique, two devices sharing one would overwrite each other's fingerprint
+        key = key or self.firmware_cache_key or self.hostname
+        # read before fetching so a change made while fetching is picked up on the next run
+        signal = self.config_change_signal
+        if fingerprints.unchanged(key, signal):
+            return None
+        running_config = self.running_config
+        fingerprints.set(key, signal, running_config)
+        return running_config
+
+    @property
+    def interface_names(self) -> list:
+        """
+        Names of the interfaces on the device from interface_inventory_command, which lists one interface per row
+        instead of pages of details and counters for each one like show interfaces. The names are gathered the
+        first time they are needed and kept for the session, until config mode is entered or
+        refresh_interface_names is called. Use interface_details to get the details of the interfaces you need.
+
+        :return: Interface names
+        :rtype: list[str]
+        """
+        if self._interface_names is None:
+            self._interface_names = self._get_interface_names()
+        return list(self._interface_names)
+
+    def _get_interface_names(self):
+        return InterfaceBriefParser(self.show_command_get_output(self.interface_inventory_command)).interface_names
+
+    def refresh_interface_names(self) -> list:
+        """
+        Gathers the interface names from the device again, see interface_names
+
+        :return: Interface names
+        :rtype: list[str]
+        """
+        if self.output_cache is not None:
+            self.output_cache.invalidate(self.interface_inventory_command)
+        self._interface_names = None
+        return self.interface_names
+
+    def interface_details(self, interfaces, buffer_size=500) -> dict:
+        """
+        Gets the details and counters of only the interfaces given, ex. "show interfaces GigabitEthernet1/0/1" for
+        each one. The commands are run with show_commands_get_outputs so they run in parallel when the transport
+        has exec channels or extra shells.
+
+        :param interfaces: Names of the interfaces ex. from interface_names
+        :type interfaces: list[str]
+        :param buffer_size: Size of buffer when getting output from device
+        :type buffer_size: int
+        :return: Dictionary of interface name to its output, starting with the command and ending with the prompt
+        :rtype: dict[str, list[str]]
+        """
+        interfaces = list(interfaces)
+        commands = [f'{self.interface_detail_command} {interface}' for interface in interfaces]
+        return dict(zip(interfaces, self.show_commands_get_outputs(commands, buffer_size))) if commands else {}
+
+    @property
+    def mac_address_table_entries(self) -> list:
+        """
+        Entries of the MAC address table parsed into MacEntryParser objects
+
+        :return: MAC address table entries
+        :rtype: list[MacEntryParser]
+        """
+        return list(self.iter_mac_address_table_entries())
+
+    def iter_mac_address_table_entries(self):
+        """
+        Yields the entries of the MAC address table parsed into MacEntryParser objects
+
+        :return: Generator of MAC address table entries
+        :rtype: Generator[MacEntryParser]
+        """
+        yield from MacAddressTableParser(self.mac_address_table).table_entries
+
+    def _running_config_from_file(self):
+        """
+        Copies the running config off the device if the transport has file transfer turned on, None if it does not
+        or the copy failed so the caller falls back to show running-config. Line endings are normalised to match
+        the output of show running-config.
+        """
+        if not self.running_config_path or not self.transport.file_transfer_available:
+            return None
+        output_cache = self._current_output_cache()
+        if output_cache is not None:
+            running_config = output_cache.get(self.running_config_path)
+            if running_config is not None:
+                return running_config
+        try:
+            running_config = self.transport.get_file(self.running_config_path)
+        except FileTransferError:
+            return None
+        running_config = self._strip_running_config_header(running_config)
+        if output_cache is not None:
+            output_cache.set(self.running_config_path, running_config, len(running_config))
+        return running_config
+
+    @staticmethod
+    def _strip_running_config_header(running_config):
+        """
+        Removes what IOS prints before the config in show running-config ("Building configuration...", "Current
+        configuration : N bytes") and the blank lines around the config, so show running-config and the running
+        config file give the same text
+        """
+        lines = running_config.replace('\r\n', '\n').split('\n')
+        while lines and (not lines[0].strip() or re.match(r'(Building configuration\.\.\.|Current configuration\s*:)',
+                                                          lines[0])):
+            lines.pop(0)
+        return '\n'.join(lines).rstrip('\n')
+
+    def _current_output_cache(self):
+        """
+        Returns the output cache, emptied first if the CLI was put into config mode without cli_to_config_mode or
+        config commands were sent since it was last used, ex. configure terminal ... end sent with send_command
+        """
+        if self.output_cache is not None and (self.transport.in_configuration_mode or
+                                              self.transport.config_commands_sent != self._config_commands_cached):
+            self.output_cache.invalidate()
+        self._config_commands_cached = self.transport.config_commands_sent
+        return self.output_cache
 
     def send_command_get_output(self, command, end=default_command_end, buffer_size=default_buffer,
                                 timeout=default_timeout, delay=default_delay) -> list:
@@ -126,6 +461,162 @@ class CiscoFirmware(ABC):
         """
         return self.transport.send_command_get_output(command, end, buffer_size, timeout, delay)
 
+    def send_commands_get_outputs(self, commands, end=default_command_end, buffer_size=default_buffer,
+                                  timeout=default_timeout, delay=default_delay) -> list:
+        """
+        Sends several commands to the device back to back and returns the output of each command separately.
+        Only one round trip is spent waiting on the device instead of one per command, which makes a big difference
+        over high latency links. Intended for commands that do not prompt for input such as show commands.
+
+        :param commands: Commands to send
+        :type commands: list[str]
+        :param end: End character (default \n)
+        :param buffer_size: Size of buffer when getting output from device. You shouldnt have to modify this much
+        :param timeout: Time to stop waiting for output if no output is received.
+        :param delay: Time to wait before gathering output from device
+        :return: Output of each command, starting with the command, ending with prompt, in a list split by line
+        :rtype: list[list[str]]
+        """
+        return self.transport.send_commands_get_outputs(commands, end, buffer_size, timeout, delay)
+
+    def show_commands_get_outputs(self, commands, buffer_size=default_buffer) -> list:
+        """
+        Gets the output of show commands. If the transport can run commands on exec channels they are run there,
+        all at the same time and without touching the shell. Otherwise several commands are run in parallel on
+        extra shells if the transport has them (see SSHEngine.shell_commands_get_outputs), and if not, or if the
+        device refuses them, they are sent through the shell in privileged exec mode with the terminal length set to 0.
+
+        :param commands: Show commands to run
+        :type commands: list[str]
+        :param buffer_size: Size of buffer when getting output from device. You shouldnt have to modify this much
+        :return: List with the output of each command starting with the command and ending with the prompt
+        :rtype: list[list[str]]
+        """
+        output_cache = self._current_output_cache()
+        if output_cache is None:
+            return self._show_commands_get_outputs(commands, buffer_size)
+
+        cached = {command: output_cache.get(command) for command in commands}
+        missing = [command for command, output in cached.items() if output is None]
+        if missing:
+            for command, output in zip(missing, self._show_commands_get_outputs(missing, buffer_size)):
+                output_cache.set(command, list(output))
+                cached[command] = output
+        return [list(cached[command]) for command in commands]
+
+    def _show_commands_get_outputs(self, commands, buffer_size):
+        outputs = None
+        if self.transport.exec_channels_available:
+            try:
+                outputs = self.transport.exec_commands_get_outputs(commands, buffer_size)
+            except ExecChannelError:
+                pass
+        if outputs is None and len(commands) > 1 and self.transport.shell_channels_available:
+            try:
+                outputs = self.transport.shell_commands_get_outputs(commands, buffer_size)
+            except ShellChannelError:
+                pass
+        if outputs is None:
+            self.cli_to_privileged_exec_mode()
+            self.terminal_length('0')
+            if len(commands) == 1:
+                outputs = [self.transport.send_command_get_output(commands[0], buffer_size=buffer_size)]
+            else:
+                outputs = self.transport.send_commands_get_outputs(commands, buffer_size=buffer_size)
+        if self.firmware_cache and 'show version' in commands:
+            self.firmware_cache.verify(self.firmware_cache_key, outputs[list(commands).index('show version')])
+        return outputs
+
+    def show_command_get_output(self, command, buffer_size=default_buffer) -> list:
+        """
+        Gets the output of a single show command, see show_commands_get_outputs
+
+        :param command: Show command to run
+        :type command: str
+        :return: Output from device starting with command, ending with prompt in a list split by line
+        :rtype: list
+        """
+        return self.show_commands_get_outputs([command], buffer_size)[0]
+
+    def push_config(self, lines, window=50, stop_on_error=False, buffer_size=default_buffer,
+                    timeout=default_timeout) -> list:
+        """
+        Enters config mode once and sends config lines in windows of up to window lines at a time without waiting
+        for the prompt after each line, so a window costs about one round trip instead of one per line. The output
+        of each line is checked for errors, and the CLI is put back in privileged exec mode when done.
+
+        Empty lines, lines starting with ! and end are skipped so a config file can be pushed as is. Lines that ask
+        a question or change the hostname can not be pushed this way, the device would take the lines after them
+        as the answer or the prompt would not be recognised.
+
+        :param lines: Config lines, or a string of config lines
+        :type lines: list[str]
+        :param window: Max number of lines sent before waiting for their prompts
+        :type window: int
+        :param stop_on_error: Stop pushing after the window with the first error, lines already sent are applied
+        :type stop_on_error: bool
+        :param buffer_size: Size of buffer when getting output from device. You shouldnt have to modify this much
+        :param timeout: Time to stop waiting for output if no output is received.
+        :return: The lines the device answered with an error, empty if every line was accepted
+        :rtype: list[ConfigLineFailure]
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        numbered_lines = [(number, line.rstrip()) for number, line in enumerate(lines, 1)
+                          if line.strip() and not line.strip().startswith('!') and line.strip() != 'end']
+        failures = []
+        self.cli_to_config_mode()
+        try:
+            for start in range(0, len(numbered_lines), window):
+                batch = numbered_lines[start:start + window]
+                outputs = self.transport.send_commands_get_outputs([line for _, line in batch],
+                                                                   buffer_size=buffer_size, timeout=timeout, delay=0)
+                for (number, line), output in zip(batch, outputs):
+                    messages = [x.strip() for x in output[1:] if x.strip().startswith('%')]
+                    if messages:
+                        failures.append(ConfigLineFailure(number, line, messages))
+                if len(outputs) < len(batch) or not self.transport.in_configuration_mode:
+                    # the device stopped answering or left config mode, the rest of the lines can not be trusted
+                    failures += [ConfigLineFailure(number, line, ['No prompt was returned for this line'])
+                                 for number, line in batch[len(outputs):]]
+                    break
+                if failures and stop_on_error:
+                    break
+        finally:
+            self.clear_output_cache()
+        self.cli_to_privileged_exec_mode()
+        return failures
+
+    def send_command_iter_lines(self, command, end=default_command_end, buffer_size=default_buffer,
+                                timeout=default_timeout, delay=default_delay):
+        """
+        Sends a command to the device and yields the output line by line as it is received rather than waiting
+        for all of it. Only the line currently being received is held in memory so this is the way to go for very
+        large output such as "show tech-support" or a full "show ip route" where you can process or write each line
+        to a file while the device is still sending the rest.
+
+        :param command: Command to send
+        :param end: End character (default \n)
+        :param buffer_size: Size of buffer when getting output from device. You shouldnt have to modify this much
+        :param timeout: Time to stop waiting for output if no output is received.
+        :param delay: Time to wait before gathering output from device
+        :return: Generator of lines of output starting with command, ending with prompt
+        :rtype: Generator[str]
+        """
+        return self.transport.send_command_iter_lines(command, end, buffer_size, timeout, delay)
+
+    def iter_output(self, buffer_size=default_buffer, timeout=default_timeout):
+        """
+        Yields output from the device line by line as it is received until the prompt is returned or the timeout
+        is reached. You should not need to run this directly often.
+
+        :param buffer_size: Size of buffer when getting output from device. You shouldnt have to modify this much
+        :param timeout: Time to stop waiting for output if no output is received.
+        :return: Generator of lines of output
+        :rtype: Generator[str]
+        """
+        return self.transport.iter_output(buffer_size, timeout)
+
     def send_command(self, command, end=default_command_end) -> None:
         """
         Sends command to device, does not get any output. You should not need to run this directly often
@@ -216,7 +707,8 @@ class CiscoFirmware(ABC):
     @abstractmethod
     def uptime(self) -> str:
         """
-        Returns uptime of device
+        Returns uptime of device as of when the device facts were gathered, use refresh_device_facts first or
+        current_uptime for the current uptime
 
         :return: Uptime
         :rtype: str
@@ -260,7 +752,10 @@ class CiscoFirmware(ABC):
     @abstractmethod
     def running_config(self) -> str:
         """
-        Returns running config in its raw form
+        Returns running config in its raw form. If the transport has file transfer turned on the running config is
+        copied off the device over SCP or SFTP instead of screen scraping show running-config, falling back to show
+        running-config if the copy fails. The copied file does not have the header lines show running-config prints
+        before the config (ex. "Building configuration...").
 
         :return: Running Configuration
         :rtype: str
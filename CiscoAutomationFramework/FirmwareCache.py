@@ -0,0 +1,140 @@
+from CiscoAutomationFramework.FirmwareDetect import firmware_name_from_show_version, version_from_show_version
+from CiscoAutomationFramework.JsonFileStore import JsonFileStore
+from time import time
+
+
+class FirmwareCache(JsonFileStore):
+    """
+    Remembers the firmware detected on each device in a JSON file so connect_ssh can skip sending "show version"
+    to devices it has already seen, saving a full command round trip per device per run.
+
+    Entries are keyed by host, port and jumphost and hold the firmware name, hostname, prompt and version of the
+    device. An entry is only used if it is younger than ttl seconds and the prompt found at login is the same as when the
+    firmware was detected, otherwise the firmware is detected again. The detection is verified the next time show
+    version is gathered from the device, if the firmware found differs the entry is replaced.
+
+    The cache is thread safe so a single cache can be shared by all the threads of a script::
+
+        with FirmwareCache('firmware.json') as cache:
+            with connect_ssh('ip', 'username', 'password', firmware_cache=cache) as ssh:
+                ...
+    """
+
+    def __init__(self, path, ttl=86400):
+        """
+        :param path: Path of the JSON file to keep the cache in, it is created if it does not exist
+        :type path: str
+        :param ttl: Seconds an entry is trusted before the firmware is detected again
+        :type ttl: float
+        """
+        super().__init__(path)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(ip, port=22, jumphost=None):
+        """
+        Key of the entry for a device
+
+        :param ip: IP address or hostname of the device
+        :type ip: str
+        :param port: SSH port of the device
+        :type port: int
+        :param jumphost: Jumphost the device is reached through, the same address behind two jumphosts is two devices
+        :type jumphost: JumphostTunnel
+        :return: Cache key
+        :rtype: str
+        """
+        if jumphost:
+            jumphost_ip, jumphost_port, jumphost_username = jumphost.identity
+            return f'{jumphost_username}@{jumphost_ip}:{jumphost_port}/{ip}:{port}'
+        return f'{ip}:{port}'
+
+    def get(self, key, prompt=None):
+        """
+        Returns the entry for key, or None if there is no entry, it is older than ttl or it was detected with a
+        different prompt. Stale entries are removed.
+
+        :param key: Cache key of the device
+        :type key: str
+        :param prompt: Prompt found at login, the entry is only returned if it was detected with the same prompt
+        :type prompt: str
+        :return: Entry with the keys firmware, hostname, prompt, version and detected_at
+        :rtype: dict
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if time() - entry['detected_at'] > self.ttl or (prompt is not None and entry['prompt'] != prompt):
+                del self._entries[key]
+                return None
+            return dict(entry)
+
+    def set(self, key, firmware, hostname, prompt, version=None):
+        """
+        Stores the firmware detected on a device
+
+        :param key: Cache key of the device
+        :type key: str
+        :param firmware: Firmware name, one of IOS, IOSXE, NXOS
+        :type firmware: str
+        :param hostname: Hostname of the device
+        :type hostname: str
+        :param prompt: Prompt found at login
+        :type prompt: str
+        :param version: Software version of the device
+        :type version: str
+        :return: Nothing
+        """
+        with self._lock:
+            self._entries[key] = {'firmware': firmware, 'hostname': hostname, 'prompt': prompt,
+                                  'version': version, 'detected_at': time()}
+
+    def set_from_show_version(self, key, show_version, hostname, prompt):
+        """
+        Stores the firmware and version found in the output of show version, returns the firmware name
+
+        :param key: Cache key of the device
+        :type key: str
+        :param show_version: Output of show version split by line
+        :type show_version: list[str]
+        :param hostname: Hostname of the device
+        :type hostname: str
+        :param prompt: Prompt found at login
+        :type prompt: str
+        :return: Firmware name
+        :rtype: str
+        """
+        firmware = firmware_name_from_show_version(show_version)
+        self.set(key, firmware, hostname, prompt, version_from_show_version(show_version))
+        return firmware
+
+    def verify(self, key, show_version):
+        """
+        Checks the firmware of a cached entry against the output of show version gathered later in the session,
+        replacing the entry if they do not match.
+
+        :param key: Cache key of the device
+        :type key: str
+        :param show_version: Output of show version split by line
+        :type show_version: list[str]
+        :return: True if the cached firmware matched
+        :rtype: bool
+        """
+        entry = self.get(key)
+        if entry and entry['firmware'] == firmware_name_from_show_version(show_version):
+            return True
+        if entry:
+            self.set_from_show_version(key, show_version, entry['hostname'], entry['prompt'])
+        return False
+
+    def invalidate(self, key):
+        """
+        Removes the entry for key so the firmware is detected on the next connection
+
+        :param key: Cache key of the device
+        :type key: str
+        :return: Nothing
+        """
+        with self._lock:
+            self._entries.pop(key, None)
@@ -2,16 +2,23 @@ from CiscoAutomationFramework.TransportEngines import BaseEngine
 from CiscoAutomationFramework.IOS import IOS
 from CiscoAutomationFramework.IOSXE import IOSXE
 from CiscoAutomationFramework.NXOS import NXOS
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
 from inspect import getmodule
 from time import sleep
 
 
-def detect_firmware(transport):
-    if not isinstance(transport, BaseEngine):
-        raise TypeError(f'transport argument MUST be an instance of {getmodule(BaseEngine).__name__}.{BaseEngine.__name__}')
+firmware_classes = {'IOS': IOS, 'IOSXE': IOSXE, 'NXOS': NXOS}
 
-    show_version = transport.send_command_get_truncated_output('show version')
 
+def firmware_name_from_show_version(show_version):
+    """
+    Determines the firmware type of a device from the output of "show version"
+
+    :param show_version: Output of show version split by line
+    :type show_version: list[str]
+    :return: Firmware name, one of IOS, IOSXE, NXOS, ASA
+    :rtype: str
+    """
     results = {'IOSXE': 0, 'IOS': 0, 'NXOS': 0, 'ASA': 0}
     for line in show_version[:10]:
         if 'ios-xe' in line.lower() or 'ios xe' in line.lower():
@@ -23,12 +30,84 @@ def detect_firmware(transport):
         elif 'adaptive security appliance' in line.lower():
             results['ASA'] += 1
 
-    # stores the key with the highest value in a variable
-    firmware_version = max(results, key=results.get)
-    firmware_object = {'IOS': IOS, 'IOSXE': IOSXE, 'NXOS': NXOS}.get(firmware_version)
+    # returns the key with the highest value
+    return max(results, key=results.get)
+
+
+def version_from_show_version(show_version):
+    """
+    Finds the software version of a device in the output of "show version"
+
+    :param show_version: Output of show version split by line
+    :type show_version: list[str]
+    :return: Software version, ex. 15.2(7)E4, None if it could not be found
+    :rtype: str
+    """
+    return DeviceFacts(show_version).version
+
+
+def identify_firmware(transport, firmware_cache=None, cache_key=None):
+    """
+    Determines the firmware of the device the transport is connected to. With a firmware cache show version is
+    only sent if the device has no valid entry in it.
+
+    :param transport: Transport connected to the device
+    :type transport: BaseEngine
+    :param firmware_cache: Cache of previously detected firmware
+    :type firmware_cache: FirmwareCache
+    :param cache_key: Cache key of the device
+    :type cache_key: str
+    :return: CiscoFirmware class and the output of show version split by line, None if it came from the cache
+    :rtype: tuple
+    """
+    if not isinstance(transport, BaseEngine):
+        raise TypeError(f'transport argument MUST be an instance of {getmodule(BaseEngine).__name__}.{BaseEngine.__name__}')
+
+    if firmware_cache:
+        entry = firmware_cache.get(cache_key, transport.prompt)
+        if entry and entry['firmware'] in firmware_classes:
+            return firmware_classes[entry['firmware']], None
+
+    show_version = transport.send_command_get_truncated_output('show version')
+
+    if firmware_cache:
+        firmware_version = firmware_cache.set_from_show_version(cache_key, show_version, transport.hostname,
+                                                                transport.prompt)
+    else:
+        firmware_version = firmware_name_from_show_version(show_version)
+    return firmware_classes.get(firmware_version), show_version
+
+
+def detect_firmware(transport, firmware_cache=None, cache_key=None):
+    """
+    Determines the firmware of the device the transport is connected to, returns the CiscoFirmware class to wrap
+    the transport in. See identify_firmware.
+
+    :return: CiscoFirmware class
+    :rtype: type
+    """
+    firmware_object, _ = identify_firmware(transport, firmware_cache, cache_key)
 
     # returns firmware object
     return firmware_object
 
 
+def firmware_for_transport(transport, firmware_cache=None, cache_key=None):
+    """
+    Detects the firmware of the device the transport is connected to and returns the transport wrapped in it. The
+    show version sent to detect the firmware is kept as the device facts so it is not sent again.
 
+    :param transport: Transport connected to the device
+    :type transport: BaseEngine
+    :param firmware_cache: Cache of previously detected firmware
+    :type firmware_cache: FirmwareCache
+    :param cache_key: Cache key of the device
+    :type cache_key: str
+    :return: CiscoFirmware Object
+    :rtype: CiscoFirmware
+    """
+    firmware_object, show_version = identify_firmware(transport, firmware_cache, cache_key)
+    firmware = firmware_object(transport, show_version)
+    firmware.firmware_cache = firmware_cache
+    firmware.firmware_cache_key = cache_key
+    return firmware
@@ -1,65 +1,66 @@
 from CiscoAutomationFramework.FirmwareBase import CiscoFirmware
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
 from time import sleep
 
 
 class IOS(CiscoFirmware):
 
+    running_config_path = 'system:running-config'
+    config_change_signal_command = 'show running-config | include Last configuration change'
+    interface_inventory_command = 'show ip interface brief'
+    interface_detail_command = 'show interfaces'
+
     @property
     def uptime(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        device_output = self.transport.send_command_get_output('show version')
-        for line in device_output:
-            if f'{self.transport.hostname.lower()} uptime' in line.lower():
-                return ' '.join(line.split()[3:])
-
-        return None
+        return self.device_facts.uptime
 
     @property
     def interfaces(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        raw_data = self.transport.send_command_get_output('show interfaces', buffer_size=500)
-        try:
-            parsed_data = [x.split()[0] for x in raw_data[2:-2] if not x.startswith(' ')]
-        except IndexError as _:
-            raise IndexError('Unexpected data from device, Unable to extract interface names from "show interfaces" command!')
-        return parsed_data
+        if self.brief_interfaces:
+            return self.interface_names
+        raw_data = self.show_command_get_output('show interfaces', buffer_size=500)
+        return self._parse_interfaces(raw_data)
 
     @property
     def mac_address_table(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        return self.transport.send_command_get_output('show mac address-table')
+        return self.show_command_get_output('show mac address-table')
 
     @property
     def arp_table(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        return self.transport.send_command_get_output('show ip arp')
+        return self.show_command_get_output('show ip arp')
 
     @property
     def running_config(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-
-        running_config = self.transport.send_command_get_output('show running-config', buffer_size=1024)
+        running_config = self._running_config_from_file()
+        if running_config is not None:
+            return running_config
+        running_config = self.show_command_get_output('show running-config', buffer_size=1024)
         # if the running config grabbed is less than 4 lines and the prompt is not in the last 4 lines of the config
         while len(running_config) < 4 and not any([True if self.prompt in x else False for x in reversed(running_config[-4:])]):
             running_config += self.transport.get_output(buffer_size=1024, no_command_sent_previous=True)
             sleep(.3)
-        return '\n'.join(running_config[2:-2])
+        return self._strip_running_config_header('\n'.join(running_config[2:-2]))
 
     @property
     def startup_config(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        config = self.transport.send_command_get_output('show startup-config', buffer_size=1024)
+        config = self.show_command_get_output('show startup-config', buffer_size=1024)
         while len(config) < 4 and not any([True if self.prompt in x else False for x in reversed(config[-4:])]):
             config += self.transport.get_output(buffer_size=1024, no_command_sent_previous=True)
             sleep(.3)
         return '\n'.join(config[2:-2])
 
+    @staticmethod
+    def _parse_uptime(show_version, hostname):
+        return DeviceFacts(show_version, hostname).uptime
+
+    @staticmethod
+    def _parse_interfaces(raw_data):
+        try:
+            parsed_data = [x.split()[0] for x in raw_data[2:-2] if not x.startswith(' ')]
+        except IndexError as _:
+            raise IndexError('Unexpected data from device, Unable to extract interface names from "show interfaces" command!')
+        return parsed_data
+
     def _terminal_length(self, n='0'):
         self.cli_to_privileged_exec_mode()
         return self.transport.send_command_get_output(f'terminal length {n}')
@@ -69,6 +70,7 @@ class IOS(CiscoFirmware):
         return self.transport.send_command_get_output(f'terminal width {n}')
 
     def save_config(self):
+        self.clear_output_cache()
         self.cli_to_privileged_exec_mode()
         self.transport.send_command('copy running-config startup-config')
         data = self.transport.send_command_get_output('', timeout=15)
@@ -82,9 +84,13 @@ class IOS(CiscoFirmware):
         kwarg_string = ' '.join([f'{key} {value}' for key, value in kwargs.items()])
         command_string = f'username {username} {" ".join(args)} {kwarg_string} secret {password_code} {password}'
         self.cli_to_config_mode()
-        return self.transport.send_command_get_output(command_string)
+        output = self.transport.send_command_get_output(command_string)
+        self.clear_output_cache()
+        return output
 
     def delete_local_user(self, username):
         self.cli_to_config_mode()
         self.transport.send_command(f'no username {username}')
-        return self.transport.send_command_get_output('')
\ No newline at end of file
+        output = self.transport.send_command_get_output('')
+        self.clear_output_cache()
+        return output
\ No newline at end of file
@@ -0,0 +1,48 @@
+from threading import Lock
+import json
+import os
+
+
+class JsonFileStore:
+    """
+    Base of the stores that keep a dictionary of entries per device in a JSON file between runs, ex. FirmwareCache
+    and ConfigFingerprintStore. The file is read when the store is created and written by save, or when the store
+    is used as a context manager, on exit. Subclasses hold _lock while they read or change _entries.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the JSON file to keep the entries in, it is created if it does not exist
+        :type path: str
+        """
+        self.path = path
+        self._lock = Lock()
+        self._entries = self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            # a missing or corrupt file starts the store empty, it is rebuilt as devices are seen
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def save(self):
+        """
+        Writes the entries to the file. The file is replaced in one step so a crash while saving, or another process
+        reading it, never sees a partly written file.
+
+        :return: Nothing
+        """
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(self._entries, file, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
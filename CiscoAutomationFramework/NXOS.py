@@ -1,70 +1,120 @@
 from CiscoAutomationFramework.FirmwareBase import CiscoFirmware
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
+from CiscoAutomationFramework.Parsers.JsonRowDecoder import JsonRowDecoder
+from CiscoAutomationFramework.Parsers.MacAddressTableParser import MacEntryParser
+from CiscoAutomationFramework.TransportEngines import default_buffer
 from time import sleep
+import re
 
 class NXOS(CiscoFirmware):
 
+    running_config_path = 'running-config'
+    config_change_signal_command = 'show running-config | include "Running configuration last done"'
+    interface_inventory_command = 'show interface brief'
+    interface_detail_command = 'show interface'
+    # None until "| json" has been tried, False if the device does not support it
+    json_output_supported = None
+    _error_line = re.compile(r'\n[ \t]*%')
+
     @property
     def is_nexus(self):
         return True
 
     @property
     def uptime(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        device_output = self.transport.send_command_get_output('show version')
-        for line in device_output.splitlines():
-            if 'uptime' in line.lower():
-                return ' '.join(line.split()[3:])
-
-        return None
+        return self.device_facts.uptime
 
     @property
     def interfaces(self):
-        possible_interface_prefixes = ('Eth', 'Po', 'Vl', 'mgm ', 'Gi', 'Te', 'Fo', 'Fa')
+        if self.brief_interfaces:
+            return self.interface_names
+        raw_data = self.show_command_get_output('show interface', buffer_size=500)
+        return self._parse_interfaces(raw_data)
+
+    def _get_interface_names(self):
+        if self.json_output_supported is not False:
+            interfaces = [row['interface'] for row in self.iter_json_rows(self.interface_inventory_command,
+                                                                          'ROW_interface')]
+            if self.json_output_supported:
+                return interfaces
+        return super()._get_interface_names()
+
+    def iter_json_rows(self, command, row_key, buffer_size=default_buffer):
+        """
+        Runs a show command with "| json" and yields the rows of its table as they are received, so a very large
+        table is processed while it is still arriving without screen scraping the text output. If the device
+        rejects "| json" nothing is yielded and json_output_supported becomes False.
+
+        :param command: Show command to run, without "| json"
+        :type command: str
+        :param row_key: Key the rows are under ex. ROW_mac_address, see JsonRowDecoder
+        :type row_key: str
+        :param buffer_size: Size of buffer when getting output from device
+        :type buffer_size: int
+        :return: Generator of rows
+        :rtype: Generator[dict]
+        """
         self.cli_to_privileged_exec_mode()
         self.terminal_length('0')
-        raw_data = self.transport.send_command_get_output('show interface', buffer_size=500)
-        try:
-            parsed_data = [x.split()[0] for x in raw_data[2:-2] if len(x) > 1 and x.startswith(possible_interface_prefixes)]
-        except IndexError as _:
-            raise IndexError('Unexpected data from device, Unable to extract interface names from "show interfaces" command!')
-        return parsed_data
+        decoder = JsonRowDecoder(row_key)
+        rejected = False
+        previous = '\n'
+        # the table is a single line, chunks are decoded as they arrive instead of waiting for the end of the line
+        for chunk in self.transport.send_command_iter_chunks(f'{command} | json', buffer_size=buffer_size, delay=0):
+            if not decoder.found and self._error_line.search(previous[-1:] + chunk):
+                rejected = True
+            previous = chunk
+            yield from decoder.feed(chunk)
+        self.json_output_supported = decoder.found or not rejected
+
+    def iter_mac_address_table_entries(self):
+        if self.json_output_supported is not False:
+            for row in self.iter_json_rows('show mac address-table', 'ROW_mac_address'):
+                yield MacEntryParser.from_nxos_json(row)
+            if self.json_output_supported:
+                return
+        yield from super().iter_mac_address_table_entries()
 
     @property
     def mac_address_table(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        return self.transport.send_command_get_output('show mac address-table')
+        return self.show_command_get_output('show mac address-table')
 
     @property
     def arp_table(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        return self.transport.send_command_get_output('show ip arp')
+        return self.show_command_get_output('show ip arp')
 
     @property
     def running_config(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-        self.transport.send_command('show running-config')
-
-        running_config = self.transport.get_output(buffer_size=1024)
+        running_config = self._running_config_from_file()
+        if running_config is not None:
+            return running_config
+        running_config = self.show_command_get_output('show running-config', buffer_size=1024)
         while len(running_config) < 4 and not any([True if self.prompt in x else False for x in reversed(running_config[-4:])]):
             running_config += self.transport.get_output(buffer_size=1024, no_command_sent_previous=True)
             sleep(.3)
-        return '\n'.join(running_config[2:-2])
+        return self._strip_running_config_header('\n'.join(running_config[2:-2]))
 
     @property
     def startup_config(self):
-        self.cli_to_privileged_exec_mode()
-        self.terminal_length('0')
-
-        config = self.transport.send_command_get_output('show startup-config', buffer_size=1024)
+        config = self.show_command_get_output('show startup-config', buffer_size=1024)
         while len(config) < 4 and not any([True if self.prompt in x else False for x in reversed(config[-4:])]):
             config += self.transport.get_output(buffer_size=1024, no_command_sent_previous=True)
             sleep(.3)
         return '\n'.join(config[2:-2])
 
+    @staticmethod
+    def _parse_uptime(show_version, hostname):
+        return DeviceFacts(show_version, hostname).uptime
+
+    @staticmethod
+    def _parse_interfaces(raw_data):
+        possible_interface_prefixes = ('Eth', 'Po', 'Vl', 'mgm ', 'Gi', 'Te', 'Fo', 'Fa')
+        try:
+            parsed_data = [x.split()[0] for x in raw_data[2:-2] if len(x) > 1 and x.startswith(possible_interface_prefixes)]
+        except IndexError as _:
+            raise IndexError('Unexpected data from device, Unable to extract interface names from "show interfaces" command!')
+        return parsed_data
+
     def _terminal_length(self, n='0'):
         self.cli_to_privileged_exec_mode()
         return self.transport.send_command_get_output(f'terminal length {n}')
@@ -74,6 +124,7 @@ class NXOS(CiscoFirmware):
         return self.transport.send_command_get_output(f'terminal width {n}')
 
     def save_config(self):
+        self.clear_output_cache()
         self.cli_to_privileged_exec_mode()
         data = self.transport.send_command_get_output('copy running-config startup-config', timeout=15)
         # if the prompt is in the last line of output and there is not a percent sign in any line of output we will
@@ -93,9 +144,13 @@ class NXOS(CiscoFirmware):
 
         command_string = f'username {username} {" ".join(args)} {kwarg_string} password {password_code} {password}'
         self.cli_to_config_mode()
-        return self.transport.send_command_get_output(command_string)
+        output = self.transport.send_command_get_output(command_string)
+        self.clear_output_cache()
+        return output
 
     def delete_local_user(self, username):
         self.cli_to_config_mode()
         self.transport.send_command(f'no username {username}')
-        return self.transport.send_command_get_output('')
\ No newline at end of file
+        output = self.transport.send_command_get_output('')
+        self.clear_output_cache()
+        return output
\ No newline at end of file
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class OutputCache:
+    """
+    Least recently used cache of command outputs for a single session. Outputs are kept for ttl seconds, and once
+    the outputs held add up to more than max_bytes characters the least recently used ones are dropped.
+
+    Used by CiscoFirmware when the output cache is enabled, see CiscoFirmware.enable_output_cache.
+    """
+
+    def __init__(self, ttl=300, max_bytes=16 * 1024 * 1024):
+        """
+        :param ttl: Seconds an output is reused for, None to keep it until it is invalidated
+        :type ttl: float
+        :param max_bytes: Max number of characters of output to hold
+        :type max_bytes: int
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    @staticmethod
+    def size_of(output):
+        """
+        Number of characters in an output, lines are counted with their line ending
+
+        :param output: Output split by line
+        :type output: list[str]
+        :return: Size
+        :rtype: int
+        """
+        return sum(len(line) + 1 for line in output)
+
+    def get(self, key, count=True):
+        """
+        Returns what is cached under key, or None if nothing is or it is older than ttl
+
+        :param key: Command the output is for
+        :type key: str
+        :param count: Count the lookup in hits and misses
+        :type count: bool
+        :return: Cached value
+        """
+        entry = self._entries.get(key)
+        if entry and self.ttl is not None and monotonic() - entry[2] > self.ttl:
+            self._remove(key)
+            entry = None
+        if count:
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not entry:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key, value, size=None):
+        """
+        Caches value under key, dropping the least recently used entries to stay within max_bytes. Values larger
+        than max_bytes are not cached.
+
+        :param key: Command the output is for
+        :type key: str
+        :param value: Output split by line, or an object built from it when size is given
+        :param size: Size to count the value as, defaults to the size of value as an output
+        :type size: int
+        :return: Nothing
+        """
+        size = self.size_of(value) if size is None else size
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, monotonic())
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.size -= entry[1]
+
+    def invalidate(self, key=None):
+        """
+        Drops what is cached under key, or everything if no key is given
+
+        :param key: Command the output is for
+        :type key: str
+        :return: Nothing
+        """
+        if key is None:
+            self._entries.clear()
+            self.size = 0
+        else:
+            self._remove(key)
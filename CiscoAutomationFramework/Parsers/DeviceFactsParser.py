@@ -0,0 +1,103 @@
+import re
+
+
+class DeviceFacts:
+    """
+    Facts about a device parsed from the output of "show version" on IOS, IOSXE and NXOS. Facts that can not be
+    found in the output are None.
+
+    The facts are a snapshot of when show version was run, uptime included.
+    """
+
+    def __init__(self, show_version, hostname=None):
+        """
+        :param show_version: Output of show version split by line
+        :type show_version: list[str]
+        :param hostname: Hostname of the device, used to find the uptime on IOS
+        :type hostname: str
+        """
+        self.show_version = show_version
+        self.hostname = hostname
+
+    def _search(self, *patterns):
+        """
+        First group of the first line matching any of the patterns, patterns are tried in order
+        """
+        for pattern in patterns:
+            for line in self.show_version:
+                match = re.search(pattern, line)
+                if match:
+                    return match.group(1).strip()
+        return None
+
+    @property
+    def version(self):
+        """
+        Software version ex. 15.2(7)E4, 9.3(5)
+
+        :return: Version
+        :rtype: str
+        """
+        # NXOS lists the version of each component under Software, the system version is NXOS or system
+        version = self._search(r'^\s*(?:NXOS|system):\s+version\s+(\S+)')
+        if version:
+            return version
+        for line in self.show_version[:10]:
+            match = re.search(r'\bVersion\s+([^\s,]+)', line)
+            if match and 'ios' in line.lower():
+                return match.group(1)
+        return None
+
+    @property
+    def model(self):
+        """
+        Hardware model ex. WS-C2960X-48FPD-L, Nexus9000 C93180YC-EX
+
+        :return: Model
+        :rtype: str
+        """
+        return self._search(r'^Model [Nn]umber\s*:\s*(\S+)', r'^\s*cisco (.+?) [Cc]hassis', r'^[Cc]isco (\S+) .*processor')
+
+    @property
+    def serial(self):
+        """
+        Serial number of the chassis
+
+        :return: Serial number
+        :rtype: str
+        """
+        return self._search(r'^System [Ss]erial [Nn]umber\s*:\s*(\S+)', r'Processor [Bb]oard ID\s+(\S+)')
+
+    @property
+    def image(self):
+        """
+        Image file the device booted ex. flash:c2960x-universalk9-mz.152-7.E4.bin
+
+        :return: Image file
+        :rtype: str
+        """
+        return self._search(r'[Ii]mage file is:?\s+"?([^"\s]+)')
+
+    @property
+    def uptime(self):
+        """
+        Uptime of the device when show version was run ex. 5 days, 13 hours, 17 minutes
+
+        :return: Uptime
+        :rtype: str
+        """
+        if self.hostname:
+            uptime = self._search(rf'(?i)^{re.escape(self.hostname)} uptime is (.+)$')
+            if uptime:
+                return uptime
+        return self._search(r'^Kernel uptime is (.+)$', r'^\S+ uptime is (.+)$')
+
+    def as_dict(self):
+        """
+        All facts in a dictionary, ex. for writing an inventory to a file
+
+        :return: Facts
+        :rtype: dict
+        """
+        return {'hostname': self.hostname, 'version': self.version, 'model': self.model, 'serial': self.serial,
+                'image': self.image, 'uptime': self.uptime}
@@ -0,0 +1,72 @@
+import re
+
+
+class InterfaceBriefParser:
+    """
+    Provide the output directly from the device after issuing "show ip interface brief" (IOS) or
+    "show interface brief" (NXOS) to this object to parse it. Both list one interface per row, which makes them
+    a much smaller way of getting the interfaces of a device than show interfaces.
+
+    NXOS prints the table in sections (management, ethernet, vlan...) each with its own header between lines of
+    dashes, and abbreviates some interface names, those are expanded to the names used in the config.
+    """
+    # NXOS abbreviations in show interface brief and the name the interface has in the config
+    abbreviations = {'Eth': 'Ethernet', 'Po': 'port-channel', 'Lo': 'loopback'}
+
+    def __init__(self, raw_output):
+        if not isinstance(raw_output, list):
+            self.raw_output = raw_output.splitlines()
+        else:
+            self.raw_output = raw_output
+
+    @staticmethod
+    def _is_separator(line):
+        return set(line.strip()) == {'-'}
+
+    @property
+    def rows(self):
+        """
+        Lines of the output that are rows of the table, without the headers, command and prompt
+
+        :return: Rows
+        :rtype: list[str]
+        """
+        rows = []
+        sectioned = any(self._is_separator(line) for line in self.raw_output)
+        in_table = False
+        separators = 0
+        for line in self.raw_output:
+            if sectioned and self._is_separator(line):
+                separators += 1
+                # the header of each section is between two lines of dashes, rows follow the second one
+                in_table = separators % 2 == 0
+            elif not sectioned and line.startswith('Interface'):
+                in_table = True
+            elif in_table and len(line.split()) > 1:
+                rows.append(line)
+        return rows
+
+    @property
+    def interface_names(self):
+        """
+        Names of the interfaces in the table in the order they are listed ex. GigabitEthernet1/0/1, Ethernet1/1
+
+        :return: Interface names
+        :rtype: list[str]
+        """
+        return [self.expand(row.split()[0]) for row in self.rows]
+
+    @classmethod
+    def expand(cls, name):
+        """
+        Expands an abbreviated NXOS interface name ex. Eth1/1 to Ethernet1/1, other names are returned as they are
+
+        :param name: Interface name
+        :type name: str
+        :return: Interface name
+        :rtype: str
+        """
+        match = re.match(r'([A-Za-z]+)(\d.*)$', name)
+        if match and match.group(1) in cls.abbreviations:
+            return f'{cls.abbreviations[match.group(1)]}{match.group(2)}'
+        return name
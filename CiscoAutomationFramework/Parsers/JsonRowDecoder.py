@@ -0,0 +1,106 @@
+from json import JSONDecoder, JSONDecodeError
+import re
+
+
+class JsonRowDecoder:
+    """
+    Incremental decoder for the JSON output of NX-OS commands run with "| json". NX-OS puts the rows of a table in
+    a list under a ROW_ key, ex. TABLE_mac_address -> ROW_mac_address -> [{...}, {...}]. Output is fed in as it is
+    received and each row is returned as soon as it is complete, so very large tables are parsed while they are
+    still arriving and never held in memory as a whole.
+
+    Anything before the row key, like the command echoed by the shell, and after the list, like the prompt, is
+    skipped::
+
+        decoder = JsonRowDecoder('ROW_mac_address')
+        for chunk in output:
+            for row in decoder.feed(chunk):
+                ...
+    """
+
+    _value_start = re.compile(r'\s*:\s*([\[{])')
+
+    def __init__(self, row_key):
+        """
+        :param row_key: Key the rows are under ex. ROW_mac_address, rows nested inside other rows are returned
+            as part of the row they are in
+        :type row_key: str
+        """
+        self.row_key = row_key
+        self.found = False
+        self._key = f'"{row_key}"'
+        self._decoder = JSONDecoder()
+        self._buffer = ''
+        self._in_rows = False
+
+    def feed(self, text):
+        """
+        Adds output received from the device and returns the rows completed by it
+
+        :param text: Output received from the device
+        :type text: str
+        :return: Rows completed
+        :rtype: list[dict]
+        """
+        self._buffer += text
+        rows = []
+        while True:
+            if not self._in_rows and not self._find_rows(rows):
+                return rows
+            if not self._decode_rows(rows):
+                return rows
+
+    def _find_rows(self, rows):
+        """
+        Moves the buffer up to the start of the next list of rows, a table with a single row has the row itself
+        instead of a list. Returns False if more output is needed.
+        """
+        position = self._buffer.find(self._key)
+        if position < 0:
+            # keep enough to find a key split between two chunks
+            self._buffer = self._buffer[-len(self._key):]
+            return False
+        match = self._value_start.match(self._buffer, position + len(self._key))
+        if not match:
+            if self._buffer[position + len(self._key):].strip(' \t\r\n:'):
+                # the key is in a string value, not a key of a table
+                self._buffer = self._buffer[position + len(self._key):]
+                return True
+            self._buffer = self._buffer[position:]
+            return False
+        self.found = True
+        if match.group(1) == '[':
+            self._buffer = self._buffer[match.end():]
+            self._in_rows = True
+            return True
+        try:
+            row, end = self._decoder.raw_decode(self._buffer, match.end() - 1)
+        except JSONDecodeError:
+            self._buffer = self._buffer[position:]
+            return False
+        rows.append(row)
+        self._buffer = self._buffer[end:]
+        return True
+
+    def _decode_rows(self, rows):
+        """
+        Decodes every complete row at the start of the buffer. Returns False if more output is needed.
+        """
+        position = 0
+        while True:
+            while position < len(self._buffer) and self._buffer[position] in ' \t\r\n,':
+                position += 1
+            if position == len(self._buffer):
+                self._buffer = ''
+                return False
+            if self._buffer[position] == ']':
+                self._buffer = self._buffer[position + 1:]
+                self._in_rows = False
+                return True
+            try:
+                row, position = self._decoder.raw_decode(self._buffer, position)
+            except JSONDecodeError:
+                # the row is not complete yet
+                self._buffer = self._buffer[position:]
+                return False
+            rows.append(row)
@@ -3,6 +3,29 @@ class MacEntryParser:
         self.raw_entry = raw_entry
         self.split_entry = raw_entry.split()
 
+    @classmethod
+    def from_nxos_json(cls, row):
+        """
+        Builds an entry from a row of "show mac address-table | json" on NX-OS, laid out the same as a row of the
+        text table so every property works the same
+
+        :param row: Row of the ROW_mac_address list
+        :type row: dict
+        :return: MAC address table entry
+        :rtype: MacEntryParser
+        """
+        entry = cls.__new__(cls)
+        entry.split_entry = [row.get('disp_type', '').strip() or '-',
+                             row.get('disp_vlan', '-'),
+                             row.get('disp_mac_addr', '-'),
+                             'static' if row.get('disp_is_static') == 'enabled' else 'dynamic',
+                             row.get('disp_age', '-'),
+                             'T' if row.get('disp_is_secure') == 'enabled' else 'F',
+                             'T' if row.get('disp_is_ntfy') == 'enabled' else 'F',
+                             row.get('disp_port', '-')]
+        entry.raw_entry = ' '.join(entry.split_entry)
+        return entry
+
     @property
     def is_nexus(self):
         """Searches the entire mac address table, checking if any of a set of keywords
@@ -4,4 +4,7 @@ from CiscoAutomationFramework.Parsers.CDPparser import CDPparser
 from CiscoAutomationFramework.Parsers.PowerInlineParser import PowerInlineParser
 from CiscoAutomationFramework.Parsers.MacAddressTableParser import MacAddressTableParser
 from CiscoAutomationFramework.Parsers.InterfaceStatusParser import InterfaceStatusOutputParser
-from CiscoAutomationFramework.Parsers.IpDeviceTrackingParser import DeviceTrackingOutputParser
\ No newline at end of file
+from CiscoAutomationFramework.Parsers.IpDeviceTrackingParser import DeviceTrackingOutputParser
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
+from CiscoAutomationFramework.Parsers.JsonRowDecoder import JsonRowDecoder
+from CiscoAutomationFramework.Parsers.InterfaceBriefParser import InterfaceBriefParser
@@ -0,0 +1,305 @@
+from CiscoAutomationFramework.TransportEngines import BaseEngine, SSHEngine, LoginHandshake, default_buffer, \
+    default_timeout
+from CiscoAutomationFramework.FirmwareDetect import firmware_for_transport
+from CiscoAutomationFramework.Exceptions import ExecChannelError, FileTransferError, ReplayError, ShellChannelError
+from time import perf_counter, sleep, time
+import gzip
+import json
+import os
+
+
+# recorded in place of a password sent to the device, replay accepts anything sent in its place
+redacted = '<redacted>'
+
+
+def _open_log(path, mode):
+    """
+    Opens a session log as text, logs with a path ending in .gz are gzip compressed
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class RecordingSSHEngine(SSHEngine):
+    """
+    SSHEngine that writes everything sent to and received from the device to a session log, so the session can
+    be played back later with ReplayEngine without the device. Each line of the log is a JSON list of the event
+    type, the seconds since connecting and the data of the event:
+
+        - ["c", t, ip, port] connected
+        - ["p", t, prompt, hostname] prompt found after login
+        - ["s", t, text] sent to the device, passwords are recorded as <redacted>
+        - ["r", t, text] received from the device
+        - ["e", t, commands, outputs] commands run on exec channels, outputs is null if the device refused
+        - ["h", t, commands, outputs] commands run on extra shells, outputs is null if they failed
+        - ["f", t, path, contents] file copied off the device, contents is null if the transfer failed
+        - ["x", t] connection closed
+
+    The log is written to path, or to a file named after the device and time in recording_directory if no path
+    is given. Set recording_directory in a subclass to use the engine with connect_ssh or ThreadLib::
+
+        class Recorder(RecordingSSHEngine):
+            recording_directory = 'recordings'
+
+        with connect_ssh('ip', 'username', 'password', engine=Recorder) as ssh:
+            ...
+    """
+
+    recording_directory = '.'
+
+    def __init__(self, path=None):
+        super().__init__()
+        self.path = path
+        self._log = None
+        self._started_at = None
+        self._passwords = set()
+        self._received_tail = ''
+
+    def _record(self, kind, *data):
+        if self._log:
+            event = [kind, round(perf_counter() - self._started_at, 6), *data]
+            self._log.write(json.dumps(event, separators=(',', ':')) + '\n')
+
+    def connect_to_server(self, ip, username, password, port):
+        if not self.path:
+            self.path = os.path.join(self.recording_directory, f'{ip}_{port}_{int(time())}.jsonl.gz')
+        self._log = _open_log(self.path, 'wt')
+        self._started_at = perf_counter()
+        self._record('c', ip, port)
+        self._passwords.add(password)
+        super().connect_to_server(ip, username, password, port)
+        self._record('p', self.prompt, self.hostname)
+
+    def exec_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=None):
+        try:
+            outputs = super().exec_commands_get_outputs(commands, buffer_size, timeout)
+        except ExecChannelError:
+            self._record('e', commands, None)
+            raise
+        self._record('e', commands, outputs)
+        return outputs
+
+    def shell_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=default_timeout):
+        try:
+            outputs = super().shell_commands_get_outputs(commands, buffer_size, timeout)
+        except ShellChannelError:
+            self._record('h', commands, None)
+            raise
+        self._record('h', commands, outputs)
+        return outputs
+
+    def get_file(self, path, timeout=None):
+        try:
+            contents = super().get_file(path, timeout)
+        except FileTransferError:
+            self._record('f', path, None)
+            raise
+        self._record('f', path, contents)
+        return contents
+
+    def jumphost(self, ip, password, username=None, port=None, ssh_ver=None, vrf=None):
+        self._passwords.add(password)
+        super().jumphost(ip, password, username, port, ssh_ver, vrf)
+
+    def _get_output(self, buffer_size):
+        data = super()._get_output(buffer_size)
+        if data:
+            self._record('r', data)
+            self._received_tail = (self._received_tail + data)[-256:]
+        return data
+
+    def _is_password(self, text):
+        """
+        True if text is one of the passwords of the session or answers a password prompt
+        """
+        if text and (text in self._passwords or text == self.enable_password):
+            return True
+        last_line = self._received_tail.splitlines()[-1:] if not self._received_tail.endswith('\n') else []
+        return bool(last_line and LoginHandshake.password_prompt.search(last_line[0].strip()))
+
+    def _send_command(self, command, end='\n'):
+        sent = f'{command}{end}'
+        text = sent.rstrip('\r\n')
+        self._record('s', f'{redacted}{sent[len(text):]}' if self._is_password(text) else sent)
+        self._received_tail = ''
+        super()._send_command(command, end)
+
+    def close_connection(self):
+        try:
+            super().close_connection()
+        finally:
+            if self._log:
+                self._record('x')
+                self._log.close()
+                self._log = None
+
+
+class ReplayEngine(BaseEngine):
+    """
+    Engine that plays back a session log written by RecordingSSHEngine instead of talking to a device, so
+    firmware and parser changes can be run against a real session offline and get the same output every time.
+
+    What is sent must match what was recorded, a ReplayError is raised as soon as it does not. With speed set
+    output is released with the timing it was originally received with, relative to the command that was sent
+    before it (speed=2 plays back twice as fast). With speed None all output is available right away, only the
+    waiting done by the client itself (timeouts when no prompt is returned) remains.
+
+    :param path: Path of the session log
+    :type path: str
+    :param speed: Playback speed relative to the recording, None for as fast as possible
+    :type speed: float
+    """
+
+    def __init__(self, path, speed=None):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        # passwords are redacted in the recording, any enable password is accepted in its place
+        self.enable_password = redacted
+        self._events = []
+        self._position = 0
+        self._pending = ''
+        self._anchor = (0, 0)
+
+    def _peek(self):
+        if self._position < len(self._events):
+            return self._events[self._position]
+        return None
+
+    def _due(self, event):
+        """
+        Wall clock time the event is played back at
+        """
+        started_at, recorded_at = self._anchor
+        return started_at + (event[1] - recorded_at) / self.speed
+
+    def _release_output(self, everything=False):
+        """
+        Moves output that is due to be received to the pending output
+        """
+        while True:
+            event = self._peek()
+            if not event or event[0] != 'r':
+                return
+            if not everything and self.speed and self._due(event) > perf_counter():
+                return
+            self._pending += event[2]
+            self._position += 1
+
+    def _next_event(self, kind):
+        """
+        Returns the next event that is not received output, which must be of kind. Output recorded before it is
+        moved to the pending output because it was already received when the event happened.
+        """
+        self._release_output(everything=True)
+        event = self._peek()
+        if not event or event[0] != kind:
+            raise ReplayError(f'Expected a "{kind}" event at line {self._position + 1} of {self.path}, '
+                              f'recording has {event}')
+        self._position += 1
+        return event
+
+    def connect_to_server(self, ip=None, username=None, password=None, port=None):
+        with _open_log(self.path, 'rt') as log:
+            self._events = [json.loads(line) for line in log if line.strip()]
+        self._position = 0
+        self._pending = ''
+        self._anchor = (perf_counter(), 0)
+        self._next_event('c')
+        # usernames and passwords typed while logging in are not part of the session that is replayed
+        while self._peek() and self._peek()[0] in ('r', 's'):
+            self._position += 1
+        login = self._next_event('p')
+        if self.speed:
+            sleep(max(0, self._due(login) - perf_counter()))
+        # login output is not part of any command output
+        self._pending = ''
+        self.prompt, self.hostname = login[2], login[3]
+
+    @property
+    def exec_channels_available(self):
+        self._release_output(everything=True)
+        event = self._peek()
+        return bool(event and event[0] == 'e')
+
+    def exec_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=None):
+        event = self._next_event('e')
+        if event[2] != list(commands):
+            raise ReplayError(f'Exec commands {commands} do not match the recording {event[2]}')
+        if event[3] is None:
+            raise ExecChannelError('Device refused an exec channel in the recording')
+        self.all_commands_sent.extend(commands)
+        return event[3]
+
+    @property
+    def shell_channels_available(self):
+        self._release_output(everything=True)
+        event = self._peek()
+        return bool(event and event[0] == 'h')
+
+    def shell_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=default_timeout):
+        event = self._next_event('h')
+        if event[2] != list(commands):
+            raise ReplayError(f'Shell commands {commands} do not match the recording {event[2]}')
+        if event[3] is None:
+            raise ShellChannelError('Extra shells failed in the recording')
+        self.all_commands_sent.extend(commands)
+        return event[3]
+
+    @property
+    def file_transfer_available(self):
+        self._release_output(everything=True)
+        event = self._peek()
+        return bool(event and event[0] == 'f')
+
+    def get_file(self, path, timeout=None):
+        event = self._next_event('f')
+        if event[2] != path:
+            raise ReplayError(f'Copied {path} but the recording has {event[2]}')
+        if event[3] is None:
+            raise FileTransferError(f'Unable to copy {path} off the device in the recording')
+        return event[3]
+
+    def _send_command(self, command, end):
+        event = self._next_event('s')
+        sent = f'{command}{end}'
+        password_sent = event[2].startswith(redacted) and event[2][len(redacted):] == sent[len(sent.rstrip('\r\n')):]
+        if event[2] != sent and not password_sent:
+            raise ReplayError(f'Sent {command + end!r} but the recording has {event[2]!r}')
+        self._anchor = (perf_counter(), event[1])
+
+    def _get_output(self, buffer_size):
+        self._release_output()
+        data, self._pending = self._pending[:buffer_size], self._pending[buffer_size:]
+        return data
+
+    def _wait_for_output(self, timeout):
+        self._release_output()
+        if self._pending:
+            return
+        event = self._peek()
+        if event and event[0] == 'r' and self.speed:
+            sleep(max(0, min(timeout, self._due(event) - perf_counter())))
+        else:
+            super()._wait_for_output(timeout)
+
+    def close_connection(self):
+        pass
+
+
+def replay_session(path, speed=None):
+    """
+    Plays back a session log written by RecordingSSHEngine, returns a firmware specific instance of CiscoFirmware
+    the same way connect_ssh does.
+
+    :param path: Path of the session log
+    :type path: str
+    :param speed: Playback speed relative to the recording, None for as fast as possible
+    :type speed: float
+    :return: CiscoFirmware Object
+    :rtype: CiscoFirmware
+    """
+    engine = ReplayEngine(path, speed)
+    engine.connect_to_server()
+    return firmware_for_transport(engine)
@@ -1,8 +1,11 @@
-from threading import Thread
+from threading import Thread, Event, ExceptHookArgs
+from queue import Queue, Empty
 from CiscoAutomationFramework import connect_ssh
 from CiscoAutomationFramework.FirmwareBase import CiscoFirmware
 from CiscoAutomationFramework.TransportEngines import SSHEngine, ReadOnlySSHEngine
 from abc import ABC, abstractmethod
+import threading
+import sys
 
 
 __all__ = ['SSH', 'ReadOnlySSH', 'SSHSplitDeviceType']
@@ -23,7 +26,8 @@ class SSH(Thread, ABC):
 
     """
 
-    def __init__(self, ip, username, password, enable_password=None, perform_secondary_action=False, **kwargs):
+    def __init__(self, ip, username, password, enable_password=None, perform_secondary_action=False, pool=None,
+                 port=22, jumphost=None, firmware_cache=None, **kwargs):
         """
 
         :param ip: IP address of device
@@ -36,6 +40,14 @@ class SSH(Thread, ABC):
         :type enable_password: str
         :param perform_secondary_action: True/False to execute secondary_action method when logged in
         :type perform_secondary_action: bool
+        :param pool: Connection pool to get the session to the device from instead of logging in every run
+        :type pool: ConnectionPool
+        :param port: SSH port of the device (default 22)
+        :type port: int
+        :param jumphost: Jumphost to tunnel the connection to the device through
+        :type jumphost: JumphostTunnel
+        :param firmware_cache: Cache of previously detected firmware, to skip detecting it on every run
+        :type firmware_cache: FirmwareCache
         """
         super().__init__()
         self.ip = ip
@@ -43,9 +55,15 @@ class SSH(Thread, ABC):
         self.password = password
         self.enable_password = enable_password
         self.perform_secondary_action = perform_secondary_action
+        self.pool = pool
+        self.port = port
+        self.jumphost = jumphost
+        self.firmware_cache = firmware_cache
         self.hostname = ''
         self.commands_sent = []
         self.is_nexus = False
+        # set when the object is run by a worker of start_threads instead of as its own thread
+        self._finished = None
 
     def during_login(self, ssh):
         """
@@ -89,16 +107,58 @@ class SSH(Thread, ABC):
     def _ssh_engine(self):
         return SSHEngine
 
+    def _run_session(self, ssh):
+        self.is_nexus = ssh.is_nexus
+        self.hostname = ssh.hostname
+        self.during_login(ssh)
+        if self.perform_secondary_action:
+            self.secondary_action(ssh)
+            self.post_secondary_action(ssh)
+        self.commands_sent = ssh.commands_sent
+
     def run(self) -> None:
 
-        with connect_ssh(self.ip, self.username, self.password, enable_password=self.enable_password, engine=self._ssh_engine) as ssh:
-            self.is_nexus = ssh.is_nexus
-            self.hostname = ssh.hostname
-            self.during_login(ssh)
-            if self.perform_secondary_action:
-                self.secondary_action(ssh)
-                self.post_secondary_action(ssh)
-            self.commands_sent = ssh.commands_sent
+        if self.pool:
+            with self.pool.connection(self.ip, self.username, self.password, port=self.port,
+                                      enable_password=self.enable_password, engine=self._ssh_engine,
+                                      jumphost=self.jumphost, firmware_cache=self.firmware_cache) as ssh:
+                self._run_session(ssh)
+        else:
+            with connect_ssh(self.ip, self.username, self.password, port=self.port, enable_password=self.enable_password,
+                             engine=self._ssh_engine, jumphost=self.jumphost,
+                             firmware_cache=self.firmware_cache) as ssh:
+                self._run_session(ssh)
+
+
+    def _run_scheduled(self):
+        """
+        Runs the object in the thread of a worker, an exception is reported the same way it would be if the object
+        ran as its own thread and does not stop the worker
+        """
+        try:
+            self.run()
+        except SystemExit:
+            # a thread ends quietly on SystemExit, the worker moves on to the next object
+            pass
+        except BaseException:
+            # looked up on every call so a hook installed after import is used
+            threading.excepthook(ExceptHookArgs((*sys.exc_info(), self)))
+        finally:
+            self._finished.set()
+
+    def join(self, timeout=None):
+        if self._finished is None:
+            return super().join(timeout)
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        """
+        True while the object is running. When it is run by a worker of start_threads it is also True while it is
+        waiting for a worker
+        """
+        if self._finished is None:
+            return super().is_alive()
+        return not self._finished.is_set()
 
 
 class ReadOnlySSH(SSH):
@@ -254,8 +314,17 @@ class SSHSplitDeviceType(SSH):
             self.ios_post_secondary_action(ssh)
 
 
+def _worker(queue):
+    while True:
+        try:
+            thread = queue.get_nowait()
+        except Empty:
+            return
+        thread._run_scheduled()
+
+
 def start_threads(object, ips, username, password, enable_password=None,
-                  perform_secondary_action=False, wait_for_threads=False, **kwargs):
+                  perform_secondary_action=False, wait_for_threads=False, pool=None, max_concurrency=None, **kwargs):
 
     """
     This helper function is a quick and easy way to start your threads. Gives you an option for waiting for threads
@@ -276,6 +345,12 @@ def start_threads(object, ips, username, password, enable_password=None,
     :type perform_secondary_action: bool
     :param wait_for_threads: Wait for all threads to complete before returning
     :type wait_for_threads: bool
+    :param pool: Connection pool to reuse sessions to devices from, ex. when the same devices are polled every few minutes
+    :type pool: ConnectionPool
+    :param max_concurrency: Max number of devices to work on at the same time. The devices wait in a queue and
+        max_concurrency worker threads take the next one as soon as they are done with the last, instead of one
+        thread per device all at once. The objects returned can still be joined and checked with is_alive.
+    :type max_concurrency: int
     :param kwargs: Keyword arguments to be passed to your object. If your child class accepts additional arguments, pass them to the object via keyword arguments here.
     :return: List of threads either running or completed depending on if wait_for_threads is True/False
     :rtype: list[SSH, SSHSplitDeviceType, type(object)]
@@ -286,9 +361,19 @@ def start_threads(object, ips, username, password, enable_password=None,
 
     # Instantiate thread objects and start them
     threads = [object(ip=ip, username=username, password=password, enable_password=enable_password,
-                      perform_secondary_action=perform_secondary_action, **kwargs) for ip in ips]
-    for thread in threads:
-        thread.start()
+                      perform_secondary_action=perform_secondary_action, pool=pool, **kwargs) for ip in ips]
+    if max_concurrency is None:
+        for thread in threads:
+            thread.start()
+    else:
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        queue = Queue()
+        for thread in threads:
+            thread._finished = Event()
+            queue.put(thread)
+        for _ in range(min(max_concurrency, len(threads))):
+            Thread(target=_worker, args=(queue,)).start()
 
     # if user wants to wait for them, wait for threads to finish
     if wait_for_threads:
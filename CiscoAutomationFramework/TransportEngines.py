@@ -1,15 +1,352 @@
-from CiscoAutomationFramework.Exceptions import AuthenticationException, ForbiddenError
-from paramiko import SSHClient, AutoAddPolicy
+from CiscoAutomationFramework.Exceptions import AuthenticationException, ForbiddenError, ExecChannelError, LoginError, \
+    FileTransferError, ShellChannelError
+from paramiko import SSHClient, AutoAddPolicy, SSHException, SFTPClient
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
-from time import sleep
+from queue import Queue, Empty
+from select import select
+from threading import Thread, Lock
+from time import sleep, perf_counter
+import codecs
+import re
 
 default_command_end = '\n'
 default_buffer = 1024
 default_timeout = 1
 default_delay = .5
+default_poll_interval = .1
+default_login_timeout = 10
+default_max_nudges = 3
 standard_prompt_endings = ('>', '#', '> ', '# ')
 
+# pager prompts: IOS " --More-- ", NXOS "--More--" (sometimes in reverse video), ASA "<--- More --->"
+pager_prompt = re.compile(r'<?-+ ?More ?-+>?(?:\x1b\[[0-9;]*m)?\s*$')
+# a pager prompt plus the backspaces, spaces or escape codes the device sends to erase it once a key is pressed
+pager_artifacts = re.compile(r'(?:\x1b\[[0-9;]*m)? ?<?-+ ?More ?-+>?(?:\x1b\[[0-9;]*m)? ?(?:\x08+ *\x08+|\r *\r|\x1b\[K)*')
+# the backspaces, spaces or escape codes at the start of the output after a pager prompt is answered
+pager_erase = re.compile(r'^(?:[\x08 \r]|\x1b\[K)+')
+
+
+def strip_pager_artifacts(output):
+    """
+    Removes the pager prompts and the characters sent to erase them from output gathered by answering the pager
+
+    :param output: Output received from the device
+    :type output: str
+    :return: Output without pager artifacts
+    :rtype: str
+    """
+    return pager_artifacts.sub('', output)
+
+
+class PromptMatcher:
+    """
+    Watches a stream of output from a device for the prompt. Chunks are fed in as they are received and only the
+    last line of the stream is kept, so checking for the prompt costs the same no matter how much output has
+    already been received. A line is considered a prompt when it starts with the hostname followed by
+    anything that is not whitespace and a prompt ending, ex. hostname#, hostname>, hostname(config-if)#
+
+    Complete lines that are prompts are counted as they go by so when several commands are sent back to back
+    it is known when the output of all of them has been received.
+
+    Once the last line is longer than a prompt could be or no longer starts with the hostname only the end of it
+    is kept until the next new line, so a very long line does not have to be held in memory.
+    """
+
+    # longest a prompt can be after the hostname, ex. (config-if-range)#
+    max_prompt_suffix = 64
+
+    def __init__(self, hostname):
+        self.pattern = re.compile(rf'{re.escape(hostname)}\S*[>#]')
+        self.hostname = hostname
+        self.max_prompt_length = len(hostname) + self.max_prompt_suffix
+        self._tail = ''
+        # the last line can no longer be a prompt, whether it started with one is all that is kept of its start
+        self._dropping = False
+        self._dropped_match = None
+        self.matched = False
+        self.prompts_seen = 0
+        self.last_prompt = None
+
+    @property
+    def last_line(self):
+        """
+        Last line received from the device, if the stream ends in a new line it is the line before it. When the line
+        cannot be a prompt only the end of it is kept
+        """
+        return self._tail.rstrip('\r\n')
+
+    @property
+    def prompt_count(self):
+        """
+        Number of prompts seen in the stream including the last line
+        """
+        return self.prompts_seen + (1 if self.matched else 0)
+
+    def feed(self, chunk):
+        """
+        Feeds a chunk of output received from the device into the matcher
+
+        :param chunk: Output received from the device
+        :type chunk: str
+        :return: True if the last line of the stream is a prompt
+        :rtype: bool
+        """
+        lines = (self._tail + chunk).splitlines(keepends=True)
+        if lines:
+            for line in lines[:-1]:
+                match = self._match(line)
+                self._dropping = False
+                if match:
+                    self.prompts_seen += 1
+                    self.last_prompt = match.group()
+            self._tail = lines[-1]
+            last_line = self.last_line
+            if not self._dropping and (len(last_line) > self.max_prompt_length or not
+                                       (last_line.startswith(self.hostname) or self.hostname.startswith(last_line))):
+                self._dropped_match = self.pattern.match(last_line)
+                self._dropping = True
+            if self._dropping:
+                # the end of the line is still kept so a pager prompt at the end of it is found
+                self._tail = self._tail[-self.max_prompt_length:]
+            match = self._match(self.last_line)
+            self.matched = match is not None
+            if match:
+                self.last_prompt = match.group()
+        return self.matched
+
+    def _match(self, line):
+        return self._dropped_match if self._dropping else self.pattern.match(line)
+
+    def split(self, output, count):
+        """
+        Splits output from several commands sent back to back into the output of each command. The output of each
+        command ends with the prompt, anything after the prompt on the same line is the echo of the next command.
+
+        :param output: Output received from the device
+        :type output: str
+        :param count: Number of commands the output is from
+        :type count: int
+        :return: List of the output from each command split by line
+        :rtype: list[list[str]]
+        """
+        outputs = []
+        current = []
+        for line in output.splitlines():
+            match = self.pattern.match(line)
+            if match and len(outputs) < count - 1:
+                current.append(line[:match.end()])
+                outputs.append(current)
+                next_command = line[match.end():]
+                current = [next_command] if next_command.strip() else []
+            else:
+                current.append(line)
+        outputs.append(current)
+        return outputs
+
+
+class LoginHandshake:
+    """
+    State machine for getting from a freshly opened shell to the first prompt. Output is fed in as it is received
+    and the handshake says what, if anything, has to be sent back: a username or password when the device asks
+    for one, a space when a banner is paged, or a new line when the device goes quiet without a prompt (up to
+    max_nudges times). Banners and MOTDs are read through, only an unterminated single word line ending in
+    > or # is taken as the prompt, and only a line starting with one of authentication_failures is taken as a
+    failed login, so a banner that mentions one does not fail it. Only the line currently being received is kept.
+
+    Engines drive it, so the waiting is done however the engine waits on the device.
+    """
+
+    authentication_failures = ('% Authorization failed', '% Authentication failed', '% Bad passwords',
+                               '% Access denied', 'Permission denied')
+    username_prompt = re.compile(r'(?:username|login): ?$', re.IGNORECASE)
+    password_prompt = re.compile(r'password: ?$', re.IGNORECASE)
+
+    def __init__(self, username=None, password=None, max_nudges=default_max_nudges):
+        self.username = username
+        self.password = password
+        self.max_nudges = max_nudges
+        self.nudges = 0
+        self.prompt = None
+        self._tail = ''
+        self._username_sent = False
+        self._password_sent = False
+
+    @property
+    def hostname(self):
+        return self.prompt[:-1] if self.prompt else None
+
+    @staticmethod
+    def is_prompt(line):
+        """
+        True if line looks like a CLI prompt, ex. hostname# or hostname>, and not a banner line like #######
+        """
+        line = line.strip()
+        return (len(line) > 1 and len(line.split()) == 1 and line.endswith(standard_prompt_endings)
+                and any(char.isalnum() for char in line))
+
+    def feed(self, chunk):
+        """
+        Feeds output received from the device into the handshake
+
+        :param chunk: Output received from the device
+        :type chunk: str
+        :return: Text to send to the device, None if nothing needs to be sent
+        :rtype: str
+
+        :raises: CiscoAutomationFramework.Exceptions.AuthenticationException
+        """
+        received = self._tail + chunk
+        lines = received.splitlines(keepends=True)
+        for line in lines:
+            if line.lstrip().startswith(self.authentication_failures):
+                raise AuthenticationException(line.strip())
+        self._tail = lines[-1] if lines and not lines[-1].endswith(('\r', '\n')) else ''
+        line = self._tail.strip()
+
+        if self.is_prompt(line):
+            self.prompt = line
+            return None
+        if self.username_prompt.search(line):
+            if self.username is None or self._username_sent:
+                raise AuthenticationException(f'Device asked for a username: {line}')
+            self._username_sent = True
+            self._tail = ''
+            return f'{self.username}\n'
+        if self.password_prompt.search(line):
+            if self.password is None or self._password_sent:
+                raise AuthenticationException(f'Device asked for a password: {line}')
+            self._password_sent = True
+            self._tail = ''
+            return f'{self.password}\n'
+        if pager_prompt.search(self._tail):
+            self._tail = ''
+            return ' '
+        return None
+
+    def quiet(self):
+        """
+        Called when the device has stopped sending output without returning a prompt
+
+        :return: Text to send to the device to get it to return a prompt, None if max_nudges is 0
+        :rtype: str
+
+        :raises: CiscoAutomationFramework.Exceptions.LoginError
+        """
+        if not self.max_nudges:
+            return None
+        if self.nudges >= self.max_nudges:
+            raise LoginError(f'Device did not return a prompt after {self.nudges} new lines were sent')
+        self.nudges += 1
+        return '\n'
+
+
+class CommandRecord:
+    """
+    Timings and counters of a single command, recorded by the engine as the output of the command is gathered.
+    Times are in seconds and measured from when the command was sent.
+
+    :ivar command: Command that was sent, None when output was gathered without sending a command
+    :ivar time_to_first_byte: Time until the first output was received, None if nothing was received
+    :ivar total_time: Time until the prompt was returned, or output stopped being gathered
+    :ivar bytes_received: Amount of output received (characters after decoding)
+    :ivar chunks: Number of reads that returned output
+    :ivar sleep_time: Time spent sleeping a fixed delay instead of reading output
+    :ivar wait_time: Time spent waiting on the device for more output
+    :ivar timed_out: True if output stopped being gathered because the idle timeout fired
+    :ivar prompt: Prompt returned after the command, None if one was not seen
+    """
+
+    def __init__(self, command, sent_at=None):
+        self.command = command
+        self.sent_at = perf_counter() if sent_at is None else sent_at
+        self.time_to_first_byte = None
+        self.total_time = None
+        self.bytes_received = 0
+        self.chunks = 0
+        self.sleep_time = 0
+        self.wait_time = 0
+        self.timed_out = False
+        self.prompt = None
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.as_dict()}>'
+
+    def received(self, chunk, received_at):
+        if self.time_to_first_byte is None:
+            self.time_to_first_byte = received_at - self.sent_at
+        self.bytes_received += len(chunk)
+        self.chunks += 1
+
+    def finish(self, finished_at, prompt=None, timed_out=False):
+        self.total_time = finished_at - self.sent_at
+        self.prompt = prompt
+        self.timed_out = timed_out
+
+    def as_dict(self):
+        """
+        Returns the record as a dictionary, ex. to be written out as JSON
+
+        :rtype: dict
+        """
+        return {'command': self.command, 'time_to_first_byte': self.time_to_first_byte,
+                'total_time': self.total_time, 'bytes_received': self.bytes_received, 'chunks': self.chunks,
+                'sleep_time': self.sleep_time, 'wait_time': self.wait_time, 'timed_out': self.timed_out,
+                'prompt': self.prompt}
+
+
+class AdaptiveTiming:
+    """
+    Learns how quickly a device responds so the engine does not have to sleep a fixed delay before reading output
+    and can give up on output sooner when the prompt is not returned.
+
+    For every command that returns a prompt, the time from sending the command to the first output (round trip) and
+    the longest gap between chunks of output are recorded. Once warmup commands have been observed the idle timeout
+    is shrunk to multiplier times the longest silence seen, never going below floor or above ceiling. Timeouts that
+    are longer than ceiling are assumed to be intentionally long for slow commands (ex. saving config) and are
+    left alone.
+    """
+
+    def __init__(self, warmup=3, multiplier=4, floor=.2, ceiling=default_timeout):
+        self.warmup = warmup
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.samples = 0
+        self.round_trip = 0
+        self.max_gap = 0
+        self.delay_skipped = 0
+
+    @property
+    def learned(self) -> bool:
+        """
+        True once enough commands have been observed to trust the learned values
+        """
+        return self.samples >= self.warmup
+
+    @property
+    def learned_timeout(self) -> float:
+        """
+        Idle timeout derived from the longest silence observed from the device
+        """
+        return max(self.floor, min(self.ceiling, self.multiplier * max(self.round_trip, self.max_gap)))
+
+    def idle_timeout(self, timeout):
+        """
+        Returns the idle timeout to use in place of the timeout requested by the caller
+        """
+        if not self.learned or timeout > self.ceiling:
+            return timeout
+        return min(timeout, self.learned_timeout)
+
+    def record(self, round_trip, max_gap):
+        """
+        Records the timing of a command that returned a prompt
+        """
+        self.samples += 1
+        self.round_trip = max(self.round_trip, round_trip)
+        self.max_gap = max(self.max_gap, max_gap)
+
 
 class BaseEngine(ABC):
 
@@ -19,6 +356,12 @@ class BaseEngine(ABC):
         self.enable_password = None
         self.commands_sent_since_last_output_get = 0
         self.all_commands_sent = []
+        self.config_commands_sent = 0
+        self.adaptive_timing = None
+        self.command_records = []
+        self.command_record_callback = None
+        self._last_command_sent_at = None
+        self._pending_records = []
 
     def __enter__(self):
         return self
@@ -45,14 +388,52 @@ class BaseEngine(ABC):
 
         self.commands_sent_since_last_output_get += 1
         self.all_commands_sent.append(command)
+        if (self.prompt and self.in_configuration_mode) or self._is_configure_command(command):
+            # anything sent from configure until end may have changed the config
+            self.config_commands_sent += 1
+        self._last_command_sent_at = perf_counter()
+        self._pending_records.append(CommandRecord(command, self._last_command_sent_at))
         return self._send_command(command, end)
 
-    def get_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
+    @staticmethod
+    def _is_configure_command(command):
+        word = command.split()[0] if command.split() else ''
+        return len(word) >= 4 and 'configure'.startswith(word)
+
+    def clear_history(self):
+        """
+        Forgets the commands sent and the records of their output so far, ex. when a session is handed to someone
+        else. Lists taken from all_commands_sent or command_records before this are left as they are.
+
+        :return: Nothing
+        """
+        self.all_commands_sent = []
+        self.command_records = []
+
+    def _sleep(self, seconds):
+        """
+        Sleeps a fixed delay, the time is added to the record of the last command sent
+        """
+        if self._pending_records:
+            self._pending_records[-1].sleep_time += seconds
+        sleep(seconds)
+
+    def _finish_records(self, records):
+        """
+        Adds the records of commands whose output has been gathered to command_records and passes each one to
+        command_record_callback if one is set
+        """
+        self.command_records.extend(records)
+        if self.command_record_callback:
+            for record in records:
+                self.command_record_callback(record)
+
+    def get_raw_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
         """
         Gets the output that is being returned from the network device. It checks how many commands were run
         since the last time it got output, and will get output until a prompt is encountered. Each command
-        should return the prompt after execution so if the user enters 6 commands, this will loop 6 times
-        to get the output of all 6 commands. It is up to the user to either get data between all 6 commands
+        should return the prompt after execution so if the user enters 6 commands, this will get output until
+        6 prompts have been returned to get the output of all 6 commands. It is up to the user to either get data between all 6 commands
         or parse it out theirselves. If no command is sent, to loop through a single time set the
         'no_command_sent_previous' flag to True so it auctually attempts to gather output. The reason
         for manually setting that flag is so that if the user attempts to get output when there is none
@@ -61,46 +442,231 @@ class BaseEngine(ABC):
 
         This could run into issues if there is logging enabled on the terminal but that is not something
         that is being done inside the framework at this time so I dont believe there is a need to change that.
+
+        Output is returned as a single string exactly as it was received, use get_output to have it split into lines.
         """
 
+        return ''.join(self._iter_chunks(buffer_size, timeout, no_command_sent_previous))
+
+    def _iter_chunks(self, buffer_size, timeout, no_command_sent_previous=False, answer_pager=False):
+        """
+        Generator that yields output from the device as it is received until a prompt has been returned for every
+        command sent since output was last gathered, or no output is received for timeout seconds.
+
+        With answer_pager a space is sent as soon as the output ends in a pager prompt (--More--) so the device
+        sends the next page. The pager prompts are yielded as received, see strip_pager_artifacts.
+        """
         if no_command_sent_previous:
             self.commands_sent_since_last_output_get += 1
+        if self.adaptive_timing:
+            timeout = self.adaptive_timing.idle_timeout(timeout)
+
+        prompts_expected = self.commands_sent_since_last_output_get
+        self.commands_sent_since_last_output_get = 0
+        prompt_matcher = PromptMatcher(self.hostname)
+        end = datetime.now() + timedelta(seconds=timeout)
+        last_received_at = self._last_command_sent_at or perf_counter()
+        round_trip = None
+        max_gap = 0
+        timed_out = False
 
-        output = ''
-        for x in range(self.commands_sent_since_last_output_get):
-            data = '\n'
-            end = datetime.now() + timedelta(seconds=timeout)
+        # one record per prompt expected, output gathered without sending a command gets a record without one
+        records, self._pending_records = self._pending_records, []
+        records += [CommandRecord(None) for _ in range(prompts_expected - len(records))]
+        finished = 0
+        erasing_pager = False
 
-            # while the last line of output DOES NOT START with the hostname AND DOES NOT CONTAIN a standard prompt ending
-            while not all([data.splitlines()[-1].startswith(self.hostname), any([x in data.splitlines()[-1] for x in standard_prompt_endings])]):
+        try:
+            # while a prompt has not been returned for every command sent
+            while prompt_matcher.prompt_count < prompts_expected:
                 from_device = self._get_output(buffer_size)
                 if from_device:
-                    data += from_device
+                    if erasing_pager:
+                        # a prompt printed right after the pager prompt is erased is only found without the erase
+                        to_match = pager_erase.sub('', from_device)
+                        erasing_pager = not to_match
+                        prompt_matcher.feed(to_match)
+                    else:
+                        prompt_matcher.feed(from_device)
                     end = datetime.now() + timedelta(seconds=timeout)  # reset timeout clock
+
+                    # keep track of how long the device was silent for to learn its timing
+                    received_at = perf_counter()
+                    if round_trip is None:
+                        round_trip = received_at - last_received_at
+                    else:
+                        max_gap = max(max_gap, received_at - last_received_at)
+                    last_received_at = received_at
+
+                    records[min(finished, len(records) - 1)].received(from_device, received_at)
+                    while finished < min(prompt_matcher.prompt_count, len(records)):
+                        records[finished].finish(received_at, prompt_matcher.last_prompt)
+                        finished += 1
+                    if answer_pager and pager_prompt.search(prompt_matcher.last_line):
+                        self._send_command(' ', '')
+                        # the next page starts on the line of the pager prompt, end it so a prompt there is found
+                        prompt_matcher.feed('\n')
+                        erasing_pager = True
+                    yield from_device
                 else:
-                    if datetime.now() > end:
+                    remaining = (end - datetime.now()).total_seconds()
+                    if remaining <= 0:
                         # timeout clock triggered, break out of loop because we must be at a point
                         # in the CLI where it does not return a prompt or is hung
+                        timed_out = True
                         break
-                    sleep(.1)
-            output += data[1:]
+                    waiting_since = perf_counter()
+                    self._wait_for_output(remaining)
+                    if records:
+                        records[min(finished, len(records) - 1)].wait_time += perf_counter() - waiting_since
+        finally:
+            finished_at = perf_counter()
+            for record in records[finished:]:
+                record.finish(finished_at, timed_out=timed_out)
+            self._finish_records(records)
 
-        self.commands_sent_since_last_output_get = 0
+        if self.adaptive_timing and prompts_expected and prompt_matcher.prompt_count >= prompts_expected:
+            self.adaptive_timing.record(round_trip, max_gap)
 
-        if type(output) != list:
-            output = output.splitlines()
+    def iter_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
+        """
+        Same as get_output but yields each line as soon as it is received instead of returning all of the output
+        at once, only the line currently being received is held in memory. Useful for very large output where
+        work can start on the beginning of the output before the device has finished sending it.
 
-        self._extract_prompt(output)
+        :return: Generator of lines of output, starting with the command, ending with the prompt
+        :rtype: Generator[str]
+        """
+        # pieces of the line currently being received, only joined once the line is complete
+        partial_line = []
+        last_line = []
+        for chunk in self._iter_chunks(buffer_size, timeout, no_command_sent_previous):
+            if partial_line and partial_line[-1].endswith('\r'):
+                # the line feed of a line ending with carriage return is either here or not coming
+                line_feed = chunk.startswith('\n')
+                line = ''.join(partial_line)
+                partial_line = []
+                last_line = line.splitlines()
+                yield line.rstrip('\r\n')
+                if line_feed:
+                    chunk = chunk[1:]
+                if not chunk:
+                    continue
+            lines = chunk.splitlines(keepends=True)
+            # a line ending with carriage return may still have its line feed on the way
+            rest = lines.pop() if not lines[-1].endswith('\n') else None
+            for line in lines:
+                if partial_line:
+                    partial_line.append(line)
+                    line = ''.join(partial_line)
+                    partial_line = []
+                last_line = line.splitlines()
+                yield line.rstrip('\r\n')
+            if rest is not None:
+                partial_line.append(rest)
 
+        for line in ''.join(partial_line).splitlines():
+            last_line = [line]
+            yield line
+        self._extract_prompt(last_line)
+
+    def iter_chunks(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
+        """
+        Same as iter_output but yields the output exactly as it is received instead of splitting it into lines, for
+        output that is not line oriented like NX-OS "| json", which sends a whole table as one very long line.
+
+        :return: Generator of output as it is received, ending with the prompt
+        :rtype: Generator[str]
+        """
+        tail = ''
+        for chunk in self._iter_chunks(buffer_size, timeout, no_command_sent_previous):
+            # only the end of the output is needed to find the prompt
+            tail = (tail + chunk)[-1024:]
+            yield chunk
+        self._extract_prompt(tail.splitlines()[-1:])
+
+    def get_output(self, buffer_size=default_buffer, timeout=default_timeout, no_command_sent_previous=False):
+        """
+        Same as get_raw_output but returns the output split by line and updates the prompt from the last line
+        """
+        output = self.get_raw_output(buffer_size, timeout, no_command_sent_previous).splitlines()
+        self._extract_prompt(output)
         return output
 
+    def get_outputs(self, buffer_size=default_buffer, timeout=default_timeout):
+        """
+        Gets the output of all the commands sent since the last time output was gathered, split into the output
+        of each command on the prompt returned after each one.
+
+        :return: List with the output of each command split by line, in the order the commands were sent
+        :rtype: list[list[str]]
+        """
+        commands_sent = self.commands_sent_since_last_output_get
+        output = self.get_raw_output(buffer_size, timeout)
+        outputs = PromptMatcher(self.hostname).split(output, commands_sent)
+        self._extract_prompt(outputs[-1])
+        return outputs
+
+    def send_commands_get_outputs(self, commands, end=default_command_end, buffer_size=default_buffer,
+                                  timeout=default_timeout, delay=default_delay):
+        """
+        Sends several commands to the device back to back without waiting for the output of each one, then
+        gathers the output of all of them at once and splits it into the output of each command. Over high
+        latency links this costs roughly one round trip instead of one per command.
+
+        This is intended for commands that do not prompt for input (show commands etc.), a command that asks
+        a question will consume the commands typed after it as its answer.
+
+        :param commands: Commands to send
+        :type commands: list[str]
+        :return: List with the output of each command split by line, in the order of commands
+        :rtype: list[list[str]]
+        """
+        for command in commands:
+            self.send_command(command, end)
+        if self.adaptive_timing:
+            self.adaptive_timing.delay_skipped += delay or 0
+        elif delay:
+            self._sleep(delay)
+        return self.get_outputs(buffer_size, timeout)
+
+    def send_command_iter_lines(self, command, end=default_command_end, buffer_size=default_buffer,
+                                timeout=default_timeout, delay=default_delay):
+        """
+        Sends a command and yields its output line by line as it is received, see iter_output
+        """
+        self.send_command(command, end)
+        if self.adaptive_timing:
+            self.adaptive_timing.delay_skipped += delay or 0
+        elif delay:
+            self._sleep(delay)
+        return self.iter_output(buffer_size, timeout)
+
+    def send_command_iter_chunks(self, command, end=default_command_end, buffer_size=default_buffer,
+                                 timeout=default_timeout, delay=default_delay):
+        """
+        Sends a command and yields its output as it is received, see iter_chunks
+        """
+        self.send_command(command, end)
+        if self.adaptive_timing:
+            self.adaptive_timing.delay_skipped += delay or 0
+        elif delay:
+            self._sleep(delay)
+        return self.iter_chunks(buffer_size, timeout)
+
     def send_command_get_output(self, command, end=default_command_end, buffer_size=default_buffer, timeout=default_timeout, delay=default_delay):
+        """
+        Sends a command and gets its output. When adaptive timing is enabled the delay before reading output is
+        skipped, the output is read as it arrives until the prompt is returned.
+        """
         self.send_command(command, end)
-        if delay:
-            sleep(delay)
+        if self.adaptive_timing:
+            self.adaptive_timing.delay_skipped += delay or 0
+        elif delay:
+            self._sleep(delay)
         return self.get_output(buffer_size, timeout)
 
-    def send_command_get_truncated_output(self, command):
+    def send_command_get_truncated_output(self, command, timeout=default_timeout):
 
         '''
         Method to be used in an instance when setting the terminal length to 0 is not an option and the
@@ -108,66 +674,95 @@ class BaseEngine(ABC):
         is AP's I have ran into, when the show version is gathered upon login, the terminal length command is
         not available yet until going into enable mode.
 
-        This method is blocking, so it has the potential to hang if for whatever reason the previously
-        known prompt is not returned.
+        The pager prompt is answered as soon as it is received and the pager prompts are removed from the output,
+        output is gathered until the prompt is returned or no output is received for timeout seconds.
         '''
 
         self.send_command(command)
-        output = []
-        while True:
-            for line in self.get_output(timeout=.1):
-                output.append(line)
-
-            if self.prompt in '\n'.join(output):
-                break
-            else:
-                self.send_command(' ', end='')
+        output = ''.join(self._iter_chunks(default_buffer, timeout, answer_pager=True))
+        output = strip_pager_artifacts(output).splitlines()
+        self._extract_prompt(output)
         return output
 
-    def _send_space_get_data(self, timeout=1):
-        self._send_command('', end='\n')
-        end = datetime.now() + timedelta(seconds=timeout)
-        data = ''
-        while not data.endswith(standard_prompt_endings):
-            from_device = self._get_output(1000)
-            if from_device:
-                data += from_device
-                end = datetime.now() + timedelta(seconds=timeout)
-            else:
-                sleep(.1)
-                if datetime.now() >= end:
-                    break
-        return data
+    def _wait_for_output(self, timeout):
+        """
+        Blocks until there may be output waiting from the device or until timeout (seconds) has elapsed,
+        whichever comes first. The base implementation simply polls by sleeping, engines that have something
+        they can wait on (a socket, a channel) should override this so output is picked up as soon as it arrives.
+        """
+        sleep(min(default_poll_interval, timeout))
 
-    def _prompt_lookup(self, output_data):
+    def _get_prompt_and_hostname(self, timeout=default_login_timeout, username=None, password=None,
+                                 max_nudges=default_max_nudges):
         """
-        Recursive method that will try and find the prompt in the last 3 lines of config, if not
-        will send a space, get the data and call itself to run again
+        Reads the output of the device until it returns a prompt and returns the prompt and hostname. Answers
+        username and password prompts with the username and password given, pages through banners, and sends a new
+        line when the device goes quiet without a prompt, see LoginHandshake.
+
+        :raises: CiscoAutomationFramework.Exceptions.LoginError if there is no prompt within timeout seconds
+        :raises: CiscoAutomationFramework.Exceptions.AuthenticationException
         """
+        handshake = LoginHandshake(username, password, max_nudges)
+        deadline = perf_counter() + timeout
+        quiet_since = perf_counter()
+        while not handshake.prompt:
+            data = self._get_output(default_buffer)
+            if data:
+                reply = handshake.feed(data)
+                if reply is not None:
+                    self._send_command(reply, '')
+                quiet_since = perf_counter()
+                continue
+            now = perf_counter()
+            if now >= deadline:
+                raise LoginError(f'Device did not return a prompt within {timeout} seconds')
+            if now - quiet_since >= default_timeout:
+                nudge = handshake.quiet()
+                if nudge:
+                    self._send_command(nudge, '')
+                quiet_since = now
+            self._wait_for_output(min(deadline, quiet_since + default_timeout) - now)
+        return handshake.prompt, handshake.hostname
 
-        prompt = None
-        for line in reversed(output_data.splitlines()[-3:]):
-            if len(line.split()) == 1 and any(x in line for x in standard_prompt_endings):
-                prompt = line.strip().replace('\r\n', '')
-                break
-        if not prompt:
-            return self._prompt_lookup(self._send_space_get_data())
+    @property
+    def is_alive(self) -> bool:
+        """
+        True if the connection to the device is still open. Engines that can tell when the connection has been
+        dropped should override this
+        """
+        return True
 
-        return prompt
+    @property
+    def exec_channels_available(self) -> bool:
+        """
+        True if show commands can be run with exec_commands_get_outputs instead of through the shell. Engines that
+        can run commands outside of the shell should override this
+        """
+        return False
 
-    def _get_prompt_and_hostname(self):
-        # gets initial prompt out of device
-        output = ''
-        while not output.endswith(standard_prompt_endings):
-            data = self._get_output(100)
-            output += data
-            if '% Authorization failed.' in output:
-                raise AuthenticationException('% Authorization failed.')
-        prompt = self._prompt_lookup(output)
+    def exec_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=None):
+        raise ExecChannelError(f'{type(self).__name__} cannot run commands outside of the shell')
 
-        # prompt = data.splitlines()[-1].strip()
-        hostname = prompt[:-1]
-        return prompt, hostname
+    @property
+    def shell_channels_available(self) -> bool:
+        """
+        True if show commands can be run in parallel with shell_commands_get_outputs. Engines that can open more
+        shells on the same connection should override this
+        """
+        return False
+
+    def shell_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=default_timeout):
+        raise ShellChannelError(f'{type(self).__name__} cannot open more shells')
+
+    @property
+    def file_transfer_available(self) -> bool:
+        """
+        True if files can be copied off the device with get_file. Engines that can transfer files should override this
+        """
+        return False
+
+    def get_file(self, path, timeout=None) -> str:
+        raise FileTransferError(f'{type(self).__name__} cannot transfer files')
 
     @property
     def in_user_exec_mode(self) -> bool:
@@ -204,6 +799,64 @@ class BaseEngine(ABC):
         pass
 
 
+class JumphostTunnel:
+    """
+    A single logged in connection to a jumphost (bastion) that devices behind it are connected to through. Each
+    device gets its own direct-tcpip channel multiplexed over the one connection to the jumphost, and a normal SSH
+    session runs over that channel, so many devices behind the same jumphost can be worked on in parallel without
+    typing ssh into the jumphost's CLI. The jumphost must allow TCP forwarding.
+
+    A tunnel can be shared between threads, set it on as many engines as you like::
+
+        with JumphostTunnel('bastion', 'username', 'password') as tunnel:
+            with connect_ssh('10.0.0.1', 'username', 'password', jumphost=tunnel) as ssh:
+                ...
+    """
+
+    def __init__(self, ip, username, password, port=22, timeout=10):
+        self.ip = ip
+        self.username = username
+        self.port = port
+        self.timeout = timeout
+        self.client = SSHClient()
+        self.client.set_missing_host_key_policy(AutoAddPolicy())
+        self.client.connect(hostname=ip, port=port, username=username, password=password, timeout=timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_connection()
+
+    @property
+    def identity(self):
+        """
+        Host, port and username of the jumphost. Devices behind different jumphosts can have the same address, so
+        anything keyed by device address includes this
+
+        :return: (ip, port, username)
+        :rtype: tuple
+        """
+        return self.ip, self.port, self.username
+
+    def open_channel(self, ip, port=22):
+        """
+        Opens a channel through the jumphost to the port on the device, it can be used as the socket of a
+        paramiko connection to the device
+
+        :param ip: IP address or hostname of the device as seen from the jumphost
+        :type ip: str
+        :param port: Port on the device
+        :type port: int
+        :return: paramiko Channel
+        """
+        return self.client.get_transport().open_channel('direct-tcpip', (ip, port), ('127.0.0.1', 0),
+                                                        timeout=self.timeout)
+
+    def close_connection(self):
+        self.client.close()
+
+
 class SSHEngine(BaseEngine):
 
     def __init__(self):
@@ -212,18 +865,301 @@ class SSHEngine(BaseEngine):
         self.client.set_missing_host_key_policy(AutoAddPolicy())
         self.shell = None
         self.timeout = 10
+        self.tunnel = None
+        self.wait_mode = 'select'
+        self.exec_channels = False
+        self._exec_channels_failed = False
+        self.file_transfer = None
+        self._file_transfer_failed = False
+        self.shell_channels = 0
+        self._shell_channels_failed = False
+        self._extra_shells = []
+        self._records_lock = Lock()
         self._pre_jumphost_hostname = ''
+        self._recv_buffer = bytearray(default_buffer)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
 
     @property
     def _in_jumphost(self):
         return self._pre_jumphost_hostname != self.hostname
 
     def connect_to_server(self, ip, username, password, port):
-        self.client.connect(hostname=ip, port=port, username=username, password=password, timeout=self.timeout)
+        """
+        Connects to the device, if a JumphostTunnel is set in tunnel the connection is made through the jumphost
+        """
+        sock = self.tunnel.open_channel(ip, port) if self.tunnel else None
+        self.client.connect(hostname=ip, port=port, username=username, password=password, timeout=self.timeout,
+                            sock=sock)
         self.shell = self.client.invoke_shell()
-        self.prompt, self.hostname = self._get_prompt_and_hostname()
+        self._decoder.reset()
+        self.prompt, self.hostname = self._get_prompt_and_hostname(self.timeout, username, password)
         self._pre_jumphost_hostname = self.hostname
 
+    @property
+    def is_alive(self):
+        transport = self.client.get_transport()
+        return bool(transport and transport.is_active() and self.shell and not self.shell.closed)
+
+    @property
+    def exec_channels_available(self):
+        """
+        True when exec_channels is turned on and the device has not refused an exec channel yet
+        """
+        return self.exec_channels and not self._exec_channels_failed
+
+    def exec_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=None):
+        """
+        Runs each command on its own exec channel next to the shell instead of typing it into the shell. All of the
+        commands run at the same time on the one connection and each one is done when the device closes its channel,
+        there is no prompt to wait for, no paging and the mode of the shell does not matter.
+
+        The output is returned in the same form as send_commands_get_outputs, starting with the command and ending
+        with the prompt, so it can be used in place of the shell output. Only use this for commands that do not
+        change anything, they do not run in the context of the shell.
+
+        If the device refuses an exec channel or does not close it within timeout seconds an ExecChannelError is
+        raised and exec_channels_available becomes False, so callers fall back to the shell from then on.
+
+        :param commands: Commands to run
+        :type commands: list[str]
+        :param buffer_size: Size of buffer when reading output from each channel
+        :type buffer_size: int
+        :param timeout: Seconds to wait without output before giving up, defaults to the engine timeout
+        :type timeout: float
+        :return: List with the output of each command split by line, in the order of commands
+        :rtype: list[list[str]]
+
+        :raises: CiscoAutomationFramework.Exceptions.ExecChannelError
+        """
+        timeout = self.timeout if timeout is None else timeout
+        channels = []
+        records = [CommandRecord(command) for command in commands]
+        try:
+            for command in commands:
+                channel = self.client.get_transport().open_session(timeout=timeout)
+                channels.append(channel)
+                channel.exec_command(command)
+        except (SSHException, EOFError, OSError) as e:
+            self._exec_channels_failed = True
+            for channel in channels:
+                channel.close()
+            raise ExecChannelError(f'Device refused an exec channel: {e}') from e
+        self.all_commands_sent.extend(commands)
+
+        received = {channel: [] for channel in channels}
+        channel_records = dict(zip(channels, records))
+        pending = list(channels)
+        while pending:
+            ready, _, _ = select(pending, [], [], timeout)
+            if not ready:
+                self._exec_channels_failed = True
+                for channel in channels:
+                    channel.close()
+                for channel in pending:
+                    channel_records[channel].finish(perf_counter(), timed_out=True)
+                self._finish_records(records)
+                raise ExecChannelError(f'No output from exec channel for {timeout} seconds')
+            for channel in ready:
+                data = channel.recv(buffer_size)
+                if data:
+                    received[channel].append(data)
+                    channel_records[channel].received(data, perf_counter())
+                else:
+                    pending.remove(channel)
+                    channel_records[channel].finish(perf_counter())
+        self._finish_records(records)
+
+        outputs = []
+        for command, channel in zip(commands, channels):
+            channel.close()
+            output = b''.join(received[channel]).decode('utf-8', errors='replace')
+            outputs.append([command] + output.splitlines() + [self.prompt])
+        return outputs
+
+    @property
+    def shell_channels_available(self):
+        """
+        True when shell_channels is more than 0 and the device has not refused a shell yet. Never True while in a
+        jumphost opened with jumphost(), more shells would be on the jumphost instead of the device
+        """
+        return self.shell_channels > 0 and not self._shell_channels_failed and not self._in_jumphost
+
+    def open_shell_channels(self):
+        """
+        Opens the shell_channels extra shells on the connection if they are not open yet, see ShellChannel
+
+        :return: Open extra shells
+        :rtype: list[ShellChannel]
+
+        :raises: CiscoAutomationFramework.Exceptions.ShellChannelError
+        """
+        self._extra_shells = [shell for shell in self._extra_shells if shell.is_alive]
+        try:
+            while len(self._extra_shells) < self.shell_channels:
+                shell = ShellChannel(self)
+                self._extra_shells.append(shell)
+                shell.open()
+        except (SSHException, EOFError, OSError, LoginError) as e:
+            self._shell_channels_failed = True
+            self.close_shell_channels()
+            raise ShellChannelError(f'Unable to open another shell on the device: {e}') from e
+        return list(self._extra_shells)
+
+    def close_shell_channels(self):
+        """
+        Closes the extra shells, they are opened again the next time they are needed
+
+        :return: Nothing
+        """
+        shells, self._extra_shells = self._extra_shells, []
+        for shell in shells:
+            shell.close_connection()
+
+    def shell_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=default_timeout):
+        """
+        Runs commands in parallel on the extra shells opened next to the main shell, one command at a time per
+        shell, each shell takes the next command as soon as it is done with its last one. On devices that work on
+        several sessions at the same time a set of slow show commands takes about as long as the slowest one
+        instead of all of them added up. The main shell is not touched and its mode does not matter.
+
+        Only use this for commands that do not change anything, the extra shells are in privileged exec mode
+        (given an enable password is set if it is needed) with the terminal length set to 0 and are reused
+        between calls.
+
+        If a shell can not be opened or stops answering a ShellChannelError is raised and shell_channels_available
+        becomes False, so callers fall back to the main shell from then on.
+
+        :param commands: Commands to run
+        :type commands: list[str]
+        :param buffer_size: Size of buffer when getting output from device
+        :type buffer_size: int
+        :param timeout: Time to stop waiting for output if no output is received
+        :type timeout: float
+        :return: List with the output of each command split by line, in the order of commands
+        :rtype: list[list[str]]
+
+        :raises: CiscoAutomationFramework.Exceptions.ShellChannelError
+        """
+        shells = self.open_shell_channels()[:len(commands)]
+        work = Queue()
+        for index, command in enumerate(commands):
+            work.put((index, command))
+        outputs = [None] * len(commands)
+        errors = []
+
+        def run(shell):
+            while not errors:
+                try:
+                    index, command = work.get_nowait()
+                except Empty:
+                    return
+                try:
+                    outputs[index] = shell.send_command_get_output(command, buffer_size=buffer_size,
+                                                                   timeout=timeout, delay=0)
+                except (SSHException, EOFError, OSError) as e:
+                    errors.append(e)
+
+        threads = [Thread(target=run, args=(shell,), daemon=True) for shell in shells]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.all_commands_sent.extend(commands)
+
+        prompt = PromptMatcher(self.hostname).pattern
+        missing = [command for command, output in zip(commands, outputs) if not output or not prompt.match(output[-1])]
+        if errors or missing:
+            self._shell_channels_failed = True
+            self.close_shell_channels()
+            reason = errors[0] if errors else f'no prompt after {", ".join(missing)}'
+            raise ShellChannelError(f'Extra shell stopped answering: {reason}')
+        return outputs
+
+    @property
+    def file_transfer_available(self):
+        """
+        True when file_transfer is set to scp or sftp and the device has not refused a transfer yet
+        """
+        return self.file_transfer in ('scp', 'sftp') and not self._file_transfer_failed
+
+    def get_file(self, path, timeout=None):
+        """
+        Copies a file off the device over SCP or SFTP (set in file_transfer) on the same connection as the shell,
+        ex. "system:running-config". The device must have its SCP or SFTP server turned on.
+
+        If the transfer fails a FileTransferError is raised. When the channel or the protocol fails
+        file_transfer_available becomes False, so callers fall back to the shell from then on. An error the device
+        reports for the file itself (ex. it does not exist) leaves file transfer available.
+
+        :param path: Path of the file on the device
+        :type path: str
+        :param timeout: Seconds to wait without data before giving up, defaults to the engine timeout
+        :type timeout: float
+        :return: Contents of the file
+        :rtype: str
+
+        :raises: CiscoAutomationFramework.Exceptions.FileTransferError
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            if self.file_transfer == 'sftp':
+                data = self._sftp_get(path, timeout)
+            else:
+                data = self._scp_get(path, timeout)
+        except (FileNotFoundError, PermissionError, FileTransferError) as e:
+            # the device answered with an error about this file, the transfer itself works
+            raise FileTransferError(f'Unable to copy {path} off the device with {self.file_transfer}: {e}') from e
+        except (SSHException, EOFError, OSError, ValueError) as e:
+            self._file_transfer_failed = True
+            raise FileTransferError(f'Unable to copy {path} off the device with {self.file_transfer}: {e}') from e
+        return data.decode('utf-8', errors='replace')
+
+    def _sftp_get(self, path, timeout):
+        sftp = SFTPClient.from_transport(self.client.get_transport())
+        try:
+            sftp.get_channel().settimeout(timeout)
+            with sftp.open(path, 'rb') as file:
+                return file.read()
+        finally:
+            sftp.close()
+
+    @staticmethod
+    def _scp_read_line(channel):
+        line = bytearray()
+        while not line.endswith(b'\n'):
+            byte = channel.recv(1)
+            if not byte:
+                raise EOFError('SCP channel closed')
+            line += byte
+        return bytes(line)
+
+    def _scp_get(self, path, timeout):
+        """
+        Source side of the SCP protocol: every message from the device is acknowledged with a null byte, the file
+        is announced with "C<mode> <size> <name>" and followed by its contents and a null byte
+        """
+        channel = self.client.get_transport().open_session(timeout=timeout)
+        channel.settimeout(timeout)
+        try:
+            channel.exec_command(f'scp -f {path}')
+            channel.sendall(b'\0')
+            header = self._scp_read_line(channel)
+            if not header.startswith(b'C'):
+                # \x01 and \x02 are followed by the error message of the device
+                raise FileTransferError(header.lstrip(b'\x01\x02').decode('utf-8', errors='replace').strip())
+            size = int(header.split()[1])
+            channel.sendall(b'\0')
+            data = bytearray()
+            while len(data) < size + 1:
+                chunk = channel.recv(min(65536, size + 1 - len(data)))
+                if not chunk:
+                    raise EOFError(f'SCP channel closed after {len(data)} of {size} bytes')
+                data += chunk
+            channel.sendall(b'\0')
+            return bytes(data[:size])
+        finally:
+            channel.close()
+
     def jumphost(self, ip, password, username=None, port=None, ssh_ver=None, vrf=None):
         command_string = 'ssh '
         if username:
@@ -236,30 +1172,104 @@ class SSHEngine(BaseEngine):
             command_string += f'-vrf {vrf} '
         command_string += ip
 
-        self.send_command(command_string)
-        sleep(.3)
-        _ = self._get_output(100)
-        self.send_command(password)
-        self.prompt, self.hostname = self._get_prompt_and_hostname()
+        self.all_commands_sent.append(command_string)
+        self._send_command(command_string)
+        # a new line sent while the ssh client is connecting would be taken as the password, never nudge
+        self.prompt, self.hostname = self._get_prompt_and_hostname(self.timeout, username, password, max_nudges=0)
 
     def exit_jumphost(self):
         if self._in_jumphost:
-            self.send_command('exit')
-            self.prompt, self.hostname = self._get_prompt_and_hostname()
+            self.all_commands_sent.append('exit')
+            self._send_command('exit')
+            self.prompt, self.hostname = self._get_prompt_and_hostname(self.timeout)
+
+    def _wait_for_output(self, timeout):
+        """
+        When wait_mode is 'select' this blocks on the channel itself and returns as soon as the device sends data
+        instead of sleeping a fixed interval, so the time to pick up output is bound by the network not by polling.
+        Set wait_mode to 'poll' to fall back to the sleep based polling of the base engine.
+        """
+        if self.wait_mode == 'select' and hasattr(self.shell, 'fileno'):
+            select([self.shell], [], [], timeout)
+        else:
+            super()._wait_for_output(timeout)
+
+    def _recv(self, buffer_size):
+        """
+        Reads up to buffer_size bytes from the shell. If the shell supports recv_into the data is read into a buffer
+        that is reused between reads instead of allocating a new bytes object for every read.
+        """
+        if not hasattr(self.shell, 'recv_into'):
+            return self.shell.recv(buffer_size)
+        if len(self._recv_buffer) < buffer_size:
+            self._recv_buffer = bytearray(buffer_size)
+        view = memoryview(self._recv_buffer)
+        received = self.shell.recv_into(view[:buffer_size])
+        return view[:received]
 
     def _get_output(self, buffer_size):
+        """
+        Decoding is done incrementally so a multibyte character that is split between two reads is held until
+        the rest of it is received instead of failing to decode.
+        """
         if self.shell.recv_ready():
-            return bytes.decode(self.shell.recv(buffer_size))
+            return self._decoder.decode(self._recv(buffer_size))
         return ''
 
     def _send_command(self, command, end='\n'):
         self.shell.send(f'{command}{end}')
 
     def close_connection(self):
+        self.close_shell_channels()
         self.exit_jumphost()
         self.client.close()
 
 
+class ShellChannel(SSHEngine):
+    """
+    An extra interactive shell opened on the connection of an SSHEngine, used by SSHEngine.shell_commands_get_outputs
+    to run commands in parallel. It shares the connection, timeout and enable password of the engine it is opened
+    for, and the records of the commands run on it are added to the command_records of that engine.
+    """
+
+    def __init__(self, engine):
+        """
+        :param engine: Connected engine to open the shell on
+        :type engine: SSHEngine
+        """
+        super().__init__()
+        self.engine = engine
+        self.client = engine.client
+        self.timeout = engine.timeout
+        self.wait_mode = engine.wait_mode
+        self.enable_password = engine.enable_password
+
+    def open(self):
+        """
+        Opens the shell, gets it into privileged exec mode if an enable password is needed and set, and sets the
+        terminal length to 0
+
+        :return: Nothing
+        """
+        self.shell = self.client.invoke_shell()
+        self.prompt, self.hostname = self._get_prompt_and_hostname(self.timeout)
+        self._pre_jumphost_hostname = self.hostname
+        if self.in_user_exec_mode and self.enable_password:
+            self.send_command_get_output('enable', delay=0)
+            # enable may go straight to privileged exec mode, the password is only sent if the device asked for it
+            if self.in_user_exec_mode:
+                self.send_command_get_output(self.enable_password, delay=0)
+        self.send_command_get_output('terminal length 0', delay=0)
+
+    def _finish_records(self, records):
+        with self.engine._records_lock:
+            self.engine._finish_records(records)
+
+    def close_connection(self):
+        if self.shell:
+            self.shell.close()
+
+
 class ReadOnlySSHEngine(SSHEngine):
 
     def __init__(self, *args, **kwargs):
@@ -288,6 +1298,18 @@ class ReadOnlySSHEngine(SSHEngine):
             raise ForbiddenError(f'You are not allowed to issue "{command}" using this engine!')
         super()._send_command(command, end)
 
+    def exec_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=None):
+        for command in commands:
+            if self.is_forbidden_command(command):
+                raise ForbiddenError(f'You are not allowed to issue "{command}" using this engine!')
+        return super().exec_commands_get_outputs(commands, buffer_size, timeout)
+
+    def shell_commands_get_outputs(self, commands, buffer_size=default_buffer, timeout=default_timeout):
+        for command in commands:
+            if self.is_forbidden_command(command):
+                raise ForbiddenError(f'You are not allowed to issue "{command}" using this engine!')
+        return super().shell_commands_get_outputs(commands, buffer_size, timeout)
+
     # Methods required for some lower level SSH handling. These methods should not be called outside of this class
 
     # End low level methods
\ No newline at end of file
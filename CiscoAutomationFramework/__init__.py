@@ -1,9 +1,15 @@
-from CiscoAutomationFramework.TransportEngines import SSHEngine
-from CiscoAutomationFramework.FirmwareDetect import detect_firmware
+from CiscoAutomationFramework.TransportEngines import SSHEngine, AdaptiveTiming, JumphostTunnel
+from CiscoAutomationFramework.FirmwareDetect import detect_firmware, firmware_for_transport
+from CiscoAutomationFramework.FirmwareCache import FirmwareCache
+from CiscoAutomationFramework.ConfigFingerprints import ConfigFingerprintStore
 from CiscoAutomationFramework.FirmwareBase import CiscoFirmware
+from CiscoAutomationFramework.AsyncTransportEngines import AsyncSSHEngine
+from CiscoAutomationFramework.AsyncFirmware import AsyncCiscoFirmware, async_detect_firmware
 
 
-def connect_ssh(ip, username, password, port=22, enable_password=None, timeout=10, engine=SSHEngine) -> CiscoFirmware:
+def connect_ssh(ip, username, password, port=22, enable_password=None, timeout=10, engine=SSHEngine,
+                adaptive_timing=False, jumphost=None, exec_channels=False, command_record_callback=None,
+                firmware_cache=None, file_transfer=None, shell_channels=0) -> CiscoFirmware:
     """
     Connects to your cisco device, returns a firmware specific instance of CiscoFirmware object.
 
@@ -25,7 +31,29 @@ def connect_ssh(ip, username, password, port=22, enable_password=None, timeout=1
     :param timeout: SSH timeout in seconds
     :type timeout: int
 
-    :param
+    :param engine: Transport engine class to use (default SSHEngine)
+    :type engine: SSHEngine
+
+    :param adaptive_timing: Learn the response time of the device and stop sleeping a fixed delay before reading output
+    :type adaptive_timing: bool
+
+    :param jumphost: Jumphost to tunnel the connection to the device through
+    :type jumphost: JumphostTunnel
+
+    :param exec_channels: Run show commands on exec channels instead of the shell where the device supports it
+    :type exec_channels: bool
+
+    :param command_record_callback: Function called with the CommandRecord of each command as its output is gathered
+    :type command_record_callback: callable
+
+    :param firmware_cache: Cache of previously detected firmware, show version is only sent to devices not in it
+    :type firmware_cache: FirmwareCache
+
+    :param file_transfer: Copy the running config off the device with 'scp' or 'sftp' instead of show running-config
+    :type file_transfer: str
+
+    :param shell_channels: Number of extra shells to open to run several show commands in parallel
+    :type shell_channels: int
 
     :return: CiscoFirmware Object
     :rtype: CiscoFirmware
@@ -40,6 +68,54 @@ def connect_ssh(ip, username, password, port=22, enable_password=None, timeout=1
     engine = engine()
     engine.enable_password = enable_password
     engine.timeout = timeout
+    if adaptive_timing:
+        engine.adaptive_timing = AdaptiveTiming()
+    engine.tunnel = jumphost
+    engine.exec_channels = exec_channels
+    engine.command_record_callback = command_record_callback
+    engine.file_transfer = file_transfer
+    engine.shell_channels = shell_channels
     engine.connect_to_server(ip, username, password, port)
-    firmware = detect_firmware(engine)
+    return firmware_for_transport(engine, firmware_cache, FirmwareCache.key(ip, port, jumphost))
+
+
+async def async_connect_ssh(ip, username, password, port=22, enable_password=None, timeout=10,
+                            engine=AsyncSSHEngine) -> AsyncCiscoFirmware:
+    """
+    asyncio counterpart to connect_ssh. Connects to your cisco device and returns a firmware specific instance of
+    AsyncCiscoFirmware. Many devices can be driven from a single event loop, ex. with asyncio.gather
+
+    :param ip: IP address or hostname of Cisco device
+    :type ip: str
+
+    :param username: Username used to login
+    :type username: str
+
+    :param password: Password for user
+    :type password: str
+
+    :param port:  Port to use (default 22)
+    :type port: int
+
+    :param enable_password: Enable password to use if the user does not have privileges directly to privilege exec
+    :type enable_password: str
+
+    :param timeout: SSH timeout in seconds
+    :type timeout: int
+
+    :param engine: Transport engine class to use (default AsyncSSHEngine)
+    :type engine: AsyncSSHEngine
+
+    :return: AsyncCiscoFirmware Object
+    :rtype: AsyncCiscoFirmware
+    """
+
+    if not issubclass(engine, AsyncSSHEngine):
+        raise TypeError('engine MUST be an AsyncSSHEngine!')
+
+    engine = engine()
+    engine.enable_password = enable_password
+    engine.timeout = timeout
+    await engine.connect_to_server(ip, username, password, port)
+    firmware = await async_detect_firmware(engine)
     return firmware(engine)
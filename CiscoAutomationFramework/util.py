@@ -114,7 +114,7 @@ def matches_search_terms(key, search_terms, case_sensitive, full_match):
 
 def indented_text_to_tree(config):
     """
-    Takes in a string/list that is formatted in a heiarchy by indents similar to below
+    Takes in a string/list/iterable of lines that is formatted in a heiarchy by indents similar to below
     line one
      line two
      line three
@@ -124,6 +124,8 @@ def indented_text_to_tree(config):
     And parses it based on the indents, Can be arbitrary
 
     This is used to parse the running/startup config. Also useful for parsing things like "show interfaces" output.
+    Lines are consumed one at a time so the output of send_command_iter_lines can be passed in directly to start
+    building the tree while the device is still sending output.
     """
     if type(config) == str:
         config = config.splitlines()
@@ -0,0 +1,628 @@
+from threading import Thread, Event
+from datetime import datetime
+from time import sleep
+import selectors
+import paramiko
+import socket
+import json
+import os
+import re
+
+fixture_directory = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def _fixture_name(command):
+    return '_'.join(command.split())
+
+
+def load_fixtures(firmware, directory=fixture_directory):
+    """
+    Loads the output of every command in the fixture directory of a firmware. Each file is named after the command
+    with spaces replaced by underscores, ex. show_running-config.txt, and {hostname} is replaced with the hostname
+    of the device when the output is sent.
+
+    :param firmware: IOS or NXOS
+    :type firmware: str
+    :return: Dictionary of command to output
+    :rtype: dict
+    """
+    fixtures = {}
+    firmware_directory = os.path.join(directory, firmware)
+    for file_name in os.listdir(firmware_directory):
+        if file_name.endswith('.txt'):
+            with open(os.path.join(firmware_directory, file_name)) as file:
+                # the newline ending the file is not part of the output, the prompt follows the last line
+                output = file.read()
+                fixtures[file_name[:-4]] = output[:-1] if output.endswith('\n') else output
+    return fixtures
+
+
+class VirtualDevice:
+    """
+    Settings and command output of one emulated device.
+
+    :param hostname: Hostname shown in the prompt
+    :param firmware: IOS or NXOS, selects the fixtures and how the device behaves
+    :param username: Username the device accepts
+    :param password: Password the device accepts
+    :param enable_password: If set the device starts in user exec mode and asks for this password on enable,
+        otherwise enable goes straight to privileged exec mode
+    :param user_exec: The device starts in user exec mode even without an enable password
+    :param latency: Seconds the device waits before answering each command
+    :param bandwidth: Bytes per second the device sends output at, None for as fast as possible
+    :param extra_interfaces: Number of generated interfaces to add to the running config to make it bigger
+    :param fixtures: Command output to use in addition to (or instead of) the fixture files, ex. {'show clock': '...'}
+    :param banner: MOTD banner shown before the first prompt
+    :param rejected_config: Config lines starting with any of these are answered with an invalid input error
+    :param file_servers: File transfer servers the device has turned on, scp and/or sftp
+    :param extra_mac_entries: Number of generated entries to add to the MAC address table to make it bigger
+    :param json_output: The device supports "| json" (NXOS only)
+    :param exec_channels: The device runs commands sent on exec channels, when False only SCP is accepted on them
+    """
+
+    def __init__(self, hostname='switch', firmware='IOS', username='user', password='pass', enable_password=None,
+                 latency=0, bandwidth=None, extra_interfaces=0, fixtures=None, banner=None, rejected_config=(),
+                 file_servers=('scp', 'sftp'), extra_mac_entries=0, json_output=True, exec_channels=True, user_exec=False):
+        self.hostname = hostname
+        self.firmware = firmware
+        self.username = username
+        self.password = password
+        self.enable_password = enable_password
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.extra_interfaces = extra_interfaces
+        self.banner = banner
+        self.fixtures = load_fixtures(firmware)
+        self.fixtures.update({_fixture_name(command): output for command, output in (fixtures or {}).items()})
+        self.rejected_config = tuple(rejected_config)
+        self.file_servers = tuple(file_servers)
+        self.extra_mac_entries = extra_mac_entries
+        self.json_output = json_output
+        self.exec_channels = exec_channels
+        self.user_exec = user_exec
+        self.files_copied = []
+        self.last_change = '10:00:00 UTC Mon Jan 1 2024'
+        self.commands_received = []
+        self.exec_commands = []
+        self.config_applied = []
+        self.transports = []
+        self.forwarded_to = []
+
+    @property
+    def is_nexus(self):
+        return self.firmware == 'NXOS'
+
+    def _generated_interfaces(self):
+        if self.is_nexus:
+            return ''.join(f'interface loopback{x}\n  description generated interface {x}\n\n'
+                           for x in range(self.extra_interfaces))
+        return ''.join(f'interface Loopback{x}\n description generated interface {x}\n!\n'
+                       for x in range(self.extra_interfaces))
+
+    def configured(self, line):
+        """
+        Records a config line applied to the device and moves the time of the last configuration change
+        """
+        self.config_applied.append(line)
+        # microseconds so every change is seen, even several in the same second
+        self.last_change = datetime.now().strftime('%H:%M:%S.%f UTC %a %b %d %Y')
+
+    def output(self, command, hostname):
+        """
+        Returns the output of a command, or None if the device does not know it. Output can be filtered with
+        "| include", "| exclude" and "| begin" followed by a regular expression.
+        """
+        command, _, output_filter = command.partition(' | ')
+        if output_filter.strip() == 'json':
+            return self._json_output(command) if self.is_nexus and self.json_output else None
+        output = self.fixtures.get(_fixture_name(command))
+        if output is None:
+            output = self._interface_output(command)
+        if output is None:
+            return None
+        if _fixture_name(command) == 'show_running-config' and self.extra_interfaces:
+            marker = 'line console' if self.is_nexus else 'ip default-gateway'
+            output = output.replace(marker, f'{self._generated_interfaces()}{marker}', 1)
+        if _fixture_name(command) == 'show_mac_address-table' and self.extra_mac_entries:
+            output += ''.join(f'\n{line}' for line in self._generated_mac_entries())
+        output = output.replace('{hostname}', hostname).replace('{last_change}', self.last_change)
+        if output_filter:
+            output = self._filter(output, output_filter)
+        return output
+
+    def _interface_output(self, command):
+        """
+        Output of show interfaces for a single interface, cut out of the output of show interfaces for all of them
+        """
+        words = command.split()
+        if len(words) != 3 or words[0] != 'show' or words[1] not in ('interface', 'interfaces'):
+            return None
+        output = self.fixtures.get('show_interface' if self.is_nexus else 'show_interfaces', '')
+        block = []
+        for line in output.split('\n'):
+            if re.match(r'\S+ is (up|down|administratively down)', line):
+                if block:
+                    break
+                if line.split()[0] == words[2]:
+                    block.append(line)
+            elif block:
+                block.append(line)
+        return '\n'.join(block) if block else None
+
+    def _generated_mac_entries(self):
+        for x in range(self.extra_mac_entries):
+            mac = f'{x:012x}'
+            if self.is_nexus:
+                yield f'*  {x % 4000 + 1:>3}     {mac[:4]}.{mac[4:8]}.{mac[8:]}   dynamic  0         F      F    Eth1/{x % 48 + 1}'
+            else:
+                yield f'{x % 4000 + 1:>4}    {mac[:4]}.{mac[4:8]}.{mac[8:]}    DYNAMIC     Gi1/0/{x % 48 + 1}'
+
+    def _json_output(self, command):
+        """
+        Output of a command run with "| json". The MAC address table is built from the text table, other commands
+        come from a fixture named after the command followed by _json.
+        """
+        if _fixture_name(command) != 'show_mac_address-table':
+            return self.fixtures.get(f'{_fixture_name(command)}_json')
+        rows = []
+        for line in self.output(command, self.hostname).split('\n'):
+            words = line.split()
+            if len(words) == 8 and words[2].count('.') == 2:
+                rows.append({'disp_mac_addr': words[2], 'disp_type': f'{words[0]} ', 'disp_vlan': words[1],
+                             'disp_is_static': 'enabled' if words[3] == 'static' else 'disabled',
+                             'disp_age': words[4], 'disp_is_secure': 'enabled' if words[5] == 'T' else 'disabled',
+                             'disp_is_ntfy': 'enabled' if words[6] == 'T' else 'disabled', 'disp_port': words[7]})
+        # NX-OS sends the whole table on a single line
+        return json.dumps({'TABLE_mac_address': {'ROW_mac_address': rows}})
+
+    @staticmethod
+    def _filter(output, output_filter):
+        words = output_filter.split(maxsplit=1)
+        if len(words) != 2:
+            return None
+        keyword, pattern = words
+        pattern = re.compile(pattern.strip('"'))
+        lines = output.split('\n')
+        if 'include'.startswith(keyword):
+            lines = [line for line in lines if pattern.search(line)]
+        elif 'exclude'.startswith(keyword):
+            lines = [line for line in lines if not pattern.search(line)]
+        elif 'begin'.startswith(keyword):
+            starts = [number for number, line in enumerate(lines) if pattern.search(line)]
+            lines = lines[starts[0]:] if starts else []
+        else:
+            return None
+        return '\n'.join(lines)
+
+    def file(self, path):
+        """
+        Returns the contents of a file that can be copied off the device, or None if there is no such file. The
+        running config file is the output of show running-config without the header IOS prints before it.
+        """
+        if path != ('running-config' if self.is_nexus else 'system:running-config'):
+            return None
+        self.files_copied.append(path)
+        running_config = self.output('show running-config', self.hostname)
+        return re.sub(r'^Building configuration\.\.\.\n\nCurrent configuration : \d+ bytes\n', '', running_config)
+
+
+class _CLISession:
+    """
+    The CLI of a virtual device on one channel. Keeps track of the mode the CLI is in, the terminal length and
+    any question the device is waiting on an answer to.
+    """
+
+    def __init__(self, device, channel):
+        self.device = device
+        self.channel = channel
+        self.hostname = device.hostname
+        self.mode = 'user' if device.enable_password or device.user_exec else 'privileged'
+        self.config_context = 'config'
+        self.terminal_length = 24
+        self.closed = False
+        self._answer = None
+        self._more = []
+
+    @property
+    def prompt(self):
+        if self.mode == 'user':
+            return f'{self.hostname}>'
+        if self.mode == 'config':
+            return f'{self.hostname}({self.config_context})#'
+        return f'{self.hostname}#'
+
+    def send(self, text):
+        """
+        Sends text to the client limited to the bandwidth of the device
+        """
+        data = text.encode('utf-8')
+        if not self.device.bandwidth:
+            self.channel.sendall(data)
+            return
+        chunk_size = max(1, int(self.device.bandwidth * .01))
+        for start in range(0, len(data), chunk_size):
+            self.channel.sendall(data[start:start + chunk_size])
+            sleep(.01)
+
+    def run(self):
+        if self.device.banner:
+            self.send(self.device.banner.replace('\n', '\r\n'))
+        self.send(f'\r\n{self.prompt}')
+        line = ''
+        previous = ''
+        while not self.closed:
+            data = self.channel.recv(1024)
+            if not data:
+                return
+            for char in data.decode('utf-8', errors='replace'):
+                if self._more:
+                    self._page(char)
+                elif char == '\n' and previous == '\r':
+                    pass
+                elif char in '\r\n':
+                    self._enter(line)
+                    line = ''
+                    if self.closed:
+                        break
+                else:
+                    line += char
+                previous = char
+        self.channel.close()
+
+    def _enter(self, line):
+        if self.device.latency:
+            sleep(self.device.latency)
+        if self._answer:
+            answer, self._answer = self._answer, None
+            output = answer(line)
+        else:
+            self.send(f'{line}\r\n')
+            self.device.commands_received.append(line)
+            output = self.execute(line)
+        if self.closed:
+            return
+        if self._answer:
+            # device is asking a question, no prompt until it is answered
+            self.send(output)
+        else:
+            self._respond(output)
+
+    def _respond(self, output):
+        lines = output.replace('\r\n', '\n').split('\n') if output else []
+        if self.terminal_length and len(lines) >= self.terminal_length:
+            page, self._more = lines[:self.terminal_length - 1], lines[self.terminal_length - 1:]
+            self.send('\r\n'.join(page) + '\r\n --More-- ')
+            return
+        self.send(''.join(f'{line}\r\n' for line in lines) + self.prompt)
+
+    def _page(self, char):
+        """
+        Handles a key pressed at --More--, space shows the next page, enter the next line and q stops
+        """
+        self.send('\b' * 10 + ' ' * 10 + '\b' * 10)
+        if char == 'q':
+            self._more = []
+            self.send(self.prompt)
+            return
+        count = 1 if char in '\r\n' else self.terminal_length - 1
+        lines, self._more = self._more[:count], self._more[count:]
+        if self._more:
+            self.send('\r\n'.join(lines) + '\r\n --More-- ')
+        else:
+            self.send(''.join(f'{line}\r\n' for line in lines) + self.prompt)
+
+    def execute(self, command):
+        """
+        Runs a command and returns its output
+        """
+        words = command.split()
+        if not words:
+            return ''
+        if self.mode == 'config':
+            return self._configure(words)
+
+        if words[0] in ('exit', 'logout', 'quit'):
+            self.closed = True
+            return ''
+        if words[0] == 'enable':
+            if self.mode == 'user' and self.device.enable_password:
+                self._answer = self._enable
+                return 'Password: '
+            self.mode = 'privileged'
+            return ''
+        if words[0] == 'disable':
+            self.mode = 'user'
+            return ''
+        if 'configure'.startswith(words[0]) and len(words[0]) >= 4:
+            if self.mode == 'user':
+                return self._invalid()
+            self.mode = 'config'
+            self.config_context = 'config'
+            return 'Enter configuration commands, one per line.  End with CNTL/Z.'
+        if words[:2] == ['terminal', 'length'] and len(words) == 3:
+            self.terminal_length = int(words[2])
+            return ''
+        if words[:2] == ['terminal', 'width']:
+            return ''
+        if words[:3] == ['copy', 'running-config', 'startup-config']:
+            return self._copy_running_config()
+
+        output = self.device.output(command, self.hostname)
+        if output is None:
+            return self._invalid()
+        return output
+
+    def _configure(self, words):
+        if self.device.rejected_config and ' '.join(words).startswith(self.device.rejected_config):
+            return self._invalid()
+        if words[0] not in ('end', 'exit', 'do'):
+            self.device.configured(' '.join(words))
+        if words[0] == 'end':
+            self.mode = 'privileged'
+        elif words[0] == 'exit':
+            if self.config_context == 'config':
+                self.mode = 'privileged'
+            self.config_context = 'config'
+        elif words[0] == 'do':
+            return self.execute(' '.join(words[1:])) if len(words) > 1 else self._invalid()
+        elif words[0] == 'hostname' and len(words) == 2:
+            self.hostname = words[1]
+        elif words[0] in ('interface', 'line', 'router', 'vlan'):
+            self.config_context = {'interface': 'config-if'}.get(words[0], f'config-{words[0]}')
+        return ''
+
+    def _enable(self, password):
+        self.send('\r\n')
+        if password == self.device.enable_password:
+            self.mode = 'privileged'
+            return ''
+        return '% Access denied'
+
+    def _copy_running_config(self):
+        if self.device.is_nexus:
+            return '[########################################] 100%\nCopy complete.'
+        self._answer = lambda answer: f'{answer}\r\nBuilding configuration...\r\n[OK]'
+        return 'Destination filename [startup-config]? '
+
+    def _invalid(self):
+        if self.device.is_nexus:
+            return "% Invalid command at '^' marker."
+        return "% Invalid input detected at '^' marker."
+
+
+def _pump(source, destination):
+    try:
+        while True:
+            data = source.recv(4096)
+            if not data:
+                break
+            destination.sendall(data)
+    except OSError:
+        pass
+    finally:
+        destination.close()
+        source.close()
+
+
+class _EmulatorServerInterface(paramiko.ServerInterface):
+
+    def __init__(self, device, transport):
+        self.device = device
+        self.transport = transport
+        self.forwards = {}
+        self._forwarding = False
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (self.device.username, self.device.password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_direct_tcpip_request(self, chanid, origin, destination):
+        self.forwards[chanid] = destination
+        if not self._forwarding:
+            # forwarded channels are only handed over by accept, shell and exec channels are served on request
+            self._forwarding = True
+            Thread(target=self._accept_forwards, daemon=True).start()
+        return paramiko.OPEN_SUCCEEDED
+
+    def _accept_forwards(self):
+        while self.transport.is_active():
+            channel = self.transport.accept(1)
+            if channel is not None and channel.get_id() in self.forwards:
+                destination = self.forwards.pop(channel.get_id())
+                self.device.forwarded_to.append(destination)
+                remote = socket.create_connection(destination)
+                Thread(target=_pump, args=(channel, remote), daemon=True).start()
+                Thread(target=_pump, args=(remote, channel), daemon=True).start()
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        Thread(target=_CLISession(self.device, channel).run, daemon=True).start()
+        return True
+
+    def check_channel_exec_request(self, channel, command):
+        if not self.device.exec_channels and not command.startswith(b'scp -f '):
+            return False
+        Thread(target=self._exec, args=(channel, command.decode('utf-8')), daemon=True).start()
+        return True
+
+    def _exec(self, channel, command):
+        # give paramiko time to accept the exec request before the channel is closed
+        sleep(max(.05, self.device.latency))
+        if command.startswith('scp -f '):
+            self._scp_source(channel, command[len('scp -f '):].strip())
+            return
+        session = _CLISession(self.device, channel)
+        session.mode = 'privileged'
+        self.device.commands_received.append(command)
+        self.device.exec_commands.append(command)
+        output = session.execute(command)
+        session.send(''.join(f'{line}\r\n' for line in output.replace('\r\n', '\n').split('\n')))
+        channel.send_exit_status(0)
+        channel.close()
+
+
+    def _scp_source(self, channel, path):
+        """
+        Sends a file to an SCP client, every message is acknowledged by the client with a null byte. A device
+        without an SCP server closes the channel without answering
+        """
+        if 'scp' not in self.device.file_servers:
+            channel.close()
+            return
+        contents = self.device.file(path)
+        try:
+            channel.recv(1)
+            if contents is None:
+                channel.sendall(f'\x01scp: {path}: No such file or directory\n'.encode())
+            else:
+                data = contents.encode('utf-8')
+                channel.sendall(f'C0644 {len(data)} {path.split(":")[-1]}\n'.encode())
+                channel.recv(1)
+                channel.sendall(data + b'\0')
+                channel.recv(1)
+            channel.send_exit_status(0 if contents is not None else 1)
+            channel.close()
+        except (OSError, EOFError, paramiko.SSHException):
+            # the client closes the channel, or the whole connection, as soon as it has what it needs
+            pass
+
+
+class _EmulatorSFTPHandle(paramiko.SFTPHandle):
+
+    def __init__(self, data):
+        super().__init__()
+        self.data = data
+
+    def read(self, offset, length):
+        return self.data[offset:offset + length]
+
+    def stat(self):
+        attributes = paramiko.SFTPAttributes()
+        attributes.st_size = len(self.data)
+        attributes.st_mode = 0o100644
+        return attributes
+
+
+class _EmulatorSFTPServer(paramiko.SFTPServerInterface):
+    """
+    SFTP server of a virtual device, only the running config can be read
+    """
+
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.device = server.device
+
+    def open(self, path, flags, attr):
+        contents = self.device.file(path)
+        if contents is None:
+            return paramiko.SFTP_NO_SUCH_FILE
+        return _EmulatorSFTPHandle(contents.encode('utf-8'))
+
+
+class CiscoEmulator:
+    """
+    SSH server on localhost that emulates the CLI of IOS and NXOS devices. Every virtual device listens on its own
+    port, all of the listening sockets are watched by a single thread so thousands of devices can be emulated by
+    one process (raise the open file limit to go past about a thousand). Use it as a context manager::
+
+        with CiscoEmulator() as emulator:
+            ports = emulator.add_devices(100, latency=.05)
+            with connect_ssh('127.0.0.1', 'user', 'pass', port=ports[0]) as ssh:
+                ...
+    """
+
+    host_key = None
+
+    def __init__(self, address='127.0.0.1'):
+        self.address = address
+        self.devices = {}
+        self.transports = []
+        self._selector = selectors.DefaultSelector()
+        self._stopped = Event()
+        self._thread = None
+        if CiscoEmulator.host_key is None:
+            CiscoEmulator.host_key = paramiko.RSAKey.generate(1024)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def add_device(self, device):
+        """
+        Starts listening for connections to a virtual device
+
+        :param device: Device to emulate
+        :type device: VirtualDevice
+        :return: Port the device listens on
+        :rtype: int
+        """
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.address, 0))
+        listener.listen(128)
+        listener.setblocking(False)
+        port = listener.getsockname()[1]
+        self.devices[port] = device
+        self._selector.register(listener, selectors.EVENT_READ, device)
+        return port
+
+    def add_devices(self, count, firmware='IOS', hostname_prefix='switch', **kwargs):
+        """
+        Adds several virtual devices with the same settings, named hostname_prefix followed by a number
+
+        :param count: Number of devices to add
+        :type count: int
+        :param kwargs: Settings of the devices, see VirtualDevice
+        :return: Ports the devices listen on
+        :rtype: list[int]
+        """
+        return [self.add_device(VirtualDevice(f'{hostname_prefix}{x}', firmware, **kwargs)) for x in range(count)]
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        for key in list(self._selector.get_map().values()):
+            self._selector.unregister(key.fileobj)
+            key.fileobj.close()
+        for transport in self.transports:
+            transport.close()
+
+    def _accept(self):
+        while not self._stopped.is_set():
+            for key, _ in self._selector.select(timeout=.1):
+                try:
+                    client, _ = key.fileobj.accept()
+                except OSError:
+                    continue
+                client.setblocking(True)
+                self._serve(client, key.data)
+
+    def _serve(self, client, device):
+        transport = paramiko.Transport(client)
+        self.transports.append(transport)
+        device.transports.append(transport)
+        transport.add_server_key(self.host_key)
+        if 'sftp' in device.file_servers:
+            transport.set_subsystem_handler('sftp', paramiko.SFTPServer, _EmulatorSFTPServer)
+        # passing an event makes negotiation run in the transport thread instead of blocking the accept loop
+        transport.start_server(event=Event(), server=_EmulatorServerInterface(device, transport))
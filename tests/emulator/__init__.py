@@ -0,0 +1 @@
+from tests.emulator.Emulator import CiscoEmulator, VirtualDevice, load_fixtures
@@ -0,0 +1,102 @@
+from unittest import TestCase
+from CiscoAutomationFramework.Parsers.DeviceFactsParser import DeviceFacts
+
+ios_show_version = """show version
+Cisco IOS Software, C2960X Software (C2960X-UNIVERSALK9-M), Version 15.2(7)E4, RELEASE SOFTWARE (fc2)
+Technical Support: http://www.cisco.com/techsupport
+ROM: Bootstrap program is C2960X boot loader
+BOOTLDR: C2960X Boot Loader (C2960X-HBOOT-M) Version 15.2(7r)E1, RELEASE SOFTWARE (fc1)
+
+Switch01 uptime is 5 days, 13 hours, 17 minutes
+System returned to ROM by power-on
+System image file is "flash:c2960x-universalk9-mz.152-7.E4.bin"
+
+cisco WS-C2960X-48FPD-L (APM86XXX) processor (revision D0) with 524288K bytes of memory.
+Processor board ID FOC1234X0YZ
+Model number                    : WS-C2960X-48FPD-L
+System serial number            : FOC1234X0AB
+Switch01#"""
+
+iosxe_show_version = """Cisco IOS XE Software, Version 16.09.04
+Cisco IOS Software [Fuji], Catalyst L3 Switch Software (CAT9K_IOSXE), Version 16.9.4, RELEASE SOFTWARE (fc2)
+router uptime is 1 year, 2 weeks
+System image file is "flash:packages.conf"
+cisco C9300-48P (X86) processor with 1419044K/6147K bytes of memory.
+Processor board ID FCW2222L0AB"""
+
+nxos_show_version = """Software
+  BIOS: version 07.68
+ NXOS: version 9.3(5)
+  NXOS image file is: bootflash:///nxos.9.3.5.bin
+
+Hardware
+  cisco Nexus9000 C93180YC-EX chassis
+  Processor Board ID FDO12345678
+
+  Device name: nexus01
+Kernel uptime is 12 day(s), 3 hour(s), 41 minute(s), 7 second(s)"""
+
+
+class DeviceFactsIOSTests(TestCase):
+
+    def setUp(self) -> None:
+        self.facts = DeviceFacts(ios_show_version.splitlines(), 'Switch01')
+
+    def test_version_is_the_ios_version_not_the_bootloader(self):
+        self.assertEqual('15.2(7)E4', self.facts.version)
+
+    def test_model_prefers_model_number(self):
+        self.assertEqual('WS-C2960X-48FPD-L', self.facts.model)
+
+    def test_serial_prefers_system_serial_number(self):
+        self.assertEqual('FOC1234X0AB', self.facts.serial)
+
+    def test_image(self):
+        self.assertEqual('flash:c2960x-universalk9-mz.152-7.E4.bin', self.facts.image)
+
+    def test_uptime_ignores_hostname_case(self):
+        self.assertEqual('5 days, 13 hours, 17 minutes', DeviceFacts(ios_show_version.splitlines(), 'switch01').uptime)
+
+    def test_as_dict(self):
+        self.assertEqual({'hostname': 'Switch01', 'version': '15.2(7)E4', 'model': 'WS-C2960X-48FPD-L',
+                          'serial': 'FOC1234X0AB', 'image': 'flash:c2960x-universalk9-mz.152-7.E4.bin',
+                          'uptime': '5 days, 13 hours, 17 minutes'}, self.facts.as_dict())
+
+
+class DeviceFactsIOSXETests(TestCase):
+
+    def setUp(self) -> None:
+        self.facts = DeviceFacts(iosxe_show_version.splitlines(), 'router')
+
+    def test_version(self):
+        self.assertEqual('16.09.04', self.facts.version)
+
+    def test_model_from_processor_line(self):
+        self.assertEqual('C9300-48P', self.facts.model)
+
+    def test_serial_from_processor_board_id(self):
+        self.assertEqual('FCW2222L0AB', self.facts.serial)
+
+
+class DeviceFactsNXOSTests(TestCase):
+
+    def setUp(self) -> None:
+        self.facts = DeviceFacts(nxos_show_version.splitlines(), 'nexus01')
+
+    def test_version_is_not_the_bios_version(self):
+        self.assertEqual('9.3(5)', self.facts.version)
+
+    def test_model_from_chassis_line(self):
+        self.assertEqual('Nexus9000 C93180YC-EX', self.facts.model)
+
+    def test_serial(self):
+        self.assertEqual('FDO12345678', self.facts.serial)
+
+    def test_image(self):
+        self.assertEqual('bootflash:///nxos.9.3.5.bin', self.facts.image)
+
+    def test_uptime_from_kernel_line(self):
+        self.assertEqual('12 day(s), 3 hour(s), 41 minute(s), 7 second(s)', self.facts.uptime)
+
+    def test_missing_facts_are_none(self):
+        self.assertIsNone(DeviceFacts(['nothing useful']).serial)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+from CiscoAutomationFramework.Parsers.InterfaceBriefParser import InterfaceBriefParser
+
+ios_output = """show ip interface brief
+Interface              IP-Address      OK? Method Status                Protocol
+GigabitEthernet1/0/1   unassigned      YES unset  up                    up
+GigabitEthernet1/0/2   unassigned      YES unset  administratively down down
+Vlan1                  10.0.0.2        YES NVRAM  up                    up
+switch#"""
+
+nxos_output = """show interface brief
+
+--------------------------------------------------------------------------------
+Port   VRF          Status IP Address                              Speed    MTU
+--------------------------------------------------------------------------------
+mgmt0  --           up     10.0.0.5                                1000     1500
+
+--------------------------------------------------------------------------------
+Ethernet      VLAN    Type Mode   Status  Reason                   Speed     Port
+Interface                                                                    Ch #
+--------------------------------------------------------------------------------
+Eth1/1        1       eth  access up      none                       10G(D) 10
+Eth1/2        1       eth  access down    Link not connected         auto(D) --
+
+--------------------------------------------------------------------------------
+Port-channel VLAN    Type Mode   Status  Reason                    Speed   Protocol
+Interface
+--------------------------------------------------------------------------------
+Po10         1       eth  trunk  up      none                       a-10G(D)  lacp
+nexus#"""
+
+
+class InterfaceBriefParserTests(TestCase):
+
+    def test_ios_interface_names(self):
+        self.assertEqual(['GigabitEthernet1/0/1', 'GigabitEthernet1/0/2', 'Vlan1'],
+                         InterfaceBriefParser(ios_output).interface_names)
+
+    def test_nxos_sections_and_abbreviations(self):
+        self.assertEqual(['mgmt0', 'Ethernet1/1', 'Ethernet1/2', 'port-channel10'],
+                         InterfaceBriefParser(nxos_output.splitlines()).interface_names)
+
+    def test_rows_skip_headers_command_and_prompt(self):
+        rows = InterfaceBriefParser(ios_output).rows
+        self.assertEqual(3, len(rows))
+        self.assertTrue(rows[1].startswith('GigabitEthernet1/0/2'))
+
+    def test_expand_leaves_full_names(self):
+        self.assertEqual('Ethernet1/1', InterfaceBriefParser.expand('Ethernet1/1'))
+        self.assertEqual('loopback0', InterfaceBriefParser.expand('Lo0'))
+        self.assertEqual('Vlan1', InterfaceBriefParser.expand('Vlan1'))
@@ -1,4 +1,9 @@
-from CiscoAutomationFramework.TransportEngines import BaseEngine, ReadOnlySSHEngine
+from CiscoAutomationFramework.TransportEngines import BaseEngine, SSHEngine, ReadOnlySSHEngine
+from threading import Thread
+from select import select
+from queue import Queue
+from time import perf_counter, sleep
+import socket
 
 
 class _CannedShell:
@@ -93,3 +98,88 @@ class WillTriggerTimeout(BaseTestableGetOutput):
 
 
 
+
+
+class _DelayedSocketShell:
+    """
+    Stands in for a paramiko channel. Every time something is sent, the next canned response is written to a
+    socket pair after a delay, simulating the round trip to a device. Because it is backed by a real socket it
+    can be waited on with select just like a paramiko channel.
+    """
+
+    def __init__(self, responses, delay):
+        self.responses = list(responses)
+        self.delay = delay
+        self._reader, self._writer = socket.socketpair()
+        self._pending = Queue()
+        Thread(target=self._deliver, daemon=True).start()
+
+    def _deliver(self):
+        # responses are written in the order they were asked for, each one a delay after it was asked for
+        while True:
+            due, data = self._pending.get()
+            if data is None:
+                self._writer.close()
+                return
+            sleep(max(0, due - perf_counter()))
+            try:
+                self._writer.sendall(data)
+            except OSError:
+                return
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def recv_ready(self):
+        return bool(select([self._reader], [], [], 0)[0])
+
+    def recv(self, buffer_size):
+        return self._reader.recv(buffer_size)
+
+    def recv_into(self, buffer):
+        return self._reader.recv_into(buffer)
+
+    def send(self, data):
+        if self.responses:
+            self._pending.put((perf_counter() + self.delay, self.responses.pop(0).encode('utf-8')))
+
+    def close(self):
+        self._pending.put((0, None))
+        self._reader.close()
+
+
+class DelayedResponseSSHEngine(SSHEngine):
+
+    def __init__(self, responses, delay, hostname='myhostname', prompt='myhostname#'):
+        super().__init__()
+        self.hostname = hostname
+        self.prompt = prompt
+        self._pre_jumphost_hostname = hostname
+        self.shell = _DelayedSocketShell(responses, delay)
+
+    def close_connection(self):
+        self.shell.close()
+
+
+class _ChunkedBytesShell:
+    """Stands in for a paramiko channel, returns the canned byte chunks one per recv call"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def recv_ready(self):
+        return len(self.chunks) > 0
+
+    def recv(self, buffer_size):
+        return self.chunks.pop(0)
+
+    def send(self, data):
+        pass
+
+
+class ChunkedBytesSSHEngine(SSHEngine):
+
+    def __init__(self, chunks, hostname='myhostname'):
+        super().__init__()
+        self.hostname = hostname
+        self.shell = _ChunkedBytesShell(chunks)
@@ -0,0 +1,58 @@
+from unittest import TestCase
+from CiscoAutomationFramework.TransportEngines import AdaptiveTiming
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine
+from time import perf_counter
+
+
+class TestAdaptiveTiming(TestCase):
+
+    def test_does_not_change_timeout_before_warmup(self):
+        timing = AdaptiveTiming(warmup=3)
+        timing.record(.01, .01)
+        self.assertEqual(1, timing.idle_timeout(1))
+
+    def test_shrinks_timeout_after_warmup(self):
+        timing = AdaptiveTiming(warmup=2, multiplier=4, floor=.01)
+        timing.record(.02, .01)
+        timing.record(.01, .03)
+        self.assertAlmostEqual(.12, timing.idle_timeout(1))
+
+    def test_never_goes_below_floor(self):
+        timing = AdaptiveTiming(warmup=1, floor=.2)
+        timing.record(.001, 0)
+        self.assertEqual(.2, timing.idle_timeout(1))
+
+    def test_leaves_intentionally_long_timeouts_alone(self):
+        timing = AdaptiveTiming(warmup=1)
+        timing.record(.01, .01)
+        self.assertEqual(15, timing.idle_timeout(15))
+
+
+class TestAdaptiveTimingInEngine(TestCase):
+
+    def setUp(self):
+        responses = [f'show command {x}\nline of output\nmyhostname#' for x in range(4)]
+        self.engine = DelayedResponseSSHEngine(responses, .02)
+        self.engine.adaptive_timing = AdaptiveTiming(warmup=3, floor=.05)
+
+    def tearDown(self):
+        self.engine.close_connection()
+
+    def test_skips_delay_before_reading_output(self):
+        start = perf_counter()
+        output = self.engine.send_command_get_output('show command 0')
+        self.assertLess(perf_counter() - start, .5)
+        self.assertEqual(['show command 0', 'line of output', 'myhostname#'], output)
+        self.assertEqual(.5, self.engine.adaptive_timing.delay_skipped)
+
+    def test_learns_round_trip(self):
+        for x in range(3):
+            self.engine.send_command_get_output(f'show command {x}')
+        self.assertTrue(self.engine.adaptive_timing.learned)
+        self.assertGreaterEqual(self.engine.adaptive_timing.round_trip, .02)
+        self.assertLess(self.engine.adaptive_timing.learned_timeout, 1)
+
+    def test_does_not_learn_from_commands_that_time_out(self):
+        self.engine.shell.responses = ['Password: ']
+        self.engine.send_command_get_output('enable', timeout=.1)
+        self.assertEqual(0, self.engine.adaptive_timing.samples)
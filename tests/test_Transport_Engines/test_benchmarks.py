@@ -0,0 +1,72 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine, IdealNoDelayGetOutput
+from time import perf_counter
+
+
+class TestWaitModeBenchmark(TestCase):
+    """
+    Compares the time it takes to pick up output from a device that answers every command after a fixed
+    round trip using the sleep based polling loop vs blocking on the channel with select
+    """
+
+    commands = 10
+    round_trip = .02
+
+    def run_commands(self, wait_mode):
+        responses = [f'show command {x}\nline of output\nmyhostname#' for x in range(self.commands)]
+        engine = DelayedResponseSSHEngine(responses, self.round_trip)
+        engine.wait_mode = wait_mode
+        outputs = []
+        start = perf_counter()
+        for x in range(self.commands):
+            engine.send_command(f'show command {x}')
+            outputs.append(engine.get_output())
+        elapsed = perf_counter() - start
+        engine.close_connection()
+        return elapsed, outputs
+
+    def test_select_returns_same_output_as_polling(self):
+        _, polled = self.run_commands('poll')
+        _, selected = self.run_commands('select')
+        self.assertEqual(polled, selected)
+
+    def test_select_is_faster_than_polling(self):
+        poll_elapsed, _ = self.run_commands('poll')
+        select_elapsed, _ = self.run_commands('select')
+        self.assertLess(select_elapsed, poll_elapsed)
+
+    def test_select_overhead_is_close_to_round_trip(self):
+        select_elapsed, _ = self.run_commands('select')
+        # allow generous scheduling slack, polling alone would add up to 100ms per command
+        self.assertLess(select_elapsed, self.commands * (self.round_trip + .05))
+
+
+class TestLargeOutputBenchmark(TestCase):
+    """
+    Feeds multi megabyte canned output through get_output, the time it takes should grow linearly with the size
+    of the output
+    """
+
+    line = 'ip access-list extended MY-LIST permit tcp any host 10.1.1.1 eq 443\n'
+
+    def canned_output(self, megabytes):
+        lines = (megabytes * 1024 * 1024) // len(self.line)
+        return f'show running-config\n{self.line * lines}myhostname#'
+
+    def time_get_output(self, response):
+        ssh = IdealNoDelayGetOutput()
+        ssh.load_canned_response(response)
+        start = perf_counter()
+        data = ssh.get_output(buffer_size=4096)
+        return perf_counter() - start, data
+
+    def test_returns_all_output(self):
+        response = self.canned_output(1)
+        _, data = self.time_get_output(response)
+        self.assertEqual(response.splitlines(), data)
+
+    def test_time_grows_linearly_with_output_size(self):
+        small_elapsed, _ = self.time_get_output(self.canned_output(1))
+        large_elapsed, _ = self.time_get_output(self.canned_output(8))
+        # 8x the output should cost roughly 8x the time, quadratic behavior would be closer to 64x
+        self.assertLess(large_elapsed, small_elapsed * 24)
@@ -0,0 +1,48 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine
+from CiscoAutomationFramework.TransportEngines import CommandRecord
+
+
+class TestCommandRecords(TestCase):
+
+    def setUp(self):
+        responses = ['show clock\r\n10:00:00 UTC\r\nmyhostname#', 'show version\r\nCisco IOS\r\nmyhostname#']
+        self.engine = DelayedResponseSSHEngine(responses, .05)
+
+    def tearDown(self):
+        self.engine.close_connection()
+
+    def test_records_command_timings(self):
+        self.engine.send_command_get_output('show clock', delay=.1)
+        record = self.engine.command_records[0]
+        self.assertEqual('show clock', record.command)
+        self.assertEqual(len('show clock\r\n10:00:00 UTC\r\nmyhostname#'), record.bytes_received)
+        self.assertEqual(1, record.chunks)
+        self.assertAlmostEqual(.1, record.sleep_time)
+        self.assertGreaterEqual(record.time_to_first_byte, .05)
+        self.assertGreaterEqual(record.total_time, record.time_to_first_byte)
+        self.assertFalse(record.timed_out)
+        self.assertEqual('myhostname#', record.prompt)
+
+    def test_records_each_pipelined_command(self):
+        self.engine.send_commands_get_outputs(['show clock', 'show version'], delay=0)
+        self.assertEqual(['show clock', 'show version'], [record.command for record in self.engine.command_records])
+        self.assertEqual(['myhostname#', 'myhostname#'], [record.prompt for record in self.engine.command_records])
+        self.assertEqual(0, self.engine.command_records[0].sleep_time)
+
+    def test_records_timeout(self):
+        engine = DelayedResponseSSHEngine(['show clock\r\nno prompt'], 0)
+        engine.send_command_get_output('show clock', timeout=.2, delay=0)
+        engine.close_connection()
+        record = engine.command_records[0]
+        self.assertTrue(record.timed_out)
+        self.assertIsNone(record.prompt)
+        self.assertGreaterEqual(record.wait_time, .15)
+
+    def test_streams_records_to_callback(self):
+        streamed = []
+        self.engine.command_record_callback = streamed.append
+        self.engine.send_command_get_output('show clock', delay=0)
+        self.assertEqual(1, len(streamed))
+        self.assertIsInstance(streamed[0], CommandRecord)
+        self.assertEqual('show clock', streamed[0].as_dict()['command'])
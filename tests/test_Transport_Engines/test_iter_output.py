@@ -0,0 +1,41 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import ChunkedBytesSSHEngine, DelayedResponseSSHEngine
+from CiscoAutomationFramework.util import indented_text_to_tree
+from types import GeneratorType
+
+
+class TestIterOutput(TestCase):
+
+    def test_yields_same_lines_as_get_output(self):
+        chunks = [b'show run\r\nline ', b'one\r', b'\nline two\r\n', b'myhostname#']
+        expected = ChunkedBytesSSHEngine(chunks).get_output(no_command_sent_previous=True, timeout=.1)
+        lines = list(ChunkedBytesSSHEngine(chunks).iter_output(no_command_sent_previous=True, timeout=.1))
+        self.assertEqual(expected, lines)
+
+    def test_line_split_over_many_chunks(self):
+        chunks = [b'show run\r\n'] + [b'x' * 10] * 50 + [b'\r', b'next\r', b'\nmyhostname#']
+        lines = list(ChunkedBytesSSHEngine(chunks).iter_output(no_command_sent_previous=True, timeout=.1))
+        self.assertEqual(['show run', 'x' * 500, 'next', 'myhostname#'], lines)
+
+    def test_is_a_generator(self):
+        engine = ChunkedBytesSSHEngine([b'myhostname#'])
+        self.assertIsInstance(engine.iter_output(no_command_sent_previous=True), GeneratorType)
+
+    def test_yields_lines_before_output_is_complete(self):
+        engine = ChunkedBytesSSHEngine([b'show run\nfirst line\n', b'second line\nmyhostname#'])
+        lines = engine.iter_output(no_command_sent_previous=True, timeout=.1)
+        self.assertEqual('show run', next(lines))
+        self.assertEqual('first line', next(lines))
+        # the second chunk has not been read from the device yet
+        self.assertEqual(1, len(engine.shell.chunks))
+
+    def test_updates_prompt(self):
+        engine = ChunkedBytesSSHEngine([b'config t\nmyhostname(config)#\r\n'])
+        list(engine.iter_output(no_command_sent_previous=True, timeout=.1))
+        self.assertEqual('myhostname(config)#', engine.prompt)
+
+    def test_output_can_be_consumed_by_tree_parser(self):
+        engine = DelayedResponseSSHEngine(['show run\ninterface Gi1\n description uplink\nmyhostname#'], 0)
+        tree = indented_text_to_tree(engine.send_command_iter_lines('show run', delay=0))
+        engine.close_connection()
+        self.assertIn('description uplink', tree['interface Gi1'])
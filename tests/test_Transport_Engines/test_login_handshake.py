@@ -0,0 +1,109 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine, ChunkedBytesSSHEngine
+from CiscoAutomationFramework.TransportEngines import LoginHandshake
+from CiscoAutomationFramework.Exceptions import AuthenticationException, LoginError
+from time import perf_counter
+
+banner = '\r\n##########################\r\n# Authorized access only #\r\n##########################\r\n'
+
+
+class TestLoginHandshake(TestCase):
+
+    def test_finds_prompt(self):
+        handshake = LoginHandshake()
+        self.assertIsNone(handshake.feed('\r\nmyhostname#'))
+        self.assertEqual('myhostname#', handshake.prompt)
+        self.assertEqual('myhostname', handshake.hostname)
+
+    def test_finds_user_exec_prompt(self):
+        handshake = LoginHandshake()
+        handshake.feed('\r\nmyhostname>')
+        self.assertEqual('myhostname>', handshake.prompt)
+
+    def test_reads_through_banner(self):
+        handshake = LoginHandshake()
+        handshake.feed(banner[:30])
+        self.assertIsNone(handshake.prompt)
+        handshake.feed(banner[30:])
+        self.assertIsNone(handshake.prompt)
+        handshake.feed('myhostname#')
+        self.assertEqual('myhostname#', handshake.prompt)
+
+    def test_prompt_split_across_chunks(self):
+        handshake = LoginHandshake()
+        handshake.feed('\r\nmyhost')
+        handshake.feed('name#')
+        self.assertEqual('myhostname#', handshake.prompt)
+
+    def test_answers_username_and_password_prompts(self):
+        handshake = LoginHandshake('user', 'pass')
+        self.assertEqual('user\n', handshake.feed('\r\nUsername: '))
+        self.assertEqual('pass\n', handshake.feed('user\r\nPassword: '))
+        handshake.feed('\r\nmyhostname#')
+        self.assertEqual('myhostname#', handshake.prompt)
+
+    def test_password_asked_twice_is_authentication_failure(self):
+        handshake = LoginHandshake('user', 'pass')
+        handshake.feed('Password: ')
+        with self.assertRaises(AuthenticationException):
+            handshake.feed('\r\nPassword: ')
+
+    def test_authorization_failed(self):
+        with self.assertRaises(AuthenticationException):
+            LoginHandshake().feed('\r\n% Authorization failed.\r\n')
+
+    def test_failure_after_password(self):
+        handshake = LoginHandshake('user', 'pass')
+        handshake.feed('Password: ')
+        handshake.feed('\r\nPermission ')
+        with self.assertRaises(AuthenticationException):
+            handshake.feed('denied, please try again.\r\n')
+
+    def test_banner_mentioning_failure_is_not_a_failure(self):
+        handshake = LoginHandshake('user', 'pass')
+        handshake.feed('\r\n# Unauthorized users get Permission denied #\r\n# or % Access denied #\r\n')
+        self.assertEqual('pass\n', handshake.feed('Password: '))
+        handshake.feed('\r\nmyhostname#')
+        self.assertEqual('myhostname#', handshake.prompt)
+
+    def test_pages_banner(self):
+        self.assertEqual(' ', LoginHandshake().feed('banner line\r\n --More-- '))
+
+    def test_limits_nudges(self):
+        handshake = LoginHandshake(max_nudges=2)
+        self.assertEqual('\n', handshake.quiet())
+        self.assertEqual('\n', handshake.quiet())
+        with self.assertRaises(LoginError):
+            handshake.quiet()
+
+    def test_no_nudges(self):
+        self.assertIsNone(LoginHandshake(max_nudges=0).quiet())
+
+
+class TestGetPromptAndHostname(TestCase):
+
+    def test_banner_then_prompt_without_round_trips(self):
+        engine = ChunkedBytesSSHEngine([banner.encode(), b'myhostname#'])
+        sent = []
+        engine.shell.send = sent.append
+        self.assertEqual(('myhostname#', 'myhostname'), engine._get_prompt_and_hostname(timeout=1))
+        self.assertEqual([], sent)
+
+    def test_nudges_quiet_device(self):
+        engine = DelayedResponseSSHEngine(['\r\nmyhostname#'], 0)
+        self.assertEqual(('myhostname#', 'myhostname'), engine._get_prompt_and_hostname(timeout=3))
+        engine.close_connection()
+
+    def test_times_out_at_deadline(self):
+        engine = DelayedResponseSSHEngine([], 0)
+        start = perf_counter()
+        with self.assertRaises(LoginError):
+            engine._get_prompt_and_hostname(timeout=.3)
+        engine.close_connection()
+        self.assertLess(perf_counter() - start, 1)
+
+    def test_gives_up_after_max_nudges(self):
+        engine = DelayedResponseSSHEngine(['still no prompt\r\n'] * 5, 0)
+        with self.assertRaises(LoginError):
+            engine._get_prompt_and_hostname(timeout=10, max_nudges=1)
+        engine.close_connection()
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine
+from CiscoAutomationFramework.TransportEngines import strip_pager_artifacts
+from time import perf_counter
+
+ios_erase = '\x08' * 9 + ' ' * 9 + '\x08' * 9
+
+
+class TestStripPagerArtifacts(TestCase):
+
+    def test_strips_ios_pager(self):
+        output = f'line 1\r\n --More-- {ios_erase}line 2\r\n --More-- {ios_erase} indented line 3\r\nmyhostname#'
+        self.assertEqual('line 1\r\nline 2\r\n indented line 3\r\nmyhostname#', strip_pager_artifacts(output))
+
+    def test_strips_nxos_pager(self):
+        output = 'line 1\r\n\x1b[7m--More--\x1b[m\r        \rline 2\r\nmyhostname#'
+        self.assertEqual('line 1\r\nline 2\r\nmyhostname#', strip_pager_artifacts(output))
+
+    def test_strips_asa_pager(self):
+        output = 'line 1\r\n<--- More --->\r              \rline 2\r\nmyhostname#'
+        self.assertEqual('line 1\r\nline 2\r\nmyhostname#', strip_pager_artifacts(output))
+
+    def test_leaves_output_without_pager_alone(self):
+        output = 'interface Gi1/0/1\r\n description more-or-less -- important\r\nmyhostname#'
+        self.assertEqual(output, strip_pager_artifacts(output))
+
+
+class TestSendCommandGetTruncatedOutput(TestCase):
+
+    def paged_engine(self, pages):
+        responses = [f'show version\r\npage 0\r\n --More-- ']
+        responses += [f'{ios_erase}page {x}\r\n --More-- ' for x in range(1, pages - 1)]
+        responses += [f'{ios_erase}page {pages - 1}\r\nmyhostname#']
+        return DelayedResponseSSHEngine(responses, 0)
+
+    def test_pages_through_output(self):
+        engine = self.paged_engine(3)
+        output = engine.send_command_get_truncated_output('show version')
+        engine.close_connection()
+        self.assertEqual(['show version', 'page 0', 'page 1', 'page 2', 'myhostname#'], output)
+
+    def test_prompt_alone_on_last_page(self):
+        engine = DelayedResponseSSHEngine(['show version\r\npage 0\r\n --More-- ', f'{ios_erase}myhostname#'], 0)
+        start = perf_counter()
+        output = engine.send_command_get_truncated_output('show version', timeout=1)
+        elapsed = perf_counter() - start
+        engine.close_connection()
+        self.assertEqual(['show version', 'page 0', 'myhostname#'], output)
+        self.assertEqual('myhostname#', engine.prompt)
+        self.assertFalse(engine.command_records[-1].timed_out)
+        self.assertLess(elapsed, .5)
+
+    def test_prompt_after_erase_split_between_reads(self):
+        engine = DelayedResponseSSHEngine(['show version\r\npage 0\r\n --More-- ', ios_erase[:12],
+                                           f'{ios_erase[12:]}myhostname#'], 0)
+        output = engine.send_command_get_truncated_output('show version', timeout=1)
+        engine.close_connection()
+        self.assertEqual('myhostname#', output[-1])
+        self.assertFalse(engine.command_records[-1].timed_out)
+
+    def test_does_not_wait_a_timeout_per_page(self):
+        pages = 500
+        engine = self.paged_engine(pages)
+        start = perf_counter()
+        output = engine.send_command_get_truncated_output('show version')
+        elapsed = perf_counter() - start
+        engine.close_connection()
+        self.assertEqual(pages + 2, len(output))
+        # waiting .1 seconds on every page would take 50 seconds
+        self.assertLess(elapsed, 5)
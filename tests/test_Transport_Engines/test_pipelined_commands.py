@@ -0,0 +1,35 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import DelayedResponseSSHEngine
+from time import perf_counter
+
+
+class TestSendCommandsGetOutputs(TestCase):
+
+    def setUp(self):
+        self.commands = [f'show command {x}' for x in range(5)]
+        responses = [f'{command}\r\noutput of {command}\r\nmyhostname#' for command in self.commands]
+        self.engine = DelayedResponseSSHEngine(responses, .1)
+
+    def tearDown(self):
+        self.engine.close_connection()
+
+    def test_returns_output_of_each_command(self):
+        outputs = self.engine.send_commands_get_outputs(self.commands, delay=0)
+        expected = [[command, f'output of {command}', 'myhostname#'] for command in self.commands]
+        self.assertEqual(expected, outputs)
+
+    def test_costs_roughly_one_round_trip(self):
+        start = perf_counter()
+        self.engine.send_commands_get_outputs(self.commands, delay=0)
+        # sequentially this would take at least 5 round trips
+        self.assertLess(perf_counter() - start, .1 * 3)
+
+    def test_tracks_all_commands_sent(self):
+        self.engine.send_commands_get_outputs(self.commands, delay=0)
+        self.assertEqual(self.commands, self.engine.all_commands_sent)
+        self.assertEqual(0, self.engine.commands_sent_since_last_output_get)
+
+    def test_updates_prompt(self):
+        self.engine.prompt = None
+        self.engine.send_commands_get_outputs(self.commands, delay=0)
+        self.assertEqual('myhostname#', self.engine.prompt)
@@ -0,0 +1,85 @@
+from unittest import TestCase
+from CiscoAutomationFramework.TransportEngines import PromptMatcher
+
+
+class TestPromptMatcher(TestCase):
+
+    def setUp(self):
+        self.matcher = PromptMatcher('myhostname')
+
+    def test_matches_priv_exec_prompt(self):
+        self.assertTrue(self.matcher.feed('show clock\n10:00:00 UTC\nmyhostname#'))
+
+    def test_matches_config_mode_prompt(self):
+        self.assertTrue(self.matcher.feed('interface Gi1/0/1\nmyhostname(config-if)#'))
+
+    def test_matches_prompt_followed_by_new_line(self):
+        self.assertTrue(self.matcher.feed('enable\nmyhostname#\n'))
+
+    def test_does_not_match_output_starting_with_hostname(self):
+        self.assertFalse(self.matcher.feed('show version\nmyhostname uptime is 5 days #1\n'))
+
+    def test_matches_prompt_split_across_chunks(self):
+        self.assertFalse(self.matcher.feed('show clock\nmyhos'))
+        self.assertTrue(self.matcher.feed('tname#'))
+
+    def test_only_keeps_last_line(self):
+        self.matcher.feed('line\n' * 1000 + 'myhostname#')
+        self.assertEqual('myhostname#', self.matcher.last_line)
+
+    def test_only_keeps_end_of_long_line(self):
+        for _ in range(1000):
+            self.matcher.feed('x' * 100)
+        self.assertLessEqual(len(self.matcher.last_line), self.matcher.max_prompt_length)
+        self.assertTrue(self.matcher.feed('\nmyhostname#'))
+        self.assertEqual(1, self.matcher.prompt_count)
+
+    def test_finds_pager_at_end_of_long_line(self):
+        self.matcher.feed('x' * 500)
+        self.matcher.feed(' --More-- ')
+        self.assertTrue(self.matcher.last_line.endswith(' --More-- '))
+
+    def test_counts_prompt_followed_by_long_echo(self):
+        self.matcher.feed('myhostname#' + 'show ' * 100)
+        self.assertEqual(1, self.matcher.prompt_count)
+        self.matcher.feed('\nout\nmyhostname#')
+        self.assertEqual(2, self.matcher.prompt_count)
+
+    def test_line_not_starting_with_hostname_is_not_a_prompt(self):
+        self.assertFalse(self.matcher.feed('xmyhostname#'))
+
+    def test_escapes_hostname(self):
+        matcher = PromptMatcher('my.host')
+        self.assertFalse(matcher.feed('myXhost#'))
+
+    def test_counts_prompts_in_stream(self):
+        self.matcher.feed('show a\nout a\nmyhostname#show b\nout b\nmyho')
+        self.assertEqual(1, self.matcher.prompt_count)
+        self.matcher.feed('stname#')
+        self.assertEqual(2, self.matcher.prompt_count)
+
+    def test_does_not_count_prompt_twice_when_it_becomes_complete(self):
+        self.matcher.feed('myhostname#')
+        self.matcher.feed('show b\n')
+        self.matcher.feed('out b\n')
+        self.assertEqual(1, self.matcher.prompt_count)
+
+
+class TestSplittingOutput(TestCase):
+
+    def setUp(self):
+        self.matcher = PromptMatcher('myhostname')
+
+    def test_splits_on_prompt_and_keeps_echo_of_next_command(self):
+        output = 'show a\nout a\nmyhostname#show b\nout b\nmyhostname#'
+        expected = [['show a', 'out a', 'myhostname#'], ['show b', 'out b', 'myhostname#']]
+        self.assertEqual(expected, self.matcher.split(output, 2))
+
+    def test_splits_when_echo_is_on_its_own_line(self):
+        output = 'show a\r\nout a\r\nmyhostname#\r\nshow b\r\nout b\r\nmyhostname#'
+        expected = [['show a', 'out a', 'myhostname#'], ['show b', 'out b', 'myhostname#']]
+        self.assertEqual(expected, self.matcher.split(output, 2))
+
+    def test_does_not_split_more_than_number_of_commands(self):
+        output = 'show a\nmyhostname#\nmyhostname#'
+        self.assertEqual([['show a', 'myhostname#', 'myhostname#']], self.matcher.split(output, 1))
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from tests.test_Transport_Engines.Engines import ChunkedBytesSSHEngine, DelayedResponseSSHEngine
+
+
+class TestIncrementalDecoding(TestCase):
+
+    def test_decodes_multibyte_character_split_between_reads(self):
+        encoded = 'banner – ünïcode\nmyhostname#'.encode('utf-8')
+        split_at = encoded.index('–'.encode('utf-8')) + 1
+        engine = ChunkedBytesSSHEngine([encoded[:split_at], encoded[split_at:]])
+        self.assertEqual('banner – ünïcode\nmyhostname#', engine.get_raw_output(no_command_sent_previous=True, timeout=.1))
+
+    def test_replaces_undecodable_bytes(self):
+        engine = ChunkedBytesSSHEngine([b'bad \xff byte\nmyhostname#'])
+        self.assertEqual(['bad � byte', 'myhostname#'], engine.get_output(no_command_sent_previous=True, timeout=.1))
+
+    def test_raw_output_is_not_split_into_lines(self):
+        engine = ChunkedBytesSSHEngine([b'show clock\r\n', b'10:00:00\r\nmyhostname#'])
+        self.assertEqual('show clock\r\n10:00:00\r\nmyhostname#', engine.get_raw_output(no_command_sent_previous=True, timeout=.1))
+
+
+class TestReusableReceiveBuffer(TestCase):
+
+    def test_reads_into_the_same_buffer(self):
+        engine = DelayedResponseSSHEngine(['show clock\n10:00:00\nmyhostname#'], 0)
+        buffer = engine._recv_buffer
+        engine.send_command('show clock')
+        self.assertEqual(['show clock', '10:00:00', 'myhostname#'], engine.get_output())
+        self.assertIs(buffer, engine._recv_buffer)
+        engine.close_connection()
+
+    def test_grows_buffer_for_larger_reads(self):
+        engine = DelayedResponseSSHEngine(['x' * 5000 + '\nmyhostname#'], 0)
+        engine.send_command('show clock')
+        output = engine.get_output(buffer_size=8192)
+        self.assertEqual('x' * 5000, output[0])
+        self.assertEqual(8192, len(engine._recv_buffer))
+        engine.close_connection()
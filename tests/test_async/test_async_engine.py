@@ -0,0 +1,103 @@
+from unittest import IsolatedAsyncioTestCase
+from CiscoAutomationFramework import async_connect_ssh
+from CiscoAutomationFramework.AsyncFirmware import AsyncIOS, AsyncNXOS
+from CiscoAutomationFramework.Exceptions import EnablePasswordError
+from tests.emulator import CiscoEmulator, VirtualDevice
+import asyncio
+
+ios_responses = {
+    'show version': 'Cisco IOS Software, C2960X Software\r\nmyhostname uptime is 5 days, 13 hours, 17 minutes',
+    'show running-config': 'Building configuration...\r\n\r\nhostname myhostname\r\n!\r\nend\r\n',
+    'show interfaces': '\r\nGigabitEthernet1/0/1 is up\r\n  Hardware is Gigabit Ethernet\r\nVlan1 is up\r\n  MTU 1500\r\n',
+    'show clock': '10:00:00 UTC Mon Jan 1 2024',
+}
+
+
+class TestAsyncSSHEngine(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.emulator = CiscoEmulator().start()
+        self.port = self.emulator.add_device(VirtualDevice('myhostname', fixtures=ios_responses))
+
+    def tearDown(self):
+        self.emulator.stop()
+
+    async def connect(self):
+        return await async_connect_ssh('127.0.0.1', 'user', 'pass', port=self.port)
+
+    async def test_discovers_prompt_and_hostname(self):
+        ssh = await self.connect()
+        self.assertEqual('myhostname#', ssh.prompt)
+        self.assertEqual('myhostname', ssh.hostname)
+        await ssh.close_connection()
+
+    async def test_detects_firmware(self):
+        async with await self.connect() as ssh:
+            self.assertIsInstance(ssh, AsyncIOS)
+
+    async def test_gets_command_output(self):
+        async with await self.connect() as ssh:
+            output = await ssh.send_command_get_output('show clock')
+        self.assertEqual(['show clock', '10:00:00 UTC Mon Jan 1 2024', 'myhostname#'], output)
+
+    async def test_gets_pipelined_command_output(self):
+        async with await self.connect() as ssh:
+            outputs = await ssh.send_commands_get_outputs(['show clock', 'show clock'])
+        self.assertEqual(2, len(outputs))
+        self.assertEqual('10:00:00 UTC Mon Jan 1 2024', outputs[1][1])
+
+    async def test_gets_running_config(self):
+        async with await self.connect() as ssh:
+            config = await ssh.running_config()
+        self.assertTrue(config.startswith('hostname myhostname'))
+        self.assertNotIn('myhostname#', config)
+
+    async def test_gets_interfaces(self):
+        async with await self.connect() as ssh:
+            self.assertEqual(['GigabitEthernet1/0/1', 'Vlan1'], await ssh.interfaces())
+
+    async def test_gets_uptime(self):
+        async with await self.connect() as ssh:
+            self.assertEqual('5 days, 13 hours, 17 minutes', await ssh.uptime())
+
+    async def test_drives_many_sessions_from_one_loop(self):
+        sessions = await asyncio.gather(*[self.connect() for _ in range(10)])
+        outputs = await asyncio.gather(*[ssh.send_command_get_output('show clock') for ssh in sessions])
+        await asyncio.gather(*[ssh.close_connection() for ssh in sessions])
+        self.assertTrue(all(output[1] == '10:00:00 UTC Mon Jan 1 2024' for output in outputs))
+
+
+class TestAsyncFirmwareSelection(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.emulator = CiscoEmulator().start()
+        self.nexus = self.emulator.add_device(VirtualDevice('myhostname', 'NXOS'))
+        self.enable = self.emulator.add_device(VirtualDevice('myhostname', fixtures=ios_responses,
+                                                             enable_password='secret'))
+
+    def tearDown(self):
+        self.emulator.stop()
+
+    async def test_detects_nexus(self):
+        async with await async_connect_ssh('127.0.0.1', 'user', 'pass', port=self.nexus) as ssh:
+            self.assertIsInstance(ssh, AsyncNXOS)
+            self.assertTrue(ssh.is_nexus)
+
+    async def test_raises_exception_if_no_enable_password(self):
+        async with await async_connect_ssh('127.0.0.1', 'user', 'pass', port=self.enable) as ssh:
+            with self.assertRaises(EnablePasswordError):
+                await ssh.cli_to_privileged_exec_mode()
+
+    async def test_enters_enable_mode_without_password_prompt(self):
+        async with await async_connect_ssh('127.0.0.1', 'user', 'pass', port=self.nexus) as ssh:
+            await ssh.send_command_get_output('disable')
+            self.assertEqual('myhostname>', ssh.prompt)
+            self.assertIs(True, await ssh.cli_to_privileged_exec_mode())
+            self.assertEqual('myhostname#', ssh.prompt)
+
+    async def test_enters_enable_mode_with_enable_password(self):
+        async with await async_connect_ssh('127.0.0.1', 'user', 'pass', port=self.enable,
+                                           enable_password='secret') as ssh:
+            self.assertEqual('myhostname>', ssh.prompt)
+            self.assertTrue(await ssh.cli_to_privileged_exec_mode())
+            self.assertEqual('myhostname#', ssh.prompt)
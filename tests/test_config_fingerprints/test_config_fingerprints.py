@@ -0,0 +1,86 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh, ConfigFingerprintStore
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+import os
+
+
+class TestConfigFingerprintStore(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'fingerprints.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persists_across_instances(self):
+        with ConfigFingerprintStore(self.path) as fingerprints:
+            self.assertTrue(fingerprints.set('switch', '! Last configuration change at 1', 'hostname switch'))
+        fingerprints = ConfigFingerprintStore(self.path)
+        self.assertTrue(fingerprints.unchanged('switch', '! Last configuration change at 1'))
+        self.assertFalse(fingerprints.unchanged('switch', '! Last configuration change at 2'))
+
+    def test_set_reports_whether_content_changed(self):
+        fingerprints = ConfigFingerprintStore(self.path)
+        fingerprints.set('switch', 'a', 'hostname switch')
+        self.assertFalse(fingerprints.set('switch', 'b', 'hostname switch'))
+        self.assertTrue(fingerprints.set('switch', 'c', 'hostname other'))
+
+    def test_missing_signal_is_never_unchanged(self):
+        fingerprints = ConfigFingerprintStore(self.path)
+        fingerprints.set('switch', None, 'hostname switch')
+        self.assertFalse(fingerprints.unchanged('switch', None))
+
+
+class TestRunningConfigIfChanged(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.fingerprints = ConfigFingerprintStore(os.path.join(self.directory.name, 'fingerprints.json'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_backup(self, port):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=port) as ssh:
+            return ssh.running_config_if_changed(self.fingerprints), ssh.commands_sent
+
+    def assert_fetches_only_after_a_change(self, device):
+        port = self.emulator.add_device(device)
+        running_config, _ = self.run_backup(port)
+        self.assertIn(f'hostname {device.hostname}', running_config)
+
+        running_config, commands_sent = self.run_backup(port)
+        self.assertIsNone(running_config)
+        self.assertNotIn('show running-config', commands_sent)
+
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=port) as ssh:
+            ssh.push_config(['interface Vlan1', ' description changed'])
+        running_config, _ = self.run_backup(port)
+        self.assertIn(device.last_change, running_config)
+
+    def test_ios(self):
+        self.assert_fetches_only_after_a_change(VirtualDevice('fingerprint-ios'))
+
+    def test_nxos(self):
+        self.assert_fetches_only_after_a_change(VirtualDevice('fingerprint-nexus', 'NXOS'))
+
+    def test_devices_with_the_same_hostname_are_kept_apart(self):
+        ports = [self.emulator.add_device(VirtualDevice('same-hostname')) for _ in range(2)]
+        self.assertIsNotNone(self.run_backup(ports[0])[0])
+        self.assertIsNotNone(self.run_backup(ports[1])[0])
+        self.assertIsNotNone(self.fingerprints.get(f'127.0.0.1:{ports[0]}'))
+        self.assertIsNone(self.fingerprints.get('same-hostname'))
+
+    def test_signal(self):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.emulator.add_device(VirtualDevice('signal'))) as ssh:
+            self.assertEqual('! Last configuration change at 10:00:00 UTC Mon Jan 1 2024', ssh.config_change_signal)
@@ -0,0 +1,127 @@
+from unittest import TestCase
+from CiscoAutomationFramework.ConnectionPool import ConnectionPool
+from CiscoAutomationFramework.Exceptions import PoolExhaustedError
+from CiscoAutomationFramework.TransportEngines import ReadOnlySSHEngine
+from CiscoAutomationFramework.ThreadLib import ReadOnlySSH, start_threads
+from tests.emulator import CiscoEmulator, VirtualDevice
+from time import sleep
+
+responses = {
+    'show version': 'Cisco IOS Software, C2960X Software',
+    'show clock': '10:00:00 UTC Mon Jan 1 2024',
+}
+
+
+class TestConnectionPool(TestCase):
+
+    def setUp(self):
+        self.emulator = CiscoEmulator().start()
+        self.device = VirtualDevice('myhostname', fixtures=responses)
+        self.port = self.emulator.add_device(self.device)
+        self.pool = ConnectionPool(max_per_host=2)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.emulator.stop()
+
+    def connection(self, **kwargs):
+        return self.pool.connection('127.0.0.1', 'user', 'pass', port=self.port, **kwargs)
+
+    def test_reuses_session(self):
+        with self.connection() as first:
+            pass
+        with self.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(1, len(self.device.transports))
+
+    def test_resets_cli_to_privileged_exec_on_checkout(self):
+        with self.connection() as ssh:
+            ssh.transport.prompt = 'myhostname(config)#'
+        with self.connection():
+            self.assertIn('end', self.device.commands_received)
+
+    def test_history_only_holds_commands_since_checkout(self):
+        with self.connection() as first:
+            first.send_command_get_output('show clock')
+            self.assertEqual(['show clock'], first.commands_sent)
+            commands_sent = first.commands_sent
+        with self.connection() as second:
+            self.assertIs(first, second)
+            self.assertEqual([], second.commands_sent)
+            self.assertEqual([], second.command_records)
+            second.send_command_get_output('show version')
+            self.assertEqual(['show version'], [record.command for record in second.command_records])
+        self.assertEqual(['show clock'], commands_sent)
+
+    def test_next_borrower_does_not_get_cached_output(self):
+        with self.connection() as first:
+            first.enable_output_cache()
+            first.show_command_get_output('show clock')
+            interfaces = first.interface_names
+        with self.connection() as second:
+            self.assertIsNone(second.output_cache.get('show clock'))
+            self.assertEqual(interfaces, second.interface_names)
+            self.assertIn(second.interface_inventory_command, second.commands_sent)
+
+    def test_opens_new_session_when_one_is_in_use(self):
+        with self.connection() as first:
+            with self.connection() as second:
+                self.assertIsNot(first, second)
+
+    def test_raises_when_max_per_host_in_use(self):
+        self.pool.checkout_timeout = .1
+        with self.connection(), self.connection():
+            with self.assertRaises(PoolExhaustedError):
+                self.pool.checkout('127.0.0.1', 'user', 'pass', port=self.port)
+
+    def test_replaces_dead_session(self):
+        with self.connection() as first:
+            pass
+        self.device.transports[0].close()
+        sleep(.2)
+        with self.connection() as second:
+            self.assertIsNot(first, second)
+            self.assertTrue(second.transport.is_alive)
+
+    def test_evicts_idle_sessions(self):
+        self.pool.idle_timeout = 0
+        with self.connection() as first:
+            pass
+        sleep(.01)
+        self.pool.evict_idle()
+        self.assertFalse(first.transport.is_alive)
+
+    def test_discards_session_on_exception(self):
+        with self.assertRaises(ValueError):
+            with self.connection() as first:
+                raise ValueError()
+        with self.connection() as second:
+            self.assertIsNot(first, second)
+
+    def test_does_not_share_sessions_between_engines(self):
+        with self.connection() as first:
+            pass
+        with self.connection(engine=ReadOnlySSHEngine) as second:
+            self.assertIsInstance(second.transport, ReadOnlySSHEngine)
+            self.assertIsNot(first, second)
+
+
+class GetClock(ReadOnlySSH):
+
+    def during_login(self, ssh):
+        self.clock = ssh.send_command_get_output('show clock', delay=0)[1]
+
+
+class TestThreadLibWithPool(TestCase):
+
+    def test_threads_reuse_pooled_sessions(self):
+        device = VirtualDevice('myhostname', fixtures=responses)
+        with CiscoEmulator() as emulator, ConnectionPool() as pool:
+            port = emulator.add_device(device)
+            for _ in range(2):
+                threads = start_threads(GetClock, ['127.0.0.1'], 'user', 'pass', wait_for_threads=True, pool=pool,
+                                        port=port)
+                self.assertEqual('10:00:00 UTC Mon Jan 1 2024', threads[0].clock)
+                self.assertEqual(['show clock'], threads[0].commands_sent)
+        self.assertEqual(1, len(device.transports))
@@ -0,0 +1,120 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.IOS import IOS
+from CiscoAutomationFramework.NXOS import NXOS
+from CiscoAutomationFramework.ThreadLib import SSH
+from tests.emulator import CiscoEmulator, VirtualDevice
+
+
+class TestEmulatedDevices(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.ios = cls.emulator.add_device(VirtualDevice('ios-switch'))
+        cls.nxos = cls.emulator.add_device(VirtualDevice('nexus-switch', 'NXOS'))
+        cls.enable = cls.emulator.add_device(VirtualDevice('enable-switch', enable_password='secret'))
+        cls.banner = cls.emulator.add_device(VirtualDevice('banner-switch', banner='#' * 40 + '\nNo access#\n' + '#' * 40))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def connect(self, port, **kwargs):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port, **kwargs)
+
+    def test_detects_ios(self):
+        with self.connect(self.ios) as ssh:
+            self.assertIsInstance(ssh, IOS)
+            self.assertEqual('ios-switch#', ssh.prompt)
+
+    def test_detects_nxos(self):
+        with self.connect(self.nxos) as ssh:
+            self.assertIsInstance(ssh, NXOS)
+            self.assertEqual('12 day(s), 3 hour(s), 41 minute(s), 7 second(s)', ssh.uptime)
+
+    def test_logs_in_past_banner(self):
+        with self.connect(self.banner) as ssh:
+            self.assertEqual('banner-switch#', ssh.prompt)
+
+    def test_facts_come_from_the_show_version_sent_to_detect_firmware(self):
+        with self.connect(self.ios) as ssh:
+            self.assertEqual('WS-C2960X-48FPD-L', ssh.model)
+            self.assertEqual('FOC1234X0YZ', ssh.serial)
+            self.assertEqual('15.2(7)E4', ssh.version)
+            self.assertEqual('5 days, 13 hours, 17 minutes', ssh.uptime)
+            self.assertEqual(1, ssh.commands_sent.count('show version'))
+            ssh.refresh_device_facts()
+            self.assertEqual(2, ssh.commands_sent.count('show version'))
+
+    def test_current_uptime_is_read_from_the_device(self):
+        with self.connect(self.ios) as ssh:
+            self.assertEqual('5 days, 13 hours, 17 minutes', ssh.current_uptime)
+            self.assertEqual('5 days, 13 hours, 17 minutes', ssh.current_uptime)
+            self.assertEqual(3, ssh.commands_sent.count('show version'))
+
+    def test_running_config_from_fixture(self):
+        with self.connect(self.ios) as ssh:
+            config = ssh.running_config
+        self.assertIn('hostname ios-switch', config)
+        self.assertTrue(config.rstrip().endswith('end'))
+
+    def test_interfaces_from_fixture(self):
+        with self.connect(self.ios) as ssh:
+            self.assertEqual(['GigabitEthernet1/0/1', 'GigabitEthernet1/0/2', 'Vlan1'], ssh.interfaces)
+
+    def test_enable_and_config_mode(self):
+        with self.connect(self.enable, enable_password='secret') as ssh:
+            self.assertTrue(ssh.transport.in_user_exec_mode)
+            self.assertTrue(ssh.cli_to_config_mode())
+            self.assertEqual('enable-switch(config)#', ssh.prompt)
+            ssh.send_command_get_output('interface GigabitEthernet1/0/1')
+            self.assertEqual('enable-switch(config-if)#', ssh.prompt)
+            self.assertTrue(ssh.cli_to_privileged_exec_mode())
+
+    def test_save_config(self):
+        with self.connect(self.nxos) as ssh:
+            self.assertTrue(ssh.save_config())
+
+    def test_pages_output_until_terminal_length_is_set(self):
+        with self.connect(self.ios) as ssh:
+            paged = ssh.transport.send_command_get_truncated_output('show running-config')
+            self.assertIn('hostname ios-switch', paged)
+            self.assertNotIn('More', '\n'.join(paged))
+            self.assertEqual('ios-switch#', paged[-1].strip())
+
+    def test_exec_channels(self):
+        with self.connect(self.nxos, exec_channels=True) as ssh:
+            outputs = ssh.show_commands_get_outputs(['show ip arp', 'show version'])
+            self.assertEqual([], [x for x in ssh.commands_sent if x.startswith('terminal')])
+        self.assertIn('10.0.0.1        00:05:12  0011.2233.0001  Vlan1', outputs[0])
+
+
+class CollectFacts(SSH):
+
+    def during_login(self, ssh):
+        self.running_config = ssh.running_config
+        self.uptime = ssh.uptime
+
+
+class TestThroughputBenchmark(TestCase):
+    """
+    Runs the full connect, detect firmware and collect path against many emulated devices at once
+    """
+
+    devices = 20
+    latency = .01
+
+    def test_connect_detect_collect_throughput(self):
+        with CiscoEmulator() as emulator:
+            ports = emulator.add_devices(self.devices // 2, 'IOS', 'ios', latency=self.latency, extra_interfaces=200)
+            ports += emulator.add_devices(self.devices // 2, 'NXOS', 'nxos', latency=self.latency)
+            threads = [CollectFacts('127.0.0.1', 'user', 'pass', port=port) for port in ports]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([f'hostname {thread.hostname}' in thread.running_config for thread in threads],
+                         [True] * self.devices)
+        self.assertEqual(self.devices, len([thread for thread in threads if thread.uptime]))
+        self.assertIn('interface Loopback199', threads[0].running_config)
@@ -0,0 +1,57 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.TransportEngines import ReadOnlySSHEngine
+from CiscoAutomationFramework.Exceptions import ForbiddenError
+from tests.emulator import CiscoEmulator, VirtualDevice
+
+responses = {
+    'show version': 'Cisco IOS Software, C2960X Software\r\nmyhostname uptime is 5 days, 13 hours, 17 minutes',
+    'show running-config': 'Building configuration...\r\n\r\nhostname myhostname\r\n!\r\nend\r\n',
+    'show clock': '10:00:00 UTC Mon Jan 1 2024',
+    'show ip arp': 'Internet  10.0.0.1  0  aaaa.bbbb.cccc  ARPA  Vlan1',
+}
+
+
+class TestExecChannels(TestCase):
+
+    def connect(self, port, **kwargs):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port, exec_channels=True, **kwargs)
+
+    def setUp(self):
+        self.emulator = CiscoEmulator().start()
+        self.device = VirtualDevice('myhostname', fixtures=responses)
+        self.no_exec = VirtualDevice('myhostname', fixtures=responses, exec_channels=False)
+        self.port = self.emulator.add_device(self.device)
+        self.no_exec_port = self.emulator.add_device(self.no_exec)
+
+    def tearDown(self):
+        self.emulator.stop()
+
+    def test_show_commands_run_on_exec_channels(self):
+        with self.connect(self.port) as ssh:
+            outputs = ssh.show_commands_get_outputs(['show clock', 'show ip arp'])
+        self.assertEqual(['show clock', 'show ip arp'], sorted(self.device.exec_commands))
+        self.assertEqual(['show clock', '10:00:00 UTC Mon Jan 1 2024', 'myhostname#'], outputs[0])
+        self.assertEqual('Internet  10.0.0.1  0  aaaa.bbbb.cccc  ARPA  Vlan1', outputs[1][1])
+
+    def test_output_matches_shell_output(self):
+        with self.connect(self.port) as ssh:
+            exec_config = ssh.running_config
+            exec_uptime = ssh.uptime
+            ssh.transport.exec_channels = False
+            self.assertEqual(exec_config, ssh.running_config)
+            self.assertEqual(exec_uptime, ssh.uptime)
+        self.assertEqual('5 days, 13 hours, 17 minutes', exec_uptime)
+
+    def test_falls_back_to_shell_when_exec_is_refused(self):
+        with self.connect(self.no_exec_port) as ssh:
+            output = ssh.show_command_get_output('show clock')
+            self.assertFalse(ssh.transport.exec_channels_available)
+        self.assertEqual(['show clock', '10:00:00 UTC Mon Jan 1 2024', 'myhostname#'], output)
+        self.assertEqual([], self.no_exec.exec_commands)
+
+    def test_read_only_engine_checks_exec_commands(self):
+        with self.connect(self.port, engine=ReadOnlySSHEngine) as ssh:
+            with self.assertRaises(ForbiddenError):
+                ssh.transport.exec_commands_get_outputs(['reload'])
+        self.assertEqual([], self.device.exec_commands)
@@ -0,0 +1,80 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.Exceptions import FileTransferError
+from CiscoAutomationFramework.SessionRecording import RecordingSSHEngine, replay_session
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+
+
+class TestRunningConfigFileTransfer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.ios = VirtualDevice('scp-ios', extra_interfaces=500)
+        cls.nxos = VirtualDevice('scp-nexus', 'NXOS')
+        cls.no_servers = VirtualDevice('no-file-servers', file_servers=())
+        cls.ports = {device: cls.emulator.add_device(device) for device in (cls.ios, cls.nxos, cls.no_servers)}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def connect(self, device, file_transfer):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=self.ports[device], file_transfer=file_transfer)
+
+    def screen_scraped(self, device):
+        with self.connect(device, None) as ssh:
+            return ssh.running_config
+
+    def assert_copied(self, device, file_transfer):
+        with self.connect(device, file_transfer) as ssh:
+            copied = ssh.running_config
+            self.assertNotIn('show running-config', ssh.commands_sent)
+        scraped = self.screen_scraped(device)
+        self.assertEqual(scraped, copied)
+        self.assertTrue(copied.endswith('end') or device.is_nexus)
+        return copied
+
+    def test_ios_over_scp(self):
+        copied = self.assert_copied(self.ios, 'scp')
+        self.assertTrue(copied.startswith('!'))
+        self.assertIn('interface Loopback499', copied)
+
+    def test_ios_over_sftp(self):
+        self.assert_copied(self.ios, 'sftp')
+
+    def test_nxos_over_scp(self):
+        self.assertEqual(self.screen_scraped(self.nxos), self.assert_copied(self.nxos, 'scp'))
+
+    def test_falls_back_to_show_running_config(self):
+        for file_transfer in ('scp', 'sftp'):
+            with self.connect(self.no_servers, file_transfer) as ssh:
+                self.assertIn('hostname no-file-servers', ssh.running_config)
+                self.assertIn('show running-config', ssh.commands_sent)
+                self.assertFalse(ssh.transport.file_transfer_available)
+
+    def test_get_file_raises_for_missing_file(self):
+        with self.connect(self.ios, 'scp') as ssh:
+            with self.assertRaises(FileTransferError):
+                ssh.transport.get_file('flash:missing.bin')
+
+    def test_missing_file_leaves_file_transfer_available(self):
+        for file_transfer in ('scp', 'sftp'):
+            with self.connect(self.ios, file_transfer) as ssh:
+                with self.assertRaises(FileTransferError):
+                    ssh.transport.get_file('flash:missing.bin')
+                self.assertTrue(ssh.transport.file_transfer_available)
+                self.assertIn('hostname', ssh.running_config)
+                self.assertNotIn('show running-config', ssh.commands_sent)
+
+    def test_copied_file_is_recorded_and_replayed(self):
+        with TemporaryDirectory() as directory:
+            class Recorder(RecordingSSHEngine):
+                recording_directory = directory
+
+            with connect_ssh('127.0.0.1', 'user', 'pass', port=self.ports[self.ios], engine=Recorder,
+                             file_transfer='scp') as ssh:
+                copied = ssh.running_config
+            with replay_session(ssh.transport.path) as ssh:
+                self.assertEqual(copied, ssh.running_config)
@@ -83,6 +83,12 @@ class TestNaviateCLIToPrivExec(BaseTest):
         ssh.transport.load_canned_response('myhostname#\n')
         self.assertRaises(EnablePasswordError, ssh.cli_to_privileged_exec_mode)
 
+    def test_returns_true_when_enable_does_not_ask_for_password(self):
+        ssh = self.engine_at_std_user_prompt
+        ssh.transport.load_canned_response('enable\nmyhostname#\n')
+        self.assertIs(True, ssh.cli_to_privileged_exec_mode())
+        self.assertEqual(['enable'], ssh.transport.all_commands_sent)
+
     def test_proper_commands_from_priv_exec(self):
         ssh = self.engine_at_priv_exec_prompt
         ssh.transport.enable_password = 'mypass'
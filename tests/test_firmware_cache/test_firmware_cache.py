@@ -0,0 +1,117 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh, FirmwareCache
+from CiscoAutomationFramework.FirmwareDetect import version_from_show_version
+from CiscoAutomationFramework.IOS import IOS
+from CiscoAutomationFramework.NXOS import NXOS
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+from time import time
+import json
+import os
+
+
+class TestVersionFromShowVersion(TestCase):
+
+    def test_ios(self):
+        show_version = ['Cisco IOS Software, C2960X Software (C2960X-UNIVERSALK9-M), Version 15.2(7)E4, RELEASE SOFTWARE (fc2)']
+        self.assertEqual('15.2(7)E4', version_from_show_version(show_version))
+
+    def test_iosxe(self):
+        show_version = ['Cisco IOS XE Software, Version 16.09.04']
+        self.assertEqual('16.09.04', version_from_show_version(show_version))
+
+    def test_nxos_skips_bios_version(self):
+        show_version = ['Software', '  BIOS: version 07.68', ' NXOS: version 9.3(5)']
+        self.assertEqual('9.3(5)', version_from_show_version(show_version))
+
+    def test_unknown(self):
+        self.assertIsNone(version_from_show_version(['nothing here']))
+
+
+class TestFirmwareCacheFile(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'firmware.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persists_across_instances(self):
+        with FirmwareCache(self.path) as cache:
+            cache.set('10.0.0.1:22', 'NXOS', 'nexus', 'nexus#', '9.3(5)')
+        entry = FirmwareCache(self.path).get('10.0.0.1:22')
+        self.assertEqual('NXOS', entry['firmware'])
+        self.assertEqual('9.3(5)', entry['version'])
+        self.assertEqual([], [name for name in os.listdir(self.directory.name) if name.endswith('.tmp')])
+
+    def test_expired_entry_is_dropped(self):
+        cache = FirmwareCache(self.path, ttl=60)
+        cache.set('10.0.0.1:22', 'IOS', 'switch', 'switch#')
+        cache._entries['10.0.0.1:22']['detected_at'] = time() - 61
+        self.assertIsNone(cache.get('10.0.0.1:22'))
+
+    def test_changed_prompt_is_a_miss(self):
+        cache = FirmwareCache(self.path)
+        cache.set('10.0.0.1:22', 'IOS', 'switch', 'switch#')
+        self.assertIsNone(cache.get('10.0.0.1:22', prompt='renamed#'))
+        self.assertIsNone(cache.get('10.0.0.1:22'))
+
+    def test_corrupt_file_starts_empty(self):
+        with open(self.path, 'w') as file:
+            file.write('{not json')
+        self.assertIsNone(FirmwareCache(self.path).get('10.0.0.1:22'))
+
+
+class TestConnectWithFirmwareCache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.ios = cls.emulator.add_device(VirtualDevice('cached-ios'))
+        cls.nxos = cls.emulator.add_device(VirtualDevice('cached-nexus', 'NXOS'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = FirmwareCache(os.path.join(self.directory.name, 'firmware.json'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def connect(self, port):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port, firmware_cache=self.cache)
+
+    def test_miss_detects_and_stores(self):
+        with self.connect(self.nxos) as ssh:
+            self.assertIsInstance(ssh, NXOS)
+            self.assertIn('show version', ssh.commands_sent)
+        entry = self.cache.get(FirmwareCache.key('127.0.0.1', self.nxos))
+        self.assertEqual('NXOS', entry['firmware'])
+        self.assertEqual('cached-nexus#', entry['prompt'])
+        self.assertEqual('9.3(5)', entry['version'])
+
+    def test_hit_skips_show_version(self):
+        with self.connect(self.ios):
+            pass
+        with self.connect(self.ios) as ssh:
+            self.assertIsInstance(ssh, IOS)
+            self.assertNotIn('show version', ssh.commands_sent)
+
+    def test_wrong_entry_is_replaced_when_show_version_is_run(self):
+        key = FirmwareCache.key('127.0.0.1', self.ios)
+        self.cache.set(key, 'NXOS', 'cached-ios', 'cached-ios#')
+        with self.connect(self.ios) as ssh:
+            self.assertNotIn('show version', ssh.commands_sent)
+            ssh.uptime
+        self.assertEqual('IOS', self.cache.get(key)['firmware'])
+
+    def test_saved_cache_is_json(self):
+        with self.connect(self.ios):
+            pass
+        self.cache.save()
+        with open(self.cache.path) as file:
+            self.assertEqual('IOS', json.load(file)[FirmwareCache.key('127.0.0.1', self.ios)]['firmware'])
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from tests.emulator import CiscoEmulator, VirtualDevice
+
+
+class TestInterfaceInventory(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.ios = cls.emulator.add_device(VirtualDevice('inventory-ios'))
+        cls.nexus = cls.emulator.add_device(VirtualDevice('inventory-nexus', 'NXOS'))
+        cls.old_nexus = cls.emulator.add_device(VirtualDevice('inventory-text-nexus', 'NXOS', json_output=False))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def connect(self, port, **kwargs):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port, **kwargs)
+
+    def test_names_match_full_show_interfaces(self):
+        with self.connect(self.ios) as ssh:
+            self.assertEqual(ssh.interfaces, ssh.interface_names)
+            self.assertIn('show ip interface brief', ssh.commands_sent)
+
+    def test_names_are_gathered_once(self):
+        with self.connect(self.ios) as ssh:
+            ssh.brief_interfaces = True
+            first = ssh.interfaces
+            self.assertEqual(first, ssh.interfaces)
+            self.assertEqual(1, ssh.commands_sent.count('show ip interface brief'))
+            self.assertNotIn('show interfaces', ssh.commands_sent)
+
+    def test_config_mode_drops_names(self):
+        with self.connect(self.ios) as ssh:
+            ssh.interface_names
+            ssh.cli_to_config_mode()
+            ssh.interface_names
+            ssh.refresh_interface_names()
+            self.assertEqual(3, ssh.commands_sent.count('show ip interface brief'))
+
+    def test_brief_output_is_smaller(self):
+        with self.connect(self.ios) as ssh:
+            brief = ssh.show_command_get_output('show ip interface brief')
+            full = ssh.show_command_get_output('show interfaces')
+        self.assertLess(len('\n'.join(brief)), len('\n'.join(full)))
+
+    def test_details_only_for_selected_interfaces(self):
+        with self.connect(self.ios) as ssh:
+            details = ssh.interface_details(['GigabitEthernet1/0/2'])
+            self.assertEqual(['show interfaces GigabitEthernet1/0/2'], ssh.commands_sent[-1:])
+        self.assertEqual(['GigabitEthernet1/0/2'], list(details))
+        self.assertTrue(details['GigabitEthernet1/0/2'][1].startswith('GigabitEthernet1/0/2 is down'))
+        self.assertEqual('inventory-ios#', details['GigabitEthernet1/0/2'][-1])
+
+    def test_nexus_json_and_text_agree(self):
+        with self.connect(self.nexus) as ssh:
+            json_names = ssh.interface_names
+            self.assertIn('show interface brief | json', ssh.commands_sent)
+        with self.connect(self.old_nexus) as ssh:
+            ssh.brief_interfaces = True
+            self.assertEqual(json_names, ssh.interfaces)
+            self.assertIn('show interface brief', ssh.commands_sent)
+        self.assertEqual(['mgmt0', 'Ethernet1/1', 'Ethernet1/2', 'Vlan1'], json_names)
+
+    def test_nexus_details(self):
+        with self.connect(self.nexus, shell_channels=2) as ssh:
+            details = ssh.interface_details(['Ethernet1/1', 'Ethernet1/2'])
+        self.assertIn('  Description: uplink', details['Ethernet1/1'])
+        self.assertTrue(details['Ethernet1/2'][1].startswith('Ethernet1/2 is down'))
@@ -0,0 +1,128 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.Parsers import JsonRowDecoder
+from tests.emulator import CiscoEmulator, VirtualDevice
+from time import perf_counter
+import json
+
+ROWS = [{'disp_mac_addr': '0011.2233.0001', 'disp_vlan': '1'}, {'disp_mac_addr': '0011.2233.0002', 'disp_vlan': '2'}]
+
+
+class TestJsonRowDecoder(TestCase):
+
+    def output(self, rows):
+        body = json.dumps({'TABLE_mac_address': {'ROW_mac_address': rows}}, indent=2)
+        return f'switch# show mac address-table | json\n{body}\nswitch# '
+
+    def test_rows_split_at_every_position(self):
+        output = self.output(ROWS)
+        for split in range(len(output)):
+            decoder = JsonRowDecoder('ROW_mac_address')
+            rows = decoder.feed(output[:split]) + decoder.feed(output[split:])
+            self.assertEqual(ROWS, rows, f'split at {split}')
+            self.assertTrue(decoder.found)
+
+    def test_rows_returned_as_soon_as_complete(self):
+        output = self.output(ROWS)
+        decoder = JsonRowDecoder('ROW_mac_address')
+        self.assertEqual([ROWS[0]], decoder.feed(output[:output.index('0011.2233.0002')]))
+
+    def test_single_row_is_not_in_a_list(self):
+        decoder = JsonRowDecoder('ROW_mac_address')
+        self.assertEqual([ROWS[0]], decoder.feed(self.output(ROWS[0])))
+
+    def test_output_without_rows(self):
+        decoder = JsonRowDecoder('ROW_mac_address')
+        self.assertEqual([], decoder.feed('% Invalid command at \'^\' marker.\nswitch# '))
+        self.assertFalse(decoder.found)
+
+
+class TestNxosJsonOutput(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.nexus = cls.emulator.add_device(VirtualDevice('json-nexus', 'NXOS'))
+        cls.old_nexus = cls.emulator.add_device(VirtualDevice('text-nexus', 'NXOS', json_output=False))
+        cls.ios = cls.emulator.add_device(VirtualDevice('json-ios'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def connect(self, port):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port)
+
+    @staticmethod
+    def entries(ssh):
+        return [(entry.mac_address, entry.vlan, entry.interface) for entry in ssh.mac_address_table_entries]
+
+    def test_mac_address_table_from_json_matches_text(self):
+        with self.connect(self.nexus) as ssh:
+            json_entries = self.entries(ssh)
+            self.assertIn('show mac address-table | json', ssh.commands_sent)
+            self.assertTrue(ssh.json_output_supported)
+        with self.connect(self.old_nexus) as ssh:
+            self.assertEqual(json_entries, self.entries(ssh))
+
+    def test_falls_back_to_text_once(self):
+        with self.connect(self.old_nexus) as ssh:
+            self.entries(ssh)
+            self.entries(ssh)
+            self.assertFalse(ssh.json_output_supported)
+            self.assertEqual(1, ssh.commands_sent.count('show mac address-table | json'))
+            self.assertEqual(2, ssh.commands_sent.count('show mac address-table'))
+
+    def test_ios_uses_text(self):
+        with self.connect(self.ios) as ssh:
+            self.assertEqual(2, len(self.entries(ssh)))
+            self.assertNotIn('show mac address-table | json', ssh.commands_sent)
+
+    def test_brief_interfaces_from_json(self):
+        with self.connect(self.nexus) as ssh:
+            ssh.brief_interfaces = True
+            self.assertEqual(['mgmt0', 'Ethernet1/1', 'Ethernet1/2', 'Vlan1'], ssh.interfaces)
+            self.assertEqual(['show interface brief | json'], [command for command in ssh.commands_sent
+                                                               if command.startswith('show interface')])
+
+    def test_brief_interfaces_fall_back_to_text(self):
+        with self.connect(self.old_nexus) as ssh:
+            ssh.brief_interfaces = True
+            self.assertIn('Ethernet1/1', ssh.interfaces)
+            self.assertIn('show interface brief', ssh.commands_sent)
+            self.assertNotIn('show interface', ssh.commands_sent)
+
+
+class TestLargeMacAddressTable(TestCase):
+
+    entries = 20000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        # the table takes about a second to send so it is clear whether rows come out before it has all arrived
+        cls.nexus = cls.emulator.add_device(VirtualDevice('big-nexus', 'NXOS', extra_mac_entries=cls.entries,
+                                                          bandwidth=4000000))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def test_json_is_streamed(self):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.nexus) as ssh:
+            # like a real device the whole table is on one line
+            self.assertEqual(3, len(ssh.show_command_get_output('show mac address-table | json')))
+            start = perf_counter()
+            json_entries = []
+            for entry in ssh.iter_mac_address_table_entries():
+                if not json_entries:
+                    first_entry = perf_counter() - start
+                json_entries.append(entry)
+            json_time = perf_counter() - start
+            ssh.json_output_supported = False
+            text_entries = ssh.mac_address_table_entries
+        self.assertEqual('0011.2233.0001', json_entries[0].mac_address)
+        self.assertEqual(len(text_entries), len(json_entries))
+        self.assertGreaterEqual(len(json_entries), self.entries)
+        # rows come out while the line is still being received, not once all of it has arrived
+        self.assertLess(first_entry, json_time / 2)
@@ -0,0 +1,77 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh, JumphostTunnel, FirmwareCache
+from CiscoAutomationFramework.ConnectionPool import ConnectionPool
+from CiscoAutomationFramework.ThreadLib import SSH
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+import os
+
+responses = {
+    'show version': 'Cisco IOS Software, C2960X Software\r\nmyhostname uptime is 5 days, 13 hours, 17 minutes',
+    'show clock': '10:00:00 UTC Mon Jan 1 2024',
+}
+
+
+class ShowClock(SSH):
+
+    def during_login(self, ssh):
+        self.clock = ssh.send_command_get_output('show clock')[1]
+
+
+class TestJumphostTunnel(TestCase):
+
+    def setUp(self):
+        self.emulator = CiscoEmulator().start()
+        self.jumphost = VirtualDevice('bastion')
+        self.jumphost_port = self.emulator.add_device(self.jumphost)
+        self.ports = [self.emulator.add_device(VirtualDevice('myhostname', fixtures=responses)) for _ in range(3)]
+        self.tunnel = JumphostTunnel('127.0.0.1', 'user', 'pass', port=self.jumphost_port)
+
+    def tearDown(self):
+        self.tunnel.close_connection()
+        self.emulator.stop()
+
+    def test_connects_to_device_through_jumphost(self):
+        port = self.ports[0]
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=port, jumphost=self.tunnel) as ssh:
+            output = ssh.send_command_get_output('show clock')
+        self.assertEqual('10:00:00 UTC Mon Jan 1 2024', output[1])
+        self.assertEqual([('127.0.0.1', port)], self.jumphost.forwarded_to)
+
+    def test_sessions_share_one_jumphost_connection(self):
+        threads = [ShowClock('127.0.0.1', 'user', 'pass', port=port, jumphost=self.tunnel) for port in self.ports]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(['10:00:00 UTC Mon Jan 1 2024'] * 3, [thread.clock for thread in threads])
+        self.assertEqual(1, len(self.jumphost.transports))
+        self.assertEqual(3, len(self.jumphost.forwarded_to))
+
+    def test_pool_does_not_share_sessions_between_jumphosts(self):
+        other_jumphost = VirtualDevice('bastion2')
+        other_tunnel = JumphostTunnel('127.0.0.1', 'user', 'pass', port=self.emulator.add_device(other_jumphost))
+        port = self.ports[0]
+        try:
+            with ConnectionPool() as pool:
+                with pool.connection('127.0.0.1', 'user', 'pass', port=port, jumphost=self.tunnel) as first:
+                    pass
+                with pool.connection('127.0.0.1', 'user', 'pass', port=port, jumphost=other_tunnel) as second:
+                    self.assertIsNot(first, second)
+                with pool.connection('127.0.0.1', 'user', 'pass', port=port, jumphost=self.tunnel) as third:
+                    self.assertIs(first, third)
+        finally:
+            other_tunnel.close_connection()
+        self.assertEqual([('127.0.0.1', port)], other_jumphost.forwarded_to)
+
+    def test_firmware_cache_keys_devices_by_jumphost(self):
+        port = self.ports[0]
+        with TemporaryDirectory() as directory:
+            cache = FirmwareCache(os.path.join(directory, 'firmware.json'))
+            with connect_ssh('127.0.0.1', 'user', 'pass', port=port, jumphost=self.tunnel,
+                             firmware_cache=cache) as ssh:
+                self.assertIn('show version', ssh.commands_sent)
+            key = FirmwareCache.key('127.0.0.1', port, self.tunnel)
+            self.assertEqual(f'user@127.0.0.1:{self.jumphost_port}/127.0.0.1:{port}', key)
+            self.assertEqual('IOS', cache.get(key)['firmware'])
+            self.assertIsNone(cache.get(FirmwareCache.key('127.0.0.1', port)))
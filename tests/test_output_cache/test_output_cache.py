@@ -0,0 +1,98 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.OutputCache import OutputCache
+from tests.emulator import CiscoEmulator, VirtualDevice
+
+
+class TestOutputCache(TestCase):
+
+    def test_expired_output_is_a_miss(self):
+        cache = OutputCache(ttl=0)
+        cache.set('show clock', ['show clock', '10:00:00', 'switch#'])
+        self.assertIsNone(cache.get('show clock'))
+        self.assertEqual(0, cache.size)
+
+    def test_drops_least_recently_used_over_max_bytes(self):
+        cache = OutputCache(max_bytes=25)
+        cache.set('a', ['x' * 9])
+        cache.set('b', ['x' * 9])
+        cache.get('a')
+        cache.set('c', ['x' * 9])
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(20, cache.size)
+
+    def test_output_larger_than_max_bytes_is_not_cached(self):
+        cache = OutputCache(max_bytes=10)
+        cache.set('a', ['x' * 20])
+        self.assertEqual(0, len(cache))
+
+    def test_counts_hits_and_misses(self):
+        cache = OutputCache()
+        cache.get('a')
+        cache.set('a', [])
+        self.assertEqual([], cache.get('a'))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+
+class TestFirmwareOutputCache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.ios = cls.emulator.add_device(VirtualDevice('cache-switch'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        self.ssh = connect_ssh('127.0.0.1', 'user', 'pass', port=self.ios)
+        self.ssh.enable_output_cache()
+
+    def tearDown(self):
+        self.ssh.close_connection()
+
+    def test_repeated_reads_are_sent_once(self):
+        first = self.ssh.running_config
+        self.assertEqual(first, self.ssh.running_config)
+        self.assertEqual(['GigabitEthernet1/0/1', 'GigabitEthernet1/0/2', 'Vlan1'], self.ssh.interfaces)
+        self.ssh.interfaces
+        self.assertEqual(1, self.ssh.commands_sent.count('show running-config'))
+        self.assertEqual(1, self.ssh.commands_sent.count('show interfaces'))
+
+    def test_config_parser_is_reused(self):
+        self.assertIs(self.ssh.config_parser, self.ssh.config_parser)
+        self.assertEqual(1, self.ssh.commands_sent.count('show running-config'))
+
+    def test_config_mode_invalidates(self):
+        self.ssh.running_config
+        self.ssh.cli_to_config_mode()
+        self.ssh.running_config
+        self.assertEqual(2, self.ssh.commands_sent.count('show running-config'))
+
+    def test_config_mode_entered_directly_invalidates(self):
+        self.ssh.running_config
+        self.ssh.send_command_get_output('configure terminal')
+        self.ssh.running_config
+        self.assertEqual(2, self.ssh.commands_sent.count('show running-config'))
+
+    def test_config_sent_with_send_command_invalidates(self):
+        first = self.ssh.running_config
+        for command in ('conf t', 'ip domain-name example.com', 'end'):
+            self.ssh.send_command(command)
+        self.ssh.transport.get_output()
+        self.assertTrue(self.ssh.transport.in_privileged_exec_mode)
+        self.assertNotEqual(first, self.ssh.running_config)
+        self.assertEqual(2, self.ssh.commands_sent.count('show running-config'))
+
+    def test_cached_output_can_not_be_changed_by_the_caller(self):
+        self.ssh.show_command_get_output('show ip arp').append('changed')
+        self.assertNotIn('changed', self.ssh.show_command_get_output('show ip arp'))
+
+    def test_disabled_by_default(self):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.ios) as ssh:
+            ssh.running_config
+            ssh.running_config
+            self.assertEqual(2, ssh.commands_sent.count('show running-config'))
@@ -0,0 +1,62 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from tests.emulator import CiscoEmulator, VirtualDevice
+from time import perf_counter
+
+acl = [f' permit ip host 10.0.{x // 250}.{x % 250} any' for x in range(200)]
+
+
+class TestPushConfig(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        self.device = VirtualDevice('push-switch', latency=.005, rejected_config=('ip access-list bogus', 'bogus'))
+        self.ssh = connect_ssh('127.0.0.1', 'user', 'pass', port=self.emulator.add_device(self.device))
+
+    def tearDown(self):
+        self.ssh.close_connection()
+
+    def test_pushes_every_line_in_order_and_returns_to_privileged_exec(self):
+        lines = ['ip access-list extended BIG'] + acl
+        self.assertEqual([], self.ssh.push_config(lines, window=32))
+        self.assertEqual([line.strip() for line in lines], self.device.config_applied)
+        self.assertTrue(self.ssh.transport.in_privileged_exec_mode)
+
+    def test_skips_comments_blank_lines_and_end(self):
+        self.ssh.push_config('!\ninterface Vlan1\n description test\n\n!\nend\n')
+        self.assertEqual(['interface Vlan1', 'description test'], self.device.config_applied)
+
+    def test_reports_errors_with_line_numbers(self):
+        failures = self.ssh.push_config(['interface Vlan1', ' bogus command', ' description ok', ' bogus again'],
+                                        window=2)
+        self.assertEqual([2, 4], [failure.line_number for failure in failures])
+        self.assertEqual(' bogus command', failures[0].line)
+        self.assertEqual(["% Invalid input detected at '^' marker."], failures[0].messages)
+        self.assertIn('description ok', self.device.config_applied)
+
+    def test_stop_on_error_stops_after_the_window(self):
+        lines = ['ip access-list bogus'] + acl[:10]
+        failures = self.ssh.push_config(lines, window=4, stop_on_error=True)
+        self.assertEqual([1], [failure.line_number for failure in failures])
+        self.assertEqual(3, len(self.device.config_applied))
+
+    def test_windowed_push_is_faster_than_line_by_line(self):
+        lines = ['ip access-list extended TIMED'] + acl[:10]
+        start = perf_counter()
+        self.ssh.push_config(lines, window=8)
+        windowed = perf_counter() - start
+
+        self.ssh.cli_to_config_mode()
+        start = perf_counter()
+        for line in lines:
+            self.ssh.send_command_get_output(line)
+        line_by_line = perf_counter() - start
+
+        self.assertLess(windowed * 3, line_by_line)
@@ -0,0 +1,150 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.SessionRecording import RecordingSSHEngine, ReplayEngine, replay_session
+from CiscoAutomationFramework.Exceptions import ReplayError
+from CiscoAutomationFramework.IOS import IOS
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import json
+import os
+
+responses = {
+    'show version': 'Cisco IOS Software, C2960X Software\r\nmyhostname uptime is 5 days, 13 hours, 17 minutes',
+    'show running-config': 'Building configuration...\r\n\r\nhostname myhostname\r\n!\r\nend\r\n',
+    'show clock': '10:00:00 UTC Mon Jan 1 2024',
+}
+
+
+class TestRecordReplay(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.emulator = CiscoEmulator().start()
+        self.port = self.emulator.add_device(VirtualDevice('myhostname', fixtures=responses))
+
+    def tearDown(self):
+        self.emulator.stop()
+        self.directory.cleanup()
+
+    def record(self, path, exec_channels=False):
+        class Recorder(RecordingSSHEngine):
+            def __init__(self):
+                super().__init__(path)
+
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.port, engine=Recorder,
+                         exec_channels=exec_channels) as ssh:
+            return ssh.running_config, ssh.uptime, ssh.send_command_get_output('show clock')
+
+    def test_replay_gives_recorded_output(self):
+        path = os.path.join(self.directory.name, 'session.jsonl.gz')
+        recorded = self.record(path)
+        with replay_session(path) as ssh:
+            self.assertIsInstance(ssh, IOS)
+            self.assertEqual('myhostname#', ssh.prompt)
+            self.assertEqual(recorded, (ssh.running_config, ssh.uptime, ssh.send_command_get_output('show clock')))
+
+    def test_replays_exec_channels(self):
+        path = os.path.join(self.directory.name, 'session.jsonl')
+        recorded = self.record(path, exec_channels=True)
+        with replay_session(path) as ssh:
+            self.assertEqual(recorded, (ssh.running_config, ssh.uptime, ssh.send_command_get_output('show clock')))
+        with open(path) as log:
+            self.assertIn('e', [json.loads(line)[0] for line in log])
+
+    def test_records_to_recording_directory(self):
+        class Recorder(RecordingSSHEngine):
+            recording_directory = self.directory.name
+
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.port, engine=Recorder) as ssh:
+            pass
+        self.assertEqual(self.directory.name, os.path.dirname(ssh.transport.path))
+        self.assertTrue(ssh.transport.path.endswith('.jsonl.gz'))
+        with replay_session(ssh.transport.path) as replayed:
+            self.assertEqual('myhostname', replayed.hostname)
+
+    def test_raises_when_commands_differ_from_recording(self):
+        path = os.path.join(self.directory.name, 'session.jsonl')
+        self.record(path)
+        with replay_session(path) as ssh:
+            with self.assertRaises(ReplayError):
+                ssh.send_command_get_output('show interfaces')
+
+
+class TestReplayTiming(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.jsonl')
+        events = [['c', 0, '10.0.0.1', 22], ['r', 0, '\r\nmyhostname#'], ['p', 0, 'myhostname#', 'myhostname'],
+                  ['s', .1, 'show clock\n'], ['r', .2, 'show clock\r\n'], ['r', .4, '10:00:00\r\nmyhostname#']]
+        with open(self.path, 'w') as log:
+            log.writelines(json.dumps(event) + '\n' for event in events)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def replay(self, speed):
+        engine = ReplayEngine(self.path, speed)
+        engine.connect_to_server()
+        start = perf_counter()
+        output = engine.send_command_get_output('show clock', delay=0)
+        return output, perf_counter() - start
+
+    def test_plays_back_with_original_timing(self):
+        output, elapsed = self.replay(speed=1)
+        self.assertEqual(['show clock', '10:00:00', 'myhostname#'], output)
+        self.assertGreaterEqual(elapsed, .28)
+
+    def test_plays_back_as_fast_as_possible(self):
+        output, elapsed = self.replay(speed=None)
+        self.assertEqual(['show clock', '10:00:00', 'myhostname#'], output)
+        self.assertLess(elapsed, .1)
+
+
+class TestRecordingRedactsPasswords(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.port = cls.emulator.add_device(VirtualDevice('enable-switch', enable_password='enable-secret'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def recorder(self):
+        path = self.path
+
+        class Recorder(RecordingSSHEngine):
+            def __init__(self):
+                super().__init__(path)
+
+        return Recorder
+
+    def read_log(self):
+        with open(self.path) as log:
+            return log.read()
+
+    def test_enable_password_is_redacted_and_replayed(self):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.port, enable_password='enable-secret',
+                         engine=self.recorder()) as ssh:
+            recorded = ssh.running_config
+        self.assertNotIn('enable-secret', self.read_log())
+        self.assertIn('"<redacted>\\n"', self.read_log())
+        with replay_session(self.path) as ssh:
+            self.assertEqual(recorded, ssh.running_config)
+
+    def test_answer_to_password_prompt_is_redacted(self):
+        with connect_ssh('127.0.0.1', 'user', 'pass', port=self.port, engine=self.recorder()) as ssh:
+            ssh.transport.send_command_get_output('enable')
+            ssh.transport.send_command_get_output('enable-secret')
+            self.assertTrue(ssh.transport.in_privileged_exec_mode)
+        self.assertNotIn('enable-secret', self.read_log())
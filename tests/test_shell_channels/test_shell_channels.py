@@ -0,0 +1,99 @@
+from unittest import TestCase
+from CiscoAutomationFramework import connect_ssh
+from CiscoAutomationFramework.TransportEngines import ReadOnlySSHEngine
+from CiscoAutomationFramework.SessionRecording import RecordingSSHEngine, replay_session
+from CiscoAutomationFramework.Exceptions import ForbiddenError, ShellChannelError
+from tests.emulator import CiscoEmulator, VirtualDevice
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import os
+
+commands = ['show version', 'show mac address-table', 'show ip arp', 'show running-config']
+
+
+class TestShellChannels(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.device = VirtualDevice('parallel-switch', latency=.3)
+        cls.port = cls.emulator.add_device(cls.device)
+        cls.enable_port = cls.emulator.add_device(VirtualDevice('enable-switch', enable_password='secret'))
+        cls.aaa_device = VirtualDevice('aaa-switch', user_exec=True)
+        cls.aaa_port = cls.emulator.add_device(cls.aaa_device)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def connect(self, port=None, **kwargs):
+        return connect_ssh('127.0.0.1', 'user', 'pass', port=port or self.port, **kwargs)
+
+    def test_outputs_match_main_shell_in_order(self):
+        with self.connect() as ssh:
+            shell_outputs = ssh.show_commands_get_outputs(commands)
+        with self.connect(shell_channels=3) as ssh:
+            ssh.transport.open_shell_channels()
+            start = perf_counter()
+            parallel_outputs = ssh.show_commands_get_outputs(commands)
+            parallel_time = perf_counter() - start
+            self.assertEqual(3, len(ssh.transport._extra_shells))
+            self.assertEqual(commands, ssh.transport.all_commands_sent[-len(commands):])
+        self.assertEqual(shell_outputs, parallel_outputs)
+        # four commands at .3 seconds each on three shells take two rounds instead of four
+        self.assertLess(parallel_time, .3 * 4)
+
+    def test_shells_are_reused(self):
+        with self.connect(shell_channels=2) as ssh:
+            ssh.show_commands_get_outputs(commands[:2])
+            shells = list(ssh.transport._extra_shells)
+            ssh.show_commands_get_outputs(commands[2:])
+            self.assertEqual(shells, ssh.transport._extra_shells)
+            records = ssh.transport.command_records[-2:]
+            self.assertEqual(sorted(commands[2:]), sorted(record.command for record in records))
+
+    def test_extra_shells_are_enabled(self):
+        with self.connect(self.enable_port, enable_password='secret', shell_channels=2) as ssh:
+            outputs = ssh.transport.shell_commands_get_outputs(['show clock', 'show ip arp'])
+        self.assertEqual(['enable-switch#', 'enable-switch#'], [output[-1] for output in outputs])
+
+    def test_enable_password_is_not_sent_when_enable_does_not_ask(self):
+        with self.connect(self.aaa_port, enable_password='secret', shell_channels=2) as ssh:
+            ssh.transport.open_shell_channels()
+            outputs = ssh.transport.shell_commands_get_outputs(['show clock', 'show ip arp'])
+        self.assertEqual(['aaa-switch#', 'aaa-switch#'], [output[-1] for output in outputs])
+        self.assertNotIn('secret', self.aaa_device.commands_received)
+        self.assertEqual(2, self.aaa_device.commands_received.count('enable'))
+
+    def test_single_command_uses_main_shell(self):
+        with self.connect(shell_channels=2) as ssh:
+            ssh.show_command_get_output('show clock')
+            self.assertEqual([], ssh.transport._extra_shells)
+
+    def test_falls_back_to_main_shell_when_shells_fail(self):
+        with self.connect(shell_channels=2) as ssh:
+            ssh.transport.client.invoke_shell = lambda: (_ for _ in ()).throw(EOFError('refused'))
+            with self.assertRaises(ShellChannelError):
+                ssh.transport.shell_commands_get_outputs(commands)
+            self.assertFalse(ssh.transport.shell_channels_available)
+            outputs = ssh.show_commands_get_outputs(commands[:2])
+        self.assertEqual('parallel-switch#', outputs[1][-1])
+
+    def test_read_only_engine_checks_commands(self):
+        with self.connect(shell_channels=2, engine=ReadOnlySSHEngine) as ssh:
+            with self.assertRaises(ForbiddenError):
+                ssh.transport.shell_commands_get_outputs(['show clock', 'reload'])
+            self.assertEqual([], ssh.transport._extra_shells)
+
+    def test_record_and_replay(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.jsonl')
+
+            class Recorder(RecordingSSHEngine):
+                def __init__(self):
+                    super().__init__(path)
+
+            with self.connect(shell_channels=2, engine=Recorder) as ssh:
+                recorded = ssh.show_commands_get_outputs(commands)
+            with replay_session(path) as ssh:
+                self.assertEqual(recorded, ssh.show_commands_get_outputs(commands))
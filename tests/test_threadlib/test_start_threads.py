@@ -0,0 +1,136 @@
+from unittest import TestCase
+from unittest.mock import patch
+from CiscoAutomationFramework.ThreadLib import ReadOnlySSH, start_threads
+from tests.emulator import CiscoEmulator, VirtualDevice
+from threading import Lock
+from time import perf_counter
+import threading
+import sys
+
+
+class GetClock(ReadOnlySSH):
+
+    lock = Lock()
+    running = 0
+    peak = 0
+
+    @classmethod
+    def reset(cls):
+        cls.running = cls.peak = 0
+
+    def during_login(self, ssh):
+        with self.lock:
+            GetClock.running += 1
+            GetClock.peak = max(GetClock.peak, GetClock.running)
+        try:
+            self.clock = ssh.send_command_get_output('show clock', delay=0)[1]
+        finally:
+            with self.lock:
+                GetClock.running -= 1
+
+
+class FailsOnFirstDevice(GetClock):
+
+    failed = False
+
+    def during_login(self, ssh):
+        with self.lock:
+            fail, FailsOnFirstDevice.failed = not FailsOnFirstDevice.failed, True
+        if fail:
+            raise RuntimeError('script failed on this device')
+        super().during_login(ssh)
+
+
+class ExitsOnFirstDevice(GetClock):
+
+    exited = False
+
+    def during_login(self, ssh):
+        with self.lock:
+            exit_now, ExitsOnFirstDevice.exited = not ExitsOnFirstDevice.exited, True
+        if exit_now:
+            sys.exit()
+        super().during_login(ssh)
+
+
+class TestMaxConcurrency(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = CiscoEmulator().start()
+        cls.port = cls.emulator.add_device(VirtualDevice('threaded-switch', latency=.05,
+                                                         fixtures={'show clock': '10:00:00 UTC Mon Jan 1 2024'}))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def setUp(self):
+        GetClock.reset()
+
+    def start(self, script, count, **kwargs):
+        return start_threads(script, ['127.0.0.1'] * count, 'user', 'pass', port=self.port, **kwargs)
+
+    def test_limit_is_respected(self):
+        threads = self.start(GetClock, 9, wait_for_threads=True, max_concurrency=3)
+        self.assertLessEqual(GetClock.peak, 3)
+        self.assertEqual(['10:00:00 UTC Mon Jan 1 2024'] * 9, [thread.clock for thread in threads])
+        self.assertEqual('show clock', threads[-1].commands_sent[-1])
+
+    def test_join_and_is_alive(self):
+        threads = self.start(GetClock, 4, max_concurrency=1)
+        self.assertTrue(threads[-1].is_alive())
+        for thread in threads:
+            thread.join()
+        self.assertEqual([False] * 4, [thread.is_alive() for thread in threads])
+        self.assertEqual(1, GetClock.peak)
+
+    def test_failure_does_not_stop_worker(self):
+        FailsOnFirstDevice.failed = False
+        reported = []
+        with patch.object(threading, 'excepthook', reported.append):
+            threads = self.start(FailsOnFirstDevice, 3, wait_for_threads=True, max_concurrency=1)
+        self.assertEqual([RuntimeError], [args.exc_type for args in reported])
+        self.assertIs(threads[0], reported[0].thread)
+        self.assertEqual(['10:00:00 UTC Mon Jan 1 2024'] * 2, [thread.clock for thread in threads[1:]])
+
+    def test_system_exit_does_not_stop_worker(self):
+        ExitsOnFirstDevice.exited = False
+        reported = []
+        with patch.object(threading, 'excepthook', reported.append):
+            threads = self.start(ExitsOnFirstDevice, 3, max_concurrency=1)
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual([False] * 3, [thread.is_alive() for thread in threads])
+        self.assertEqual([], reported)
+        self.assertEqual(['10:00:00 UTC Mon Jan 1 2024'] * 2, [thread.clock for thread in threads[1:]])
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            self.start(GetClock, 1, max_concurrency=0)
+
+
+class TestThroughputAgainstConcurrency(TestCase):
+    """
+    Runs the same number of devices with different concurrency limits and checks that more of them at once
+    processes more devices per second
+    """
+
+    devices = 24
+    latency = .1
+
+    def test_throughput(self):
+        results = {}
+        with CiscoEmulator() as emulator:
+            port = emulator.add_device(VirtualDevice('bench-switch', latency=self.latency,
+                                                     fixtures={'show clock': '10:00:00 UTC Mon Jan 1 2024'}))
+            for limit in (1, 4, 12, None):
+                GetClock.reset()
+                start = perf_counter()
+                start_threads(GetClock, ['127.0.0.1'] * self.devices, 'user', 'pass', port=port,
+                              wait_for_threads=True, max_concurrency=limit)
+                results[limit] = (self.devices / (perf_counter() - start), GetClock.peak)
+
+        self.assertEqual(1, results[1][1])
+        self.assertLessEqual(results[4][1], 4)
+        self.assertGreater(results[12][0], results[1][0] * 3)